@@ -0,0 +1,29 @@
+"""
+Constants for the audit logs application.
+"""
+
+from django.db.models import TextChoices
+
+# Maximum number of audit logs written with one bulk insert
+AUDIT_LOG_BATCH_SIZE: int = 200
+
+# Seconds a buffered audit log waits at most before being written
+AUDIT_LOG_FLUSH_INTERVAL: float = 1.0
+
+# Maximum number of audit logs kept in memory waiting to be written
+AUDIT_LOG_BUFFER_SIZE: int = 10000
+
+# File (in the LOG_DIR) receiving the audit logs which could not be buffered or written
+AUDIT_LOG_SPILL_FILE = "audit_logs_spill.jsonl"
+
+# Request headers never stored in an audit log
+AUDIT_LOG_EXCLUDED_HEADERS = ("Authorization", "Cookie")
+
+
+class AuditLogOverflowEnum(TextChoices):
+    """
+    What happens to an audit log when the buffer is full or the write fails.
+    """
+
+    DROP = "DROP", "Drop"
+    SPILL = "SPILL", "Spill to disk"
@@ -33,18 +33,14 @@ class AuditLogs(BaseModel, models.Model):
 
         db_table = "audit_logs"
 
-    def to_dict(self):
-        """
-        Returns the dict with specific fields
-        """
-        return {
-            "audit_id": self.audit_id,
-            "user_id": self.user_id,
-            "client_ip": self.client_ip,
-            "module_name": self.module_name,
-            "http_method": self.http_method,
-            "request_path": self.request_path,
-            "extra_details": self.extra_details,
-            "request_headers": self.request_headers,
-            "client_user_agent": self.client_user_agent,
-        }
+    dict_fields = (
+        "audit_id",
+        "user_id",
+        "client_ip",
+        "module_name",
+        "http_method",
+        "request_path",
+        "extra_details",
+        "request_headers",
+        "client_user_agent",
+    )
@@ -0,0 +1,119 @@
+import os
+import json
+import tempfile
+from types import SimpleNamespace
+
+from django.test import TestCase
+
+from tenant.utils.helpers import (
+    set_request_tenant_aware,
+    set_tenant_details_to_request_thread,
+    get_tenant_details_from_request_thread,
+)
+
+from audit_logs.models import AuditLogs
+from audit_logs.db_access import audit_logs_manager
+from audit_logs.constants import AuditLogOverflowEnum
+from audit_logs.utils.audit_writer import AuditLogWriter
+
+
+def audit_log_data(path="/api/category"):
+    return {
+        "user_id": "user-1",
+        "http_method": "get",
+        "module_name": "category",
+        "request_path": path,
+        "tenant_id": "tenant-1",
+    }
+
+
+class TestAuditLogWriter(TestCase):
+
+    def setUp(self):
+        self.spill_path = os.path.join(tempfile.mkdtemp(), "spill.jsonl")
+
+    def get_writer(self, **kwargs):
+        writer = AuditLogWriter(sync=False, spill_path=self.spill_path, **kwargs)
+        # The test database is bound to this thread, flush from it
+        writer._ensure_thread = lambda: None
+        return writer
+
+    def test_buffered_until_flush(self):
+        """
+        Test that queued audit logs are written with one bulk insert on flush.
+        """
+        writer = self.get_writer()
+
+        for i in range(3):
+            writer.write(audit_log_data(f"/api/category/{i}"), using="default")
+
+        self.assertEqual(AuditLogs.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            writer.flush()
+
+        self.assertEqual(AuditLogs.objects.filter(tenant_id="tenant-1").count(), 3)
+
+    def test_full_buffer_spills_to_disk(self):
+        """
+        Test that audit logs which do not fit in the buffer are spilled to disk.
+        """
+        writer = self.get_writer(buffer_size=2)
+
+        for i in range(3):
+            writer.write(audit_log_data(f"/api/category/{i}"), using="default")
+
+        with open(self.spill_path, encoding="utf-8") as spill:
+            lines = [json.loads(line) for line in spill]
+
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["using"], "default")
+        self.assertEqual(lines[0]["data"]["request_path"], "/api/category/2")
+
+    def test_full_buffer_drops(self):
+        """
+        Test that audit logs which do not fit in the buffer are counted as dropped.
+        """
+        writer = self.get_writer(buffer_size=1, overflow=AuditLogOverflowEnum.DROP)
+
+        for i in range(3):
+            writer.write(audit_log_data(f"/api/category/{i}"), using="default")
+
+        self.assertEqual(writer.dropped, 2)
+        self.assertFalse(os.path.exists(self.spill_path))
+
+    def test_sync_mode_writes_at_once(self):
+        """
+        Test that the sync mode writes the audit log in the calling thread.
+        """
+        writer = AuditLogWriter(sync=True)
+
+        writer.write(audit_log_data(), using="default")
+
+        self.assertEqual(AuditLogs.objects.count(), 1)
+
+    def test_flush_restores_tenant_of_entry(self):
+        """
+        Test that a flush from a thread without tenant bumps the count version of
+        the tenant the audit logs were queued from, not the global one.
+        """
+        writer = self.get_writer()
+        tenant = SimpleNamespace(tenant_id="tenant-1")
+        key = audit_logs_manager.count_cache.version_key
+
+        set_request_tenant_aware(True)
+        set_tenant_details_to_request_thread(tenant)
+        tenant_version = audit_logs_manager.cache.get(key)
+        writer.write(audit_log_data(), using="default")
+
+        set_tenant_details_to_request_thread(None)
+        global_version = audit_logs_manager.cache.get(key)
+        writer.flush()
+
+        self.assertEqual(audit_logs_manager.cache.get(key), global_version)
+        self.assertIsNone(
+            get_tenant_details_from_request_thread(raise_err=False)["tenant_id"]
+        )
+        set_tenant_details_to_request_thread(tenant)
+        self.assertNotEqual(audit_logs_manager.cache.get(key), tenant_version)
+        set_tenant_details_to_request_thread(None)
@@ -2,19 +2,29 @@
 Create an audit log entry for actions performed in the application.
 """
 
+from utils.timing import timed
 from utils.functions import get_client_info
+from utils.constants import AUDIT_TIMING_PHASE
 
 from audit_logs.db_access import audit_logs_manager
+from audit_logs.constants import AUDIT_LOG_EXCLUDED_HEADERS
+from audit_logs.utils.audit_writer import audit_log_writer
 
+from tenant.utils.helpers import get_tenant_details_from_request_thread
 
+
+@timed(AUDIT_TIMING_PHASE)
 def create_audit_log_entry(request, module_name, action):
     """
     Create an audit log entry with the provided request and module name.
+    The entry is handed to the buffered audit log writer, so it is written
+    outside of the request.
     """
     user_id = request.user.user_id
     client_info = get_client_info(request)
     headers = dict(request.headers) if hasattr(request, "headers") else {}
-    headers.pop("Authorization", None)  # Remove Authorization header if present
+    for header in AUDIT_LOG_EXCLUDED_HEADERS:
+        headers.pop(header, None)
 
     data = {
         "user_id": user_id,
@@ -28,4 +38,8 @@ def create_audit_log_entry(request, module_name, action):
         "request_route": request.resolver_match.route,
         "client_user_agent": client_info["client_user_agent"],
     }
-    return audit_logs_manager.create(data=data)
+
+    if audit_logs_manager.is_tenant_aware:
+        data["tenant_id"] = get_tenant_details_from_request_thread()["tenant_id"]
+
+    return audit_log_writer.write(data=data, using=audit_logs_manager.using)
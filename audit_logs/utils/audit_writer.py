@@ -0,0 +1,244 @@
+"""
+Buffered writer taking the audit log inserts out of the request.
+"""
+
+import os
+import json
+import queue
+import atexit
+import threading
+from time import monotonic
+from contextlib import contextmanager
+
+from django.db import close_old_connections
+
+from utils import settings
+from utils.functions import is_test
+from utils.logger import log_msg, logging
+
+from tenant.utils.helpers import (
+    is_request_tenant_aware,
+    set_request_tenant_aware,
+    get_tenant_details_from_request_thread,
+    set_tenant_details_to_request_thread,
+)
+
+from audit_logs.db_access import audit_logs_manager
+from audit_logs.constants import (
+    AUDIT_LOG_BATCH_SIZE,
+    AUDIT_LOG_BUFFER_SIZE,
+    AUDIT_LOG_SPILL_FILE,
+    AUDIT_LOG_FLUSH_INTERVAL,
+    AuditLogOverflowEnum,
+)
+
+
+def get_request_tenant() -> tuple:
+    """
+    Returns the tenant object and the tenant awareness of the current thread.
+    """
+
+    tenant_obj = get_tenant_details_from_request_thread(
+        raise_err=False, g_t_obj=True
+    )["tenant_obj"]
+    return tenant_obj, is_request_tenant_aware()
+
+
+@contextmanager
+def request_tenant(tenant_obj, tenant_aware: bool):
+    """
+    Runs the block with the tenant of the request an audit log was queued from,
+    so the writes (and the count versions they bump) land on that tenant. The
+    tenant of the calling thread is restored afterwards.
+    """
+
+    previous = get_request_tenant()
+    set_request_tenant_aware(tenant_aware)
+    set_tenant_details_to_request_thread(tenant_obj)
+    try:
+        yield
+    finally:
+        set_request_tenant_aware(previous[1])
+        set_tenant_details_to_request_thread(previous[0])
+
+
+class AuditLogWriter:
+    """
+    Keeps the audit logs in a bounded in-process queue and writes them from a
+    background thread, with one bulk insert per database alias. A batch is written
+    once it reaches `batch_size` entries or `flush_interval` seconds after its first
+    entry.
+
+    When the queue is full, or a batch can not be written, the entries are dropped
+    or appended to a JSON lines spill file depending on `overflow`.
+    In sync mode (the default in the TEST env) every entry is written at once.
+
+    Every entry carries the tenant of the request it was queued from, and is
+    written with that tenant restored in the writing thread.
+    """
+
+    def __init__(
+        self,
+        sync: bool = None,
+        batch_size: int = AUDIT_LOG_BATCH_SIZE,
+        flush_interval: float = AUDIT_LOG_FLUSH_INTERVAL,
+        buffer_size: int = AUDIT_LOG_BUFFER_SIZE,
+        overflow: str = AuditLogOverflowEnum.SPILL,
+        spill_path: str = None,
+    ):
+        self.sync = sync
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.spill_path = spill_path
+        self.buffer = queue.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+        self._pid = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def is_sync(self) -> bool:
+        return is_test() if self.sync is None else self.sync
+
+    def get_spill_path(self) -> str:
+        return self.spill_path or os.path.join(
+            settings.read("LOG_DIR"), AUDIT_LOG_SPILL_FILE
+        )
+
+    def write(self, data: dict, using: str):
+        """
+        Queues the audit log to be written on the given database alias, with the
+        tenant of the current request.
+        """
+
+        entry = (using, data, *get_request_tenant())
+        if self.is_sync:
+            return self.write_batch([entry])
+
+        self._ensure_thread()
+        try:
+            self.buffer.put_nowait(entry)
+        except queue.Full:
+            self._overflow([entry])
+
+        return None
+
+    def _ensure_thread(self):
+        """
+        Starts the flusher thread, again in a forked worker since threads do not
+        survive the fork.
+        """
+
+        if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and self._thread and self._thread.is_alive():
+                return
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch:
+                close_old_connections()
+                self.write_batch(batch)
+
+    def _next_batch(self, block: bool = True) -> list:
+        """
+        Collects up to batch_size entries, waiting at most flush_interval after the
+        first one.
+        """
+
+        try:
+            batch = [self.buffer.get(block=block)]
+        except queue.Empty:
+            return []
+
+        deadline = monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self.buffer.get(timeout=timeout))
+                else:
+                    batch.append(self.buffer.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def flush(self):
+        """
+        Writes all the queued audit logs from the calling thread.
+        """
+
+        while True:
+            batch = self._next_batch(block=False)
+            if not batch:
+                return
+            self.write_batch(batch)
+
+    def write_batch(self, batch: list):
+        """
+        Writes the batch with one bulk insert per database alias and tenant.
+        The entries are (using, data, tenant_obj, tenant_aware) tuples.
+        """
+
+        groups = {}
+        for using, data, tenant_obj, tenant_aware in batch:
+            tenant_id = getattr(tenant_obj, "tenant_id", None)
+            group = groups.setdefault(
+                (using, tenant_id, tenant_aware), (tenant_obj, [])
+            )
+            group[1].append(data)
+
+        for (using, _, tenant_aware), (tenant_obj, rows) in groups.items():
+            try:
+                with self._write_lock, request_tenant(tenant_obj, tenant_aware):
+                    audit_logs_manager.disable_tenant_aware().create(
+                        data=rows, many=True, using=using
+                    )
+            except Exception as err:  # pylint: disable=broad-except
+                log_msg(logging.ERROR, "Audit logs write failed", str(err))
+                self._overflow(
+                    [(using, data, tenant_obj, tenant_aware) for data in rows]
+                )
+
+    def _overflow(self, entries: list):
+        """
+        Drops the entries or appends them to the spill file. The tenant is
+        spilled as its id, see the replay_audit_logs command.
+        """
+
+        if self.overflow == AuditLogOverflowEnum.SPILL:
+            try:
+                with self._write_lock, open(
+                    self.get_spill_path(), "a", encoding="utf-8"
+                ) as spill:
+                    for using, data, tenant_obj, tenant_aware in entries:
+                        entry = {
+                            "using": using,
+                            "data": data,
+                            "tenant_id": getattr(tenant_obj, "tenant_id", None),
+                            "tenant_aware": tenant_aware,
+                        }
+                        spill.write(json.dumps(entry, default=str))
+                        spill.write("\n")
+                return
+            except OSError as err:
+                log_msg(logging.ERROR, "Audit logs spill failed", str(err))
+
+        self.dropped += len(entries)
+
+
+audit_log_writer = AuditLogWriter()
+atexit.register(audit_log_writer.flush)
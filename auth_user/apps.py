@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AuthUserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "auth_user"
+
+    def ready(self):
+        """
+        Loads the default authenticators at startup instead of on the first request.
+        """
+
+        from authentication.auth import default_authenticators
+
+        default_authenticators.load()
@@ -2,6 +2,10 @@
 Database access layer for the authentication user module.
 """
 
+from django.db.models import FilteredRelation, Q
+
+from utils.functions import get_uuid
+
 from base.db_access import manager
 from auth_user.models import User, Token, Permission, RolePermissionMapping
 
@@ -12,6 +16,86 @@ class UserManager(manager.Manager[User]):
     """
 
     model = User
+    use_identity_map = True
+
+    user_version_key = "user_version"
+
+    def get_user_cache_key(self, user_id) -> str:
+        """
+        Returns the cache key of the user under the current users version.
+        """
+
+        version = self.cache.get(self.user_version_key)
+        if version is None:
+            version = get_uuid()
+            self.cache.set(self.user_version_key, version, None)
+
+        return f"user:{version}:{user_id}"
+
+    def get_cached(self, user_id) -> User | None:
+        """
+        Returns the user cached by the authentication, or None.
+        """
+
+        return self.cache.get(self.get_user_cache_key(user_id))
+
+    def set_cached(self, user: User):
+        return self.cache.set(self.get_user_cache_key(user.user_id), user)
+
+    def on_write(self):
+        """
+        Also drops the cached users of the tenant, so a changed role or a deleted
+        user is not served from the cache by the authentication.
+        """
+
+        super().on_write()
+        self.cache.set(self.user_version_key, get_uuid(), None)
+
+    def update(self, data, query, using=None, obj: User = None) -> User | None:
+        """
+        Also revokes the JWTs of the user when its role changes, they carry the
+        role in their claims.
+        """
+
+        from authentication.jwt_revocation import jwt_revocations
+
+        role_id = obj.role_id if obj else None
+        obj = super().update(data, query, using=using, obj=obj)
+
+        if obj and "role_id" in data and data["role_id"] != role_id:
+            jwt_revocations.revoke(obj.user_id)
+        return obj
+
+    def delete(
+        self, query=None, data=None, soft_delete=True, force_delete=False, using=None
+    ):
+        """
+        Also revokes the JWTs of the deleted users.
+        """
+
+        from authentication.jwt_revocation import jwt_revocations
+
+        if isinstance(query, dict) and "user_id" in query:
+            user_ids = [query["user_id"]]
+        else:
+            user_ids = list(
+                self._parse_query(dict(query or {}), using=using).values_list(
+                    "user_id", flat=True
+                )
+            )
+
+        deleted = super().delete(
+            query=query,
+            data=data,
+            soft_delete=soft_delete,
+            force_delete=force_delete,
+            using=using,
+        )
+
+        if deleted:
+            for user_id in user_ids:
+                jwt_revocations.revoke(user_id)
+        return deleted
 
 
 class PermissionManager(manager.Manager[Permission]):
@@ -20,6 +104,50 @@ class PermissionManager(manager.Manager[Permission]):
     """
 
     model = Permission
+    use_identity_map = True
+
+    def get_role_permission_table(self) -> dict:
+        """
+        Compiles the registered permissions and the permissions of every role with
+        a single query.
+
+        Returns:
+            dict: "registered" is a frozenset of (module, action) and "roles" maps
+                each role_id to the frozenset of its (module, action).
+        """
+
+        rows = (
+            self._parse_query({})
+            .annotate(
+                mapping=FilteredRelation(
+                    "rolepermissionmapping",
+                    condition=Q(rolepermissionmapping__is_deleted=False),
+                )
+            )
+            .values_list("module", "action", "mapping__role_id")
+            .distinct()
+        )
+
+        registered, roles = set(), {}
+        for module, action, role_id in rows:
+            registered.add((module, action))
+            if role_id is not None:
+                roles.setdefault(role_id, set()).add((module, action))
+
+        return {
+            "registered": frozenset(registered),
+            "roles": {role_id: frozenset(perms) for role_id, perms in roles.items()},
+        }
+
+    def on_write(self):
+        """
+        Also drops the compiled role permission table of the tenant.
+        """
+
+        from auth_user.utils.permission import role_permission_table
+
+        super().on_write()
+        role_permission_table.invalidate()
 
 
 class RolePermissionMappingManager(manager.Manager[RolePermissionMapping]):
@@ -29,6 +157,16 @@ class RolePermissionMappingManager(manager.Manager[RolePermissionMapping]):
 
     model = RolePermissionMapping
 
+    def on_write(self):
+        """
+        Also drops the compiled role permission table of the tenant.
+        """
+
+        from auth_user.utils.permission import role_permission_table
+
+        super().on_write()
+        role_permission_table.invalidate()
+
 
 class TokenManager(manager.Manager[Token]):
     """
@@ -37,6 +175,18 @@ class TokenManager(manager.Manager[Token]):
 
     model = Token
     check_is_deleted: bool = False
+    related = ["user"]
+
+    def get_user_tokens(self, user, using=None) -> list[str]:
+        """
+        Returns the tokens of the user.
+        """
+
+        return list(
+            self._parse_query({"user": user}, using=using).values_list(
+                "token", flat=True
+            )
+        )
 
 
 user_manager = UserManager()
@@ -89,23 +89,12 @@ class Permission(BaseModel, models.Model):
 
         db_table = "permissions"
 
-    def to_dict(self):
-        """
-        Convert Permission model instance to a dictionary representation.
-        Returns:
-            dict: A dictionary containing the permission details with the following keys:
-                - name (str): The name of the permission
-                - module (str): The module this permission belongs to
-                - action (str): The action type of the permission
-                - permission_id (int): The unique identifier of the permission
-        """
-
-        return {
-            "name": self.name,
-            "module": self.module,
-            "action": self.action,
-            "permission_id": self.permission_id,
-        }
+    dict_fields = (
+        "name",
+        "module",
+        "action",
+        "permission_id",
+    )
 
 
 class RolePermissionMapping(BaseModel, models.Model):
@@ -128,16 +117,10 @@ class RolePermissionMapping(BaseModel, models.Model):
 
         db_table = "role_permission_mappings"
 
-    def to_dict(self):
-        """
-        Convert the model instance to a dictionary.
-        Returns:
-            dict: Dictionary representation of the model instance.
-        """
-        return {
-            "role_id": self.role_id,
-            "permission_id": self.permission_id,
-        }
+    dict_fields = (
+        "role_id",
+        "permission_id",
+    )
 
 
 class Token(BaseModel, models.Model):
@@ -156,14 +139,7 @@ class Token(BaseModel, models.Model):
 
         db_table = "token"
 
-    def to_dict(self):
-        """
-        Convert the Token instance to a dictionary representation.
-
-        Returns:
-            dict: Dictionary representation of the Token instance.
-        """
-        return {
-            "token": self.token,
-            "created_dtm": self.created_dtm,
-        }
+    dict_fields = (
+        "token",
+        "created_dtm",
+    )
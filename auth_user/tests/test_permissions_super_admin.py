@@ -36,6 +36,30 @@ class PermissionTestCase(TestCaseBase):
 
         return tenant_config
 
+    def test_load_permissions_twice_does_not_duplicate(self):
+        """Test that reloading permissions upserts the existing rows instead of adding new ones."""
+        from auth_user.db_access import permission_manager
+
+        tenant_config = self.test_load_permissions()
+        tenant_id = tenant_config["tenant"]["tenant_id"]
+
+        _permission_manager = permission_manager.disable_tenant_aware()
+        count = _permission_manager.count(query={"tenant_id": tenant_id})
+        self.assertTrue(count)
+
+        self.test_load_permissions(tenant_config=tenant_config)
+
+        self.assertEqual(_permission_manager.count(query={"tenant_id": tenant_id}), count)
+        self.assertEqual(
+            _permission_manager.list(query={"tenant_id": tenant_id})
+            .values("module", "action")
+            .distinct()
+            .count(),
+            count,
+        )
+
+        return True
+
     def test_load_permission_with_wrong_tenant(self):
         """Test that loading permissions with an invalid tenant_id returns the correct error response."""
 
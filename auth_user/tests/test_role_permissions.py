@@ -214,3 +214,51 @@ class RolePermissionTestCase(TestCaseBase):
         self.data_not_found_404(response_data)
 
         return True
+
+    def get_role_permission_table(self, tenant):
+        from auth_user.utils.permission import role_permission_table
+        from tenant.utils.helpers import (
+            set_request_tenant_aware,
+            set_tenant_details_to_request_thread,
+        )
+
+        set_request_tenant_aware(True)
+        set_tenant_details_to_request_thread(tenant_obj=tenant)
+        return role_permission_table.get_table()
+
+    def test_role_permission_table_follows_mappings(self):
+        """
+        Test that the compiled role permission table is cached and rebuilt when the
+        role permissions change.
+        """
+        from auth_user.tests.test_permissions import PermissionTestCase
+
+        permissions = PermissionTestCase().setUp().test_get_permissions()
+        granted = {(p["module"], p["action"]) for p in permissions}
+        tenant = self.setup_tenant()
+
+        table = self.get_role_permission_table(tenant)
+        self.assertTrue(granted <= table["registered"])
+        self.assertFalse(table["roles"].get(RoleEnum.OPERATOR))
+
+        self.test_create_role_permissions()
+
+        table = self.get_role_permission_table(tenant)
+        self.assertEqual(table["roles"][RoleEnum.OPERATOR], granted)
+
+        with self.assertNumQueries(0):
+            self.get_role_permission_table(tenant)
+
+        permission = permissions[0]
+        self.client.delete(
+            self.path_id.format(
+                role_id=RoleEnum.OPERATOR,
+                permission_id=permission["permission_id"],
+            )
+        )
+
+        table = self.get_role_permission_table(tenant)
+        self.assertNotIn(
+            (permission["module"], permission["action"]),
+            table["roles"][RoleEnum.OPERATOR],
+        )
@@ -3,9 +3,16 @@ This module provides utilities for registering and managing
 permissions for different modules and their actions.
 """
 
+from utils.functions import get_uuid
+from utils.cache import global_cache
+
 from auth_user.db_access import permission_manager
 
 from tenant.utils.tenant_conf import get_tenant_db_name
+from tenant.utils.helpers import (
+    is_request_tenant_aware,
+    get_tenant_details_from_request_thread,
+)
 
 
 class LoadPermission:
@@ -35,32 +42,101 @@ class LoadPermission:
     def load_permissions_for_tenant(self, tenant_id):
         """
         Loads all registered modules and their actions into the
-        permission manager for a single tenant.
+        permission manager for a single tenant with one bulk upsert.
         """
 
         db_name = get_tenant_db_name(tenant_id)
 
+        rows = []
         for module, action_and_name_list in self.__modules_and_there_actions.items():
             for action_and_name in action_and_name_list:
-                self.__upsert_permission(module, action_and_name, db_name, tenant_id)
+                rows.append(
+                    {
+                        "module": module,
+                        **action_and_name,
+                        "tenant_id": tenant_id,
+                    }
+                )
+
+        result = permission_manager.disable_tenant_aware().bulk_upsert(
+            rows=rows,
+            conflict_fields=["tenant_id", "module", "action"],
+            update_fields=["name"],
+            using=db_name,
+        )
+        role_permission_table.invalidate(tenant_id)
+        return result
+
+
+class RolePermissionTable:
+    """
+    Compiled permissions of a tenant, the registered (module, action) pairs and the
+    pairs granted to each role, so a permission check is a set membership test.
+
+    The table is built with one query and kept in the cache under the shared version
+    of the tenant. Any write of a permission or a role permission mapping bumps the
+    version (see `invalidate`), so every worker builds the table again.
+    Requests which are not tenant aware use the table of the "global" scope.
+    """
 
-    def __upsert_permission(self, module, action_and_name, db_name, tenant_id):
+    global_scope = "global"
+
+    def get_scope(self):
         """
-        Upserts a single permission into the permission manager.
+        Returns the tenant_id of the tenant aware request or the global scope.
         """
-        permission_manager.disable_tenant_aware().upsert(
-            data={
-                "module": module,
-                **action_and_name,
-                "tenant_id": tenant_id,
-            },
-            query={
-                "module": module,
-                "tenant_id": tenant_id,
-                "action": action_and_name["action"],
-            },
-            using=db_name,
-        )
+
+        if not is_request_tenant_aware():
+            return self.global_scope
+
+        tenant_id = get_tenant_details_from_request_thread(raise_err=False)["tenant_id"]
+        return tenant_id or self.global_scope
+
+    @staticmethod
+    def _version_key(scope):
+        return f"role_permissions_version:{scope}"
+
+    def get_version(self, scope):
+        """
+        Returns the shared version of the scope table, creating it if needed.
+        """
+        key = self._version_key(scope)
+
+        version = global_cache.get(key)
+        if version is None:
+            version = get_uuid()
+            global_cache.set(key, version, None)
+
+        return version
+
+    def get_table(self) -> dict:
+        """
+        Returns the compiled table of the current scope.
+        """
+
+        scope = self.get_scope()
+        key = f"role_permissions:{scope}:{self.get_version(scope)}"
+
+        table = global_cache.get(key)
+        if table is None:
+            table = permission_manager.get_role_permission_table()
+            global_cache.set(key, table)
+
+        return table
+
+    def invalidate(self, scope=None):
+        """
+        Drops the table of the scope in every worker by bumping its shared version.
+        Defaults to the scope of the current request. The global table spans all
+        the tenants, so it is dropped as well.
+        """
+        scope = scope or self.get_scope()
+
+        global_cache.set(self._version_key(scope), get_uuid(), None)
+        if scope != self.global_scope:
+            global_cache.set(self._version_key(self.global_scope), get_uuid(), None)
+        return True
 
 
 load_permission = LoadPermission()
+role_permission_table = RolePermissionTable()
@@ -2,8 +2,10 @@
 Login and Logout ViewSets for handling user authentication.
 """
 
-import jwt
 import secrets
+from time import time
+
+import jwt
 
 from rest_framework import status, viewsets
 from drf_spectacular.utils import extend_schema
@@ -11,6 +13,10 @@ from drf_spectacular.utils import extend_schema
 from base.views.delete import DeleteView
 from base.views.create import CreateView
 
+from authentication.principal import JWTPrincipal
+from authentication.token_cache import token_cache
+from authentication.constants import JWT_TOKEN_TTL
+from authentication.jwt_revocation import jwt_revocations
 from authentication.permission import register_permission
 from authentication.auth import get_authentication_classes
 from authentication.exception import WrongCredentialsException
@@ -93,7 +99,7 @@ class LoginViewSet(CreateView, viewsets.ViewSet):
         request = kwargs["request"]
         user_obj = self.check_password(data["username"], data["password"], request)
 
-        self.manager.delete({"user": user_obj}, soft_delete=False)
+        token_cache.delete_user_tokens(user_obj, using=self.manager.using)
 
         return {"user": user_obj, "token": secrets.token_hex(16).upper()}
 
@@ -102,8 +108,7 @@ class LoginViewSet(CreateView, viewsets.ViewSet):
         Handle post-save actions after user login.
         """
 
-        if is_request_tenant_aware():
-            user_manager.cache.set(obj.user_id, obj.user)
+        token_cache.set(obj.token, obj.user)
 
         return generate_response(
             data=obj.to_dict(),
@@ -153,14 +158,23 @@ class LoginViewSet(CreateView, viewsets.ViewSet):
 
         user_obj = self.check_password(data["username"], data["password"], request)
 
+        # The issue time is not rounded, a token issued right after a revocation
+        # of the user must not be taken as issued at the same time
+        now = time()
         access_token = jwt.encode(
             algorithm="HS256",
             key=settings.read("SECRET_KEY"),
-            payload={"user_id": user_obj.user_id},
+            payload={
+                "user_id": user_obj.user_id,
+                "role_id": user_obj.role_id,
+                "tenant_id": user_obj.tenant_id,
+                "iat": now,
+                "exp": int(now) + JWT_TOKEN_TTL,
+            },
         )
 
         if is_request_tenant_aware():
-            user_manager.cache.set(user_obj.user_id, user_obj)
+            user_manager.set_cached(user_obj)
 
         return generate_response(
             data={"token": access_token, "created_dtm": user_obj.last_login},
@@ -186,10 +200,14 @@ class LogoutViewSet(DeleteView, viewsets.ViewSet):
     @register_permission(MODULE_NAME, MethodEnum.DELETE, "Logout", check=False)
     def destroy(self, request, **kwargs):
         """
-        Handle user logout by deleting the token associated with the user.
+        Handle user logout by deleting the tokens of the user, or by revoking
+        them for the JWT authentication.
         """
 
-        self.manager.delete({"user": request.user}, soft_delete=False)
+        if isinstance(request.user, JWTPrincipal):
+            jwt_revocations.revoke(request.user.user_id)
+        else:
+            token_cache.delete_user_tokens(request.user, using=self.manager.using)
 
         return generate_response(
             data=None,
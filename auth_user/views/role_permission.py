@@ -117,12 +117,9 @@ class RolePermissionViewSet(CreateView, DeleteView, ListView, viewsets.ViewSet):
             "permission_id": kwargs["permission_id"],
         }
 
-        obj = self.manager.get(query=query)
-        if not obj:
+        if not self.manager.delete(query=query):
             raise NoDataFoundError()
 
-        self.manager.delete(query=query)
-
         return generate_response(
             data=None,
             messages={"message": success.DELETED_SUCCESSFULLY},
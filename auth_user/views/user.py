@@ -59,6 +59,16 @@ class UserViewSet(BaseView, viewsets.ViewSet):
     list_serializer_class = UserListQuerySerializer
     search_fields = ["first_name", "last_name"]
 
+    export_fields = [
+        "user_id",
+        "email",
+        "role_id",
+        "first_name",
+        "last_name",
+        "phone_number",
+        "profile_photo",
+    ]
+
     get_authenticators = get_authentication_classes
 
     def save(self, data, **kwargs):
@@ -155,6 +165,16 @@ class UserCompanyAdminsViewSet(
 
     filter_fields = ["tenant_id"]
 
+    export_fields = [
+        "user_id",
+        "email",
+        "role_id",
+        "first_name",
+        "last_name",
+        "phone_number",
+        "profile_photo",
+    ]
+
     get_authenticators = get_authentication_classes
 
     @classmethod
@@ -3,14 +3,19 @@ This module provides a function to get authentication classes for the API views.
 """
 
 import importlib
+from time import monotonic
 
 from utils import settings
 from utils.messages import error
 from utils.exceptions.exceptions import BadRequestError
 
-from tenant.constants import AuthenticationTypeEnum
-from tenant.utils.helpers import is_request_tenant_aware
+from tenant.utils.tenant_conf import tenant_routing_table
 from tenant.db_access import tenant_configuration_manager
+from tenant.constants import AuthenticationTypeEnum, TENANT_ROUTING_TTL
+from tenant.utils.helpers import (
+    is_request_tenant_aware,
+    get_tenant_details_from_request_thread,
+)
 
 from .jwt_token import JWTAuthentication
 
@@ -30,14 +35,128 @@ def import_authentication_class(class_name):
     return current_module.__dict__[auth_class_name]
 
 
+class DefaultAuthenticators:
+    """
+    The DEFAULT_AUTHENTICATION_CLASSES, imported and instantiated once per process
+    at startup (see AuthUserConfig.ready). The authenticators are stateless, so the
+    same instances serve every request.
+    """
+
+    def __init__(self):
+        self._authenticators = None
+
+    def load(self):
+        """
+        Imports and instantiates the authentication classes.
+        """
+
+        str_auth_class = settings.read("DEFAULT_AUTHENTICATION_CLASSES")
+        self._authenticators = [
+            import_authentication_class(class_name)() for class_name in str_auth_class
+        ]
+        return self._authenticators
+
+    def get(self):
+        """
+        Returns the authenticators, loaded on first use when the app registry did
+        not load them (e.g. outside of Django).
+        """
+
+        return self._authenticators or self.load()
+
+
+default_authenticators = DefaultAuthenticators()
+
+jwt_authenticators = [JWTAuthentication()]
+
+
+class TenantAuthenticatorTable:
+    """
+    Per-process table of the authenticators resolved for each tenant.
+
+    The authenticators are resolved once per (tenant_id, config_version) and trusted
+    for `ttl` seconds, after that the tenant configuration version is compared with
+    the shared one, so a configuration change (which bumps it) makes the workers
+    resolve the authenticators again.
+
+    Each tenant has a single (authenticators, config_version, expires_at) entry,
+    replaced as a whole, so a reader never sees a partly updated entry.
+    """
+
+    def __init__(self, ttl: int = TENANT_ROUTING_TTL):
+        self.ttl = ttl
+        # tenant_id -> (authenticators, config_version, expires_at)
+        self._entries = {}
+
+    @staticmethod
+    def resolve(authentication_type):
+        """
+        Returns the authenticators of an authentication type.
+        """
+
+        if authentication_type == AuthenticationTypeEnum.TOKEN:
+            return default_authenticators.get()
+
+        if authentication_type == AuthenticationTypeEnum.JWT_TOKEN:
+            return jwt_authenticators
+
+        raise BadRequestError(error.AUTHENTICATION_NOT_CONFIGURED)
+
+    def get(self, tenant_id):
+        """
+        Returns the authenticators of the tenant.
+        """
+
+        entry = self._entries.get(tenant_id)
+        if entry is not None:
+            authenticators, version, expires_at = entry
+            if monotonic() < expires_at:
+                return authenticators
+
+            if tenant_routing_table.get_version(tenant_id) == version:
+                self._entries[tenant_id] = (
+                    authenticators,
+                    version,
+                    monotonic() + self.ttl,
+                )
+                return authenticators
+
+        version = tenant_routing_table.get_version(tenant_id)
+        tenant_configuration_obj = tenant_configuration_manager.get({})
+
+        if not tenant_configuration_obj:
+            raise BadRequestError(error.TENANT_CONFIGURATION_NOT_FOUND)
+
+        authenticators = self.resolve(tenant_configuration_obj.authentication_type)
+        self._entries[tenant_id] = (authenticators, version, monotonic() + self.ttl)
+
+        return authenticators
+
+    def invalidate(self, tenant_id):
+        """
+        Drops the authenticators of the tenant in this process, the other workers
+        follow the configuration version bumped by the tenant routing table.
+        """
+        self._entries.pop(tenant_id, None)
+        return True
+
+    def clear(self):
+        """
+        Drops all the resolved authenticators of this process.
+        """
+        self._entries.clear()
+        return True
+
+
+tenant_authenticator_table = TenantAuthenticatorTable()
+
+
 def get_default_authentication_class(*_, **__):
     """
     This function returns the default authentication class object to be used in the API views.
     """
 
-    str_auth_class = settings.read("DEFAULT_AUTHENTICATION_CLASSES")
-
-    return [import_authentication_class(class_name)() for class_name in str_auth_class]
+    return default_authenticators.get()
 
 
 def get_jwt_authentication_class(*_, **__):
@@ -45,27 +164,18 @@ def get_jwt_authentication_class(*_, **__):
     This function returns the JWT authentication class object to be used in the API views.
     """
 
-    return [JWTAuthentication()]
+    return jwt_authenticators
 
 
 def get_authentication_classes(*_, **__):
     """
     This function returns a list of authentication classes to be used in the API views.
     The authentication classes are used to authenticate users and provide access control.
+    The authenticators of a tenant are resolved once per configuration version.
     """
 
     if not is_request_tenant_aware():
-        return get_default_authentication_class()
-
-    tenant_configuration_obj = tenant_configuration_manager.get({})
-
-    if not tenant_configuration_obj:
-        raise BadRequestError(error.TENANT_CONFIGURATION_NOT_FOUND)
-
-    if tenant_configuration_obj.authentication_type == AuthenticationTypeEnum.TOKEN:
-        return get_default_authentication_class()
-
-    if tenant_configuration_obj.authentication_type == AuthenticationTypeEnum.JWT_TOKEN:
-        return [JWTAuthentication()]
+        return default_authenticators.get()
 
-    raise BadRequestError(error.AUTHENTICATION_NOT_CONFIGURED)
+    tenant_id = get_tenant_details_from_request_thread()["tenant_id"]
+    return tenant_authenticator_table.get(tenant_id)
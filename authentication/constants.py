@@ -0,0 +1,24 @@
+"""
+Constants for the authentication module.
+"""
+
+# Seconds a stored last_login is considered fresh, newer requests do not update it
+LAST_LOGIN_UPDATE_THRESHOLD: int = 300
+
+# Seconds the recorded last_login values are kept before being written in one UPDATE
+LAST_LOGIN_FLUSH_INTERVAL: int = 30
+
+# Seconds a token lookup is cached
+TOKEN_CACHE_TTL: int = 900
+
+# Extend the cached token lookup on use (sliding expiry)
+TOKEN_CACHE_SLIDING: bool = True
+
+# Seconds a JWT is valid after it is issued
+JWT_TOKEN_TTL: int = 12 * 60 * 60
+
+# Seconds the JWT revocations of a worker are trusted before new ones are read
+JWT_REVOCATION_CHECK_INTERVAL: int = 1
+
+# Maximum number of shared JWT revocations read when a worker starts
+JWT_REVOCATION_SCAN_LIMIT: int = 10000
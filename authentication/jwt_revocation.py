@@ -0,0 +1,130 @@
+"""
+Revocation of the JWTs issued in the signed claims mode.
+"""
+
+import threading
+from time import time, monotonic
+
+from utils.cache import global_cache
+
+from authentication.constants import (
+    JWT_TOKEN_TTL,
+    JWT_REVOCATION_SCAN_LIMIT,
+    JWT_REVOCATION_CHECK_INTERVAL,
+)
+
+
+class JWTRevocations:
+    """
+    Keeps in memory the time the tokens of a user were last revoked.
+
+    Revoking the tokens of a user rejects every token issued ("iat" claim) up to
+    that time. A revocation is kept until all the tokens issued before it are
+    expired, i.e. for the token TTL, and is then forgotten without affecting the
+    tokens issued after it.
+
+    Every revocation is appended to the shared cache under an atomic counter, each
+    worker reads the revocations it has not seen yet at most once per `interval`.
+    """
+
+    count_key = "jwt_revocations:revoked_at:count"
+
+    def __init__(
+        self,
+        ttl: int = JWT_TOKEN_TTL,
+        interval: int = JWT_REVOCATION_CHECK_INTERVAL,
+        scan_limit: int = JWT_REVOCATION_SCAN_LIMIT,
+    ):
+        self.ttl = ttl
+        self.interval = interval
+        self.scan_limit = scan_limit
+
+        # user_id -> time of the last revocation
+        self._revoked = {}
+        self._seen = 0
+        self._missing = {}
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_key(number):
+        return f"jwt_revocations:revoked_at:{number}"
+
+    def _apply(self, user_id, revoked_at):
+        if revoked_at > self._revoked.get(user_id, 0):
+            self._revoked[user_id] = revoked_at
+
+    def refresh(self, force: bool = False):
+        """
+        Reads the revocations done by the other workers since the last check.
+        """
+
+        if not force and monotonic() - self._checked_at < self.interval:
+            return
+
+        count = global_cache.get(self.count_key) or 0
+        with self._lock:
+            if count < self._seen:
+                # The shared counter was lost (eviction or cache clear), start over
+                self._seen, self._missing = 0, {}
+
+            numbers = list(self._missing)
+            if count > self._seen:
+                first = max(self._seen + 1, count - self.scan_limit + 1)
+                numbers.extend(range(first, count + 1))
+                self._seen = count
+
+            entries = global_cache.get_many(
+                [self._entry_key(number) for number in numbers]
+            )
+            for number in numbers:
+                entry = entries.get(self._entry_key(number))
+                if entry:
+                    self._apply(*entry)
+                    self._missing.pop(number, None)
+                else:
+                    self._missing.setdefault(number, monotonic())
+
+            # An entry is written right after its number is taken, give it some time
+            self._missing = {
+                number: missing_since
+                for number, missing_since in self._missing.items()
+                if monotonic() - missing_since < self.interval * 5
+            }
+
+            # The tokens issued before these revocations are expired
+            expired_before = time() - self.ttl
+            self._revoked = {
+                user_id: revoked_at
+                for user_id, revoked_at in self._revoked.items()
+                if revoked_at > expired_before
+            }
+            self._checked_at = monotonic()
+
+    def get_revoked_at(self, user_id) -> float:
+        """
+        Returns the time of the last revocation of the user, 0 if none is kept.
+        """
+
+        self.refresh()
+        return self._revoked.get(user_id, 0)
+
+    def is_revoked(self, user_id, issued_at) -> bool:
+        return issued_at <= self.get_revoked_at(user_id)
+
+    def revoke(self, user_id):
+        """
+        Revokes all the tokens issued to the user so far, in every worker.
+        """
+
+        revoked_at = time()
+
+        number = global_cache.incr(self.count_key)
+        global_cache.set(self._entry_key(number), (user_id, revoked_at), self.ttl)
+
+        with self._lock:
+            self._apply(user_id, revoked_at)
+        return revoked_at
+
+
+jwt_revocations = JWTRevocations()
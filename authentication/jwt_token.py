@@ -3,15 +3,32 @@ import jwt
 from rest_framework.authentication import BaseAuthentication
 
 from utils import settings
+from utils.timing import timed
+from utils.constants import AUTH_TIMING_PHASE
 from auth_user.db_access import user_manager
-from tenant.utils.helpers import is_request_tenant_aware
+from tenant.utils.helpers import (
+    is_request_tenant_aware,
+    get_tenant_details_from_request_thread,
+)
 
+from authentication.principal import JWTPrincipal
 from authentication.exception import UnauthorizedException
+from authentication.jwt_revocation import jwt_revocations
 
 
 class JWTAuthentication(BaseAuthentication):
+    """
+    JWT authentication class for API views.
+    Tokens must carry an expiry. Tokens issued in the signed claims mode (with the
+    role_id, tenant_id and issue time claims) are authenticated from the claims
+    alone, `request.user` is then a JWTPrincipal.
+    """
+
     keyword = "Bearer"
 
+    claims = ("user_id", "role_id", "tenant_id", "iat")
+
+    @timed(AUTH_TIMING_PHASE)
     def authenticate(self, request):
         auth_header = request.headers.get("Authorization")
 
@@ -25,7 +42,7 @@ class JWTAuthentication(BaseAuthentication):
             payload = jwt.decode(
                 jwt=token,
                 algorithms=["HS256"],
-                options={"verify_exp": False},
+                options={"require": ["exp"]},
                 key=settings.read("SECRET_KEY"),
             )
 
@@ -50,8 +67,11 @@ class JWTAuthentication(BaseAuthentication):
 
             raise UnauthorizedException()
 
+        if all(claim in payload for claim in self.claims):
+            return self.authenticate_claims(payload)
+
         if is_request_tenant_aware():
-            user = user_manager.cache.get(payload["user_id"])
+            user = user_manager.get_cached(payload["user_id"])
             if user:
                 return (user, None)
 
@@ -59,9 +79,23 @@ class JWTAuthentication(BaseAuthentication):
         if not user:
             raise UnauthorizedException()
 
-        user_manager.cache.set(payload["user_id"], user)
+        user_manager.set_cached(user)
 
         return (user, None)
 
+    def authenticate_claims(self, payload):
+        """
+        Authenticate the token from its claims, without any I/O.
+        """
+
+        tenant_id = get_tenant_details_from_request_thread(raise_err=False)["tenant_id"]
+        if payload["tenant_id"] != tenant_id:
+            raise UnauthorizedException()
+
+        if jwt_revocations.is_revoked(payload["user_id"], payload["iat"]):
+            raise UnauthorizedException()
+
+        return (JWTPrincipal(payload), payload)
+
     def authenticate_header(self, request):
         return self.keyword
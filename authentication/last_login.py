@@ -0,0 +1,115 @@
+"""
+Coalesces the last_login updates of the authenticated requests.
+"""
+
+import atexit
+import threading
+from time import monotonic
+from datetime import timedelta
+
+from django.db.models import Case, When, Value, DateTimeField
+
+from utils.functions import get_current_datetime, is_test
+
+from auth_user.db_access import user_manager
+
+from authentication.constants import (
+    LAST_LOGIN_FLUSH_INTERVAL,
+    LAST_LOGIN_UPDATE_THRESHOLD,
+)
+
+
+class LastLoginRecorder:
+    """
+    Records the last_login of the users in memory and writes them with one UPDATE
+    per database alias once per `flush_interval`.
+
+    A user is only recorded when its last_login is older than `threshold`, so
+    requests of an active user do not produce any write. The pending values are
+    flushed by the first request after the interval and at exit, in sync mode (the
+    default in the TEST env) they are flushed at once.
+    """
+
+    def __init__(
+        self,
+        threshold: int = LAST_LOGIN_UPDATE_THRESHOLD,
+        flush_interval: int = LAST_LOGIN_FLUSH_INTERVAL,
+        sync: bool = None,
+    ):
+        self.sync = sync
+        self.threshold = timedelta(seconds=threshold)
+        self.flush_interval = flush_interval
+
+        # (database alias, user_id) -> last_login
+        self._pending = {}
+        self._recorded = {}
+        self._flushed_at = monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def is_sync(self) -> bool:
+        return is_test() if self.sync is None else self.sync
+
+    def record(self, user, using: str):
+        """
+        Records the request time as the last_login of the user if the stored one is
+        older than the threshold.
+        """
+
+        now = get_current_datetime()
+        key = (using, user.pk)
+
+        last_login = max(
+            filter(None, (user.last_login, self._recorded.get(key))), default=None
+        )
+        if last_login and now - last_login < self.threshold:
+            user.last_login = last_login
+            return False
+
+        with self._lock:
+            self._pending[key] = now
+            self._recorded[key] = now
+        user.last_login = now
+
+        if self.is_sync or monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+        return True
+
+    def flush(self):
+        """
+        Writes the pending last_login values, one UPDATE per database alias.
+        """
+
+        now = get_current_datetime()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = monotonic()
+            self._recorded = {
+                key: last_login
+                for key, last_login in self._recorded.items()
+                if now - last_login < self.threshold
+            }
+
+        by_alias = {}
+        for (using, user_id), last_login in pending.items():
+            by_alias.setdefault(using, {})[user_id] = last_login
+
+        rows = 0
+        for using, last_logins in by_alias.items():
+            objects = user_manager.model.objects.using(using)
+            rows += objects.filter(user_id__in=list(last_logins)).update(
+                last_login=Case(
+                    *[
+                        When(user_id=user_id, then=Value(last_login))
+                        for user_id, last_login in last_logins.items()
+                    ],
+                    output_field=DateTimeField(),
+                )
+            )
+
+        return rows
+
+
+last_login_recorder = LastLoginRecorder()
+atexit.register(last_login_recorder.flush)
@@ -6,28 +6,61 @@ This module provides a decorator to register and check user permissions
 from functools import wraps
 
 from utils.messages import error
+from utils.timing import timed
+from utils.constants import PERMISSION_TIMING_PHASE
 from utils.exceptions import codes
-from utils.exceptions.exceptions import codes, PermissionDenied, BadRequestError
+from utils.exceptions.exceptions import PermissionDenied, BadRequestError
 
 from audit_logs.utils.audit_log import create_audit_log_entry
 
 from auth_user.constants import RoleEnum
-from auth_user.utils.permission import load_permission
-from auth_user.db_access import permission_manager, role_permission_mapping_manager
+from auth_user.utils.permission import load_permission, role_permission_table
 
 from tenant.utils.helpers import is_request_tenant_aware
 
 
+def check_permission(user, module: str, action: str, create_permission: bool = True):
+    """
+    Raises PermissionDenied when the user may not do the action on the module.
+    Permissions which are not created can only be used by the super admin.
+    """
+
+    is_super_admin = RoleEnum.SUPER_ADMIN == user.role_id
+
+    if not create_permission:
+        if not is_super_admin:
+            raise PermissionDenied()
+        return
+
+    table = role_permission_table.get_table()
+    if (module, action) not in table["registered"]:
+        raise BadRequestError(
+            error.PERMISSION_NOT_REGISTER,
+            code=codes.PERMISSION_NOT_REGISTERED,
+        )
+
+    is_company_admin = False
+    if is_request_tenant_aware():
+        is_company_admin = RoleEnum.COMPANY_ADMIN == user.role_id
+
+    if (
+        not is_super_admin
+        and not is_company_admin
+        and (module, action) not in table["roles"].get(user.role_id, ())
+    ):
+        raise PermissionDenied()
+
+
 def register_permission(
     module: str,
     action: str,
     name: str,
     check: bool = True,
     create_permission: bool = True,
-    **m_kwargs,
 ):
     """
     Register a permission with the given module, action, and name.
+    The check is done against the compiled role permission table of the tenant.
     """
 
     if check and create_permission:
@@ -53,48 +86,9 @@ def register_permission(
                 module_name=module,
             )
 
-            if not check:
-                return view(self, request, *args, **kwargs)
-
-            is_super_admin = RoleEnum.SUPER_ADMIN == request.user.role_id
-
-            if not create_permission:
-
-                if not is_super_admin:
-                    raise PermissionDenied()
-
-                return view(self, request, *args, **kwargs)
-
-            if not m_kwargs.get("permission_obj"):
-                permission_obj = permission_manager.get(
-                    query={
-                        "action": action,
-                        "module": module,
-                    },
-                )
-                if not permission_obj:
-                    raise BadRequestError(
-                        error.PERMISSION_NOT_REGISTER,
-                        code=codes.PERMISSION_NOT_REGISTERED,
-                    )
-
-                m_kwargs["permission_obj"] = permission_obj
-
-            is_company_admin = False
-            if is_request_tenant_aware():
-                is_company_admin = RoleEnum.COMPANY_ADMIN == request.user.role_id
-
-            if (
-                not is_super_admin
-                and not is_company_admin
-                and not role_permission_mapping_manager.exists(
-                    query={
-                        "role_id": request.user.role_id,
-                        "permission_id": m_kwargs["permission_obj"].permission_id,
-                    }
-                )
-            ):
-                raise PermissionDenied()
+            if check:
+                with timed(PERMISSION_TIMING_PHASE):
+                    check_permission(request.user, module, action, create_permission)
 
             return view(self, request, *args, **kwargs)
 
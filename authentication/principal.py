@@ -0,0 +1,49 @@
+"""
+Lightweight request user built from the claims of a JWT.
+"""
+
+from auth_user.db_access import user_manager
+
+from authentication.exception import UnauthorizedException
+
+
+class JWTPrincipal:
+    """
+    Request user built from the signed claims of a JWT, it holds the user_id,
+    role_id and tenant_id without loading the user. Any other attribute loads the
+    User (from the user cache or the database) on first access and is read from it.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, claims: dict):
+        self.user_id = claims["user_id"]
+        self.role_id = claims["role_id"]
+        self.tenant_id = claims["tenant_id"]
+        self._user = None
+
+    @property
+    def pk(self):
+        return self.user_id
+
+    def get_user(self):
+        """
+        Returns the User of the principal, loaded once.
+        """
+
+        if self._user is None:
+            user = user_manager.get_cached(self.user_id)
+            if not user:
+                user = user_manager.get({"user_id": self.user_id})
+                if not user:
+                    raise UnauthorizedException()
+                user_manager.set_cached(user)
+            self._user = user
+
+        return self._user
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.get_user(), name)
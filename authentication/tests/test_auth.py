@@ -0,0 +1,134 @@
+from django.test import TestCase, override_settings
+
+from tenant.db_access import tenant_manager, tenant_configuration_manager
+from tenant.utils.tenant_conf import tenant_routing_table
+from base.db_access.identity_map import start_identity_map, clear_identity_map
+from tenant.utils.helpers import (
+    set_request_tenant_aware,
+    set_tenant_details_to_request_thread,
+)
+
+from authentication.token import TokenAuthentication
+from authentication.jwt_token import JWTAuthentication
+from authentication.auth import (
+    get_authentication_classes,
+    tenant_authenticator_table,
+)
+
+
+class TestGetAuthenticationClasses(TestCase):
+
+    def setUp(self):
+        set_request_tenant_aware(False)
+        self.tenant = tenant_manager.create(
+            data={"tenant_code": "auth", "tenant_name": "Auth Tenant"}
+        )
+        self.set_authentication_type("JWT_TOKEN")
+
+        set_request_tenant_aware(True)
+        set_tenant_details_to_request_thread(self.tenant)
+
+    def tearDown(self):
+        set_request_tenant_aware(False)
+        set_tenant_details_to_request_thread(None)
+
+    def set_authentication_type(self, authentication_type):
+        tenant_configuration_manager.upsert(
+            data={
+                "tenant_id": self.tenant.tenant_id,
+                "database_strategy": "SHARED",
+                "authentication_type": authentication_type,
+            },
+            query={"tenant_id": self.tenant.tenant_id},
+        )
+        tenant_routing_table.invalidate(self.tenant.tenant_id)
+        tenant_authenticator_table.invalidate(self.tenant.tenant_id)
+
+    def test_authenticators_resolved_once(self):
+        """
+        Test that the authenticators of a tenant are resolved without I/O once known.
+        """
+        authenticators = get_authentication_classes()
+        self.assertIsInstance(authenticators[0], JWTAuthentication)
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_authentication_classes(), authenticators)
+
+    def test_configuration_change_resolves_again(self):
+        """
+        Test that a configuration change is followed by the authenticators.
+        """
+        self.assertIsInstance(get_authentication_classes()[0], JWTAuthentication)
+
+        self.set_authentication_type("TOKEN")
+
+        self.assertIsInstance(get_authentication_classes()[0], TokenAuthentication)
+
+
+class TestIdentityMap(TestCase):
+
+    def setUp(self):
+        set_request_tenant_aware(False)
+        self.tenant = tenant_manager.create(
+            data={"tenant_code": "identity", "tenant_name": "Identity Tenant"}
+        )
+
+        set_request_tenant_aware(True)
+        set_tenant_details_to_request_thread(self.tenant)
+        self.query = {"tenant_id": self.tenant.tenant_id}
+        self.identity_map = start_identity_map()
+
+    def tearDown(self):
+        clear_identity_map()
+        set_request_tenant_aware(False)
+        set_tenant_details_to_request_thread(None)
+
+    def test_repeated_reads_are_served_from_the_map(self):
+        """
+        Test that a read done again in the same request needs no query.
+        """
+        self.assertIsNone(tenant_configuration_manager.get(self.query))
+        self.assertFalse(tenant_configuration_manager.exists(self.query))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(tenant_configuration_manager.get(self.query))
+            self.assertFalse(tenant_configuration_manager.exists(self.query))
+
+        self.assertEqual(self.identity_map.hits, 2)
+
+    def test_write_flushes_the_reads_of_the_model(self):
+        """
+        Test that a write through the manager is followed by the next read.
+        """
+        self.assertIsNone(tenant_configuration_manager.get(self.query))
+
+        tenant_configuration_manager.create(
+            data={
+                "tenant_id": self.tenant.tenant_id,
+                "database_strategy": "SHARED",
+                "authentication_type": "TOKEN",
+            }
+        )
+
+        with self.assertNumQueries(1):
+            conf = tenant_configuration_manager.get(self.query)
+        self.assertEqual(conf.authentication_type, "TOKEN")
+
+    def test_reads_without_map_are_not_cached(self):
+        """
+        Test that outside of a request every read is done again.
+        """
+        clear_identity_map()
+        tenant_configuration_manager.get(self.query)
+
+        with self.assertNumQueries(1):
+            tenant_configuration_manager.get(self.query)
+
+    @override_settings(DEBUG=True)
+    def test_hits_header_in_debug_mode(self):
+        """
+        Test that the number of reads served from the map is sent in debug mode.
+        """
+        response = self.client.get("/api/health")
+
+        self.assertIn("Identity-Map-Hits", response)
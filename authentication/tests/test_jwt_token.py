@@ -0,0 +1,139 @@
+from time import time
+from unittest.mock import patch
+
+import jwt
+from django.test import TestCase, RequestFactory
+
+from utils import settings
+from auth_user.constants import RoleEnum
+from auth_user.db_access import user_manager
+from tenant.utils.helpers import (
+    set_request_tenant_aware,
+    set_tenant_details_to_request_thread,
+)
+
+from authentication.principal import JWTPrincipal
+from authentication.jwt_token import JWTAuthentication
+from authentication.exception import UnauthorizedException
+from authentication.jwt_revocation import JWTRevocations, jwt_revocations
+
+
+class TestJWTAuthentication(TestCase):
+
+    def setUp(self):
+        set_request_tenant_aware(False)
+        set_tenant_details_to_request_thread(None)
+
+        self.user = user_manager.disable_tenant_aware().create(
+            data={
+                "first_name": "Test",
+                "last_name": "User",
+                "phone_number": "9878786565",
+                "email": "test.user@gmail.com",
+                "role_id": RoleEnum.OPERATOR,
+            }
+        )
+
+    def get_token(self, **claims):
+        payload = {
+            "user_id": self.user.user_id,
+            "role_id": self.user.role_id,
+            "tenant_id": None,
+            "iat": time(),
+            "exp": int(time()) + 60,
+            **claims,
+        }
+        payload = {key: value for key, value in payload.items() if value != "-"}
+        return jwt.encode(payload, key=settings.read("SECRET_KEY"), algorithm="HS256")
+
+    @staticmethod
+    def authenticate(token):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return JWTAuthentication().authenticate(request)
+
+    def test_claims_token_needs_no_query(self):
+        """
+        Test that a claims token is authenticated without loading the user.
+        """
+        token = self.get_token()
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(token)
+
+        self.assertIsInstance(user, JWTPrincipal)
+        self.assertEqual(user.role_id, RoleEnum.OPERATOR)
+        self.assertEqual(user.email, "test.user@gmail.com")
+
+    def test_token_without_expiry_rejected(self):
+        """
+        Test that tokens without expiry are not accepted anymore.
+        """
+        with self.assertRaises(UnauthorizedException):
+            self.authenticate(self.get_token(exp="-"))
+
+        with self.assertRaises(UnauthorizedException):
+            self.authenticate(self.get_token(exp=int(time()) - 10))
+
+    def test_token_of_other_tenant_rejected(self):
+        """
+        Test that a token issued for another tenant is rejected.
+        """
+        with self.assertRaises(UnauthorizedException):
+            self.authenticate(self.get_token(tenant_id="other-tenant"))
+
+    def test_revoked_token_rejected(self):
+        """
+        Test that the tokens issued before a revocation are rejected.
+        """
+        token = self.get_token()
+        self.authenticate(token)
+
+        jwt_revocations.revoke(self.user.user_id)
+
+        with self.assertRaises(UnauthorizedException):
+            self.authenticate(token)
+
+        user, _ = self.authenticate(self.get_token())
+        self.assertEqual(user.user_id, self.user.user_id)
+
+    def test_revocation_after_prune_rejects_new_tokens(self):
+        """
+        Test that a revocation after the previous one was pruned still rejects the
+        tokens issued between the two.
+        """
+        revocations = JWTRevocations(ttl=60, interval=0)
+        user_id = self.user.user_id
+
+        with patch("authentication.jwt_revocation.time", return_value=1000.0):
+            revocations.revoke(user_id)
+        issued_at = 1000.5
+
+        with patch("authentication.jwt_revocation.time", return_value=1060.2):
+            revocations.refresh(force=True)
+            self.assertFalse(revocations.is_revoked(user_id, issued_at))
+
+            revocations.revoke(user_id)
+            self.assertTrue(revocations.is_revoked(user_id, issued_at))
+
+    def test_role_change_and_delete_revoke_tokens(self):
+        """
+        Test that the tokens of a user are rejected once its role is changed or it
+        is deleted, the claims would keep the old role.
+        """
+        users = user_manager.disable_tenant_aware()
+        token = self.get_token()
+        self.authenticate(token)
+
+        users.update(
+            data={"role_id": RoleEnum.COMPANY_ADMIN},
+            query={"user_id": self.user.user_id},
+        )
+        with self.assertRaises(UnauthorizedException):
+            self.authenticate(token)
+
+        token = self.get_token(role_id=RoleEnum.COMPANY_ADMIN)
+        self.authenticate(token)
+
+        users.delete(query={"user_id": self.user.user_id})
+        with self.assertRaises(UnauthorizedException):
+            self.authenticate(token)
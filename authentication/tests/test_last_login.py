@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.test import TestCase
+
+from utils.functions import get_current_datetime
+from auth_user.constants import RoleEnum
+from auth_user.db_access import user_manager
+
+from authentication.last_login import LastLoginRecorder
+
+
+class TestLastLoginRecorder(TestCase):
+
+    def setUp(self):
+        self.users = [
+            user_manager.disable_tenant_aware().create(
+                data={
+                    "first_name": "Test",
+                    "last_name": f"User {i}",
+                    "phone_number": f"98787865{i:02d}",
+                    "email": f"test.user.{i}@gmail.com",
+                    "role_id": RoleEnum.OPERATOR,
+                }
+            )
+            for i in range(3)
+        ]
+
+    def test_fresh_last_login_is_not_written(self):
+        """
+        Test that a user seen within the threshold does not produce a write.
+        """
+        recorder = LastLoginRecorder(sync=True)
+        user = self.users[0]
+        user.last_login = get_current_datetime() - timedelta(seconds=10)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(recorder.record(user, using="default"))
+
+    def test_stale_last_login_is_written_once(self):
+        """
+        Test that an old last_login is updated once, later requests are coalesced.
+        """
+        recorder = LastLoginRecorder(sync=True)
+        user = self.users[0]
+
+        with self.assertNumQueries(1):
+            self.assertTrue(recorder.record(user, using="default"))
+            self.assertFalse(recorder.record(user, using="default"))
+
+        user.refresh_from_db()
+        self.assertIsNotNone(user.last_login)
+
+    def test_pending_last_logins_flushed_in_one_update(self):
+        """
+        Test that the last_login of several users is written with one UPDATE.
+        """
+        recorder = LastLoginRecorder(sync=False, flush_interval=3600)
+
+        with self.assertNumQueries(0):
+            for user in self.users:
+                recorder.record(user, using="default")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(recorder.flush(), 3)
+
+        for user in self.users:
+            recorded = user.last_login
+            user.refresh_from_db()
+            self.assertEqual(user.last_login, recorded)
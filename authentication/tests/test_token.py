@@ -0,0 +1,95 @@
+from django.test import TestCase, RequestFactory
+
+from auth_user.constants import RoleEnum
+from tenant.utils.helpers import (
+    set_request_tenant_aware,
+    set_tenant_details_to_request_thread,
+)
+from auth_user.db_access import user_manager, token_manager
+
+from authentication.token import TokenAuthentication
+from authentication.token_cache import token_cache
+from authentication.exception import UnauthorizedException
+
+
+class TestTokenAuthentication(TestCase):
+
+    def setUp(self):
+        set_request_tenant_aware(False)
+        set_tenant_details_to_request_thread(None)
+
+        self.user = user_manager.disable_tenant_aware().create(
+            data={
+                "first_name": "Test",
+                "last_name": "User",
+                "phone_number": "9878786565",
+                "email": "test.user@gmail.com",
+                "role_id": RoleEnum.OPERATOR,
+            }
+        )
+        self.token = token_manager.create(data={"user": self.user, "token": "TOKEN"})
+
+    @staticmethod
+    def authenticate(token="TOKEN"):
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return TokenAuthentication().authenticate(request)
+
+    def test_cached_token_needs_no_query(self):
+        """
+        Test that a known token is authenticated without any query.
+        """
+        token_cache.evict(self.token.token)
+
+        user, _ = self.authenticate()
+        self.assertEqual(user.user_id, self.user.user_id)
+
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+
+        self.assertEqual(user.user_id, self.user.user_id)
+        self.assertEqual(token.token, "TOKEN")
+
+    def test_uncached_token_reads_its_user_in_the_same_query(self):
+        """
+        Test that a token missing from the cache is read together with its user.
+        """
+        self.authenticate()
+        token_cache.evict(self.token.token)
+
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate()
+
+        self.assertEqual(user.user_id, self.user.user_id)
+
+    def test_cache_key_is_hashed(self):
+        """
+        Test that the token itself is not part of the cache key.
+        """
+        self.assertNotIn("TOKEN", token_cache.get_key("TOKEN"))
+
+    def test_evicted_token_is_rejected(self):
+        """
+        Test that a deleted token is evicted and not authenticated anymore.
+        """
+        self.authenticate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            token_cache.delete_user_tokens(self.user)
+
+        with self.assertRaises(UnauthorizedException):
+            self.authenticate()
+
+    def test_user_write_drops_cached_user(self):
+        """
+        Test that a role changed through the user manager is seen by the next
+        authentication of a cached token.
+        """
+        self.authenticate()
+
+        user_manager.disable_tenant_aware().update(
+            data={"role_id": RoleEnum.COMPANY_ADMIN},
+            query={"user_id": self.user.user_id},
+        )
+
+        user, _ = self.authenticate()
+        self.assertEqual(user.role_id, RoleEnum.COMPANY_ADMIN)
@@ -5,11 +5,15 @@ This module provides a class that implements token-based authentication for API
 
 from rest_framework.authentication import BaseAuthentication
 
-from utils.functions import get_current_datetime
+from utils.timing import timed
+from utils.constants import AUTH_TIMING_PHASE
 
+from auth_user.models import Token
 from auth_user.db_access import token_manager
 
 from authentication.exception import UnauthorizedException
+from authentication.token_cache import token_cache
+from authentication.last_login import last_login_recorder
 
 
 class TokenAuthentication(BaseAuthentication):
@@ -20,11 +24,13 @@ class TokenAuthentication(BaseAuthentication):
 
     keyword = "Bearer"
 
+    @timed(AUTH_TIMING_PHASE)
     def authenticate(self, request):
         """
         Authenticate the user based on the token provided in the request headers.
         If the token is valid, return the user and token objects.
         If the token is invalid or missing, raise an UnauthorizedException.
+        Known tokens are resolved from the token cache without any query.
         """
 
         auth_token = request.headers.get("Authorization") or ""
@@ -40,13 +46,20 @@ class TokenAuthentication(BaseAuthentication):
         if not auth_token_arr[0] == self.keyword:
             raise UnauthorizedException()
 
-        token = token_manager.get({"token": auth_token_arr[1]})
-        if not token:
-            raise UnauthorizedException()
+        entry = token_cache.get(auth_token_arr[1])
+        user = token_cache.get_user(entry) if entry else None
+
+        if user:
+            token = Token(token=auth_token_arr[1], user=user)
+        else:
+            token = token_manager.get({"token": auth_token_arr[1]})
+            if not token:
+                raise UnauthorizedException()
+
+            user = token.user
+            token_cache.set(token.token, user)
 
-        user = token.user
-        user.last_login = get_current_datetime()
-        user.save()
+        last_login_recorder.record(user, using=token_manager.using)
 
         return user, token
 
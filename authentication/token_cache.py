@@ -0,0 +1,119 @@
+"""
+Cache of the token lookups done by the token authentication.
+"""
+
+import hashlib
+from time import time
+
+from django.db import transaction
+
+from auth_user.db_access import token_manager, user_manager
+
+from tenant.utils.helpers import get_tenant_details_from_request_thread
+
+from authentication.constants import TOKEN_CACHE_TTL, TOKEN_CACHE_SLIDING
+
+
+class TokenCache:
+    """
+    Maps a token to its user_id and tenant_id, keyed by the SHA-256 of the token so
+    the cache never holds a usable token. The user itself (with its role) is read
+    from the user cache, dropped on every user write, so an authenticated request
+    needs no query.
+
+    Entries are written at login and evicted once the tokens are deleted, at
+    logout and at the next login of the user. With `sliding` an entry used in the
+    second half of its TTL is stored again for a full TTL.
+    """
+
+    def __init__(self, ttl: int = TOKEN_CACHE_TTL, sliding: bool = TOKEN_CACHE_SLIDING):
+        self.ttl = ttl
+        self.sliding = sliding
+        self.cache = token_manager.cache
+
+    @staticmethod
+    def get_key(token: str) -> str:
+        """
+        Returns the cache key of the token.
+        """
+
+        return f"token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    def set(self, token: str, user):
+        """
+        Caches the token of the user and the user itself.
+        """
+
+        user_manager.set_cached(user)
+        entry = {
+            "user_id": user.user_id,
+            "tenant_id": user.tenant_id,
+            "expires_at": time() + self.ttl,
+        }
+        return self.cache.set(self.get_key(token), entry, self.ttl)
+
+    def get(self, token: str) -> dict | None:
+        """
+        Returns the cached entry of the token or None.
+        """
+
+        key = self.get_key(token)
+        entry = self.cache.get(key)
+        if not entry:
+            return None
+
+        tenant_id = get_tenant_details_from_request_thread(raise_err=False)["tenant_id"]
+        if entry["tenant_id"] != tenant_id:
+            return None
+
+        if self.sliding and entry["expires_at"] - time() < self.ttl / 2:
+            entry["expires_at"] = time() + self.ttl
+            self.cache.set(key, entry, self.ttl)
+
+        return entry
+
+    def get_user(self, entry: dict):
+        """
+        Returns the user of a cached entry, from the user cache when possible.
+        """
+
+        user = user_manager.get_cached(entry["user_id"])
+        if user:
+            return user
+
+        user = user_manager.get({"user_id": entry["user_id"]})
+        if user:
+            user_manager.set_cached(user)
+        return user
+
+    def evict(self, token: str):
+        """
+        Drops the cached entry of the token.
+        """
+
+        return self.cache.delete(self.get_key(token))
+
+    def evict_tokens(self, tokens: list[str]):
+        """
+        Drops the cached entries of the tokens.
+        """
+
+        for token in tokens:
+            self.evict(token)
+        return True
+
+    def delete_user_tokens(self, user, using=None):
+        """
+        Deletes all the tokens of the user and evicts them once the deletion is
+        committed, so a request authenticated meanwhile can not cache them again.
+        """
+
+        using = using or token_manager.using
+        tokens = token_manager.get_user_tokens(user, using=using)
+        deleted = token_manager.delete({"user": user}, soft_delete=False, using=using)
+
+        transaction.on_commit(lambda: self.evict_tokens(tokens), using=using)
+        return deleted
+
+
+token_cache = TokenCache()
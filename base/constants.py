@@ -1,3 +1,5 @@
+from django.db.models import TextChoices
+
 DEFAULT_PAGE_SIZE: int = 10
 
 DEFAULT_PAGE_NUMBER: int = 1
@@ -12,3 +14,33 @@ PUT = "put"
 PATCH = "patch"
 
 DELETE = "delete"
+
+
+# Seconds a cached pagination count is kept
+COUNT_CACHE_TIMEOUT: int = 300
+
+
+class CountModeEnum(TextChoices):
+    """
+    How the total count of a paginated list is computed.
+    """
+
+    EXACT = "exact", "Exact"
+    ESTIMATE = "estimate", "Estimate"
+    NONE = "none", "None"
+
+
+# Rows fetched per database round trip by the streaming export of a list
+EXPORT_CHUNK_SIZE: int = 2000
+
+# Model fields never written by the streaming export of a list
+EXPORT_EXCLUDED_FIELDS = ("password", "is_deleted", "deleted_dtm", "tenant_id")
+
+
+class ExportFormatEnum(TextChoices):
+    """
+    Format of the streaming export of a list (?format=).
+    """
+
+    CSV = "csv", "CSV"
+    NDJSON = "ndjson", "NDJSON"
@@ -0,0 +1,106 @@
+"""
+Counts of the manager querysets for the pagination: the exact count cached per
+normalized query and the planner row estimate.
+"""
+
+import json
+import hashlib
+
+from django.db import connections
+from django.db.models import Model
+from django.db.models.query import QuerySet
+
+from utils.cache import CacheInterface
+from utils.functions import get_uuid
+
+from base.constants import CountModeEnum, COUNT_CACHE_TIMEOUT
+
+
+def estimate_count(objects: QuerySet) -> int | None:
+    """
+    Returns the planner row estimate of the queryset without scanning the table.
+    Returns None if the database backend does not provide one.
+    """
+
+    connection = connections[objects.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = objects.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CountCache:
+    """
+    Caches the counts of the querysets of a model, keyed by the normalized SQL and
+    the count version of the model. The manager bumps the version on every write
+    (see `invalidate`), so the cached counts of the model are not used anymore.
+    """
+
+    def __init__(self, model: type[Model], cache: CacheInterface):
+        self.model = model
+        self.cache = cache
+
+    @property
+    def version_key(self) -> str:
+        """
+        Cache key holding the current count version of the model.
+        """
+        return f"count_version:{self.model._meta.label_lower}"
+
+    def get_key(self, objects: QuerySet) -> str:
+        """
+        Builds the count cache key from the model, its current count version
+        and the hash of the normalized (unordered) SQL of the queryset.
+        The cache itself prefixes the key with the tenant.
+        """
+
+        version = self.cache.get(self.version_key)
+        if version is None:
+            version = get_uuid()
+            self.cache.set(self.version_key, version, None)
+
+        query_hash = hashlib.sha256(
+            f"{objects.db}:{objects.order_by().query}".encode()
+        ).hexdigest()
+
+        return f"count:{self.model._meta.label_lower}:{version}:{query_hash}"
+
+    def count(self, objects: QuerySet, count_mode=CountModeEnum.EXACT) -> int | None:
+        """
+        Returns the total count of the queryset for pagination based on the count mode.
+        - exact: The count is served from the cache, COUNT runs on a miss.
+        - estimate: The planner row estimate is used where the backend provides one
+            (PostgreSQL), otherwise it falls back to exact.
+        - none: The count is skipped and None is returned.
+        """
+
+        if count_mode == CountModeEnum.NONE:
+            return None
+
+        if count_mode == CountModeEnum.ESTIMATE:
+            estimate = estimate_count(objects)
+            if estimate is not None:
+                return estimate
+
+        key = self.get_key(objects)
+
+        count = self.cache.get(key)
+        if count is None:
+            count = objects.count()
+            self.cache.set(key, count, COUNT_CACHE_TIMEOUT)
+
+        return count
+
+    def invalidate(self):
+        """
+        Bumps the count version of the model, the counts cached so far are not used.
+        """
+        return self.cache.set(self.version_key, get_uuid(), None)
@@ -0,0 +1,38 @@
+"""
+Field helpers of the manager, computed once per model or field set.
+"""
+
+from functools import lru_cache
+from typing import Dict
+
+from django.db.models import Model
+
+
+@lru_cache(maxsize=None)
+def get_updatable_field_names(model: type[Model]) -> Dict[str, str]:
+    """
+    Returns a mapping of the field name and attname to the field name of every
+    concrete non primary key field of the model. Used to build `update_fields`.
+    """
+
+    field_names = {}
+    for field in model._meta.concrete_fields:
+        if field.primary_key:
+            continue
+        field_names[field.name] = field.name
+        field_names[field.attname] = field.name
+
+    return field_names
+
+
+@lru_cache(maxsize=None)
+def get_row_function(fields: tuple):
+    """
+    Returns the function mapping a `values_list` row of the fields to a dict, built
+    once per field set (a model's `dict_fields`).
+    """
+
+    def row_to_dict(row):
+        return dict(zip(fields, row))
+
+    return row_to_dict
@@ -0,0 +1,106 @@
+"""
+Request scoped identity map deduplicating the repeated reads of a request.
+"""
+
+import json
+
+from django.db.models import Model
+
+from utils.thread_local_var import get_thread_local_var
+
+_thread_locals = get_thread_local_var()
+
+
+class _NotNormalizable(Exception):
+    pass
+
+
+def _normalize_value(value):
+    """
+    Returns the JSON value of a query value json can not write. Model instances
+    are replaced by their primary key, sets are sorted and dates, UUIDs and
+    decimals are written as strings. Any other value (e.g. a QuerySet) makes the
+    read not cached rather than evaluated.
+    """
+
+    if isinstance(value, Model):
+        return [value._meta.label_lower, value.pk]
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if type(value).__module__ in ("datetime", "uuid", "decimal"):
+        return str(value)
+    raise _NotNormalizable()
+
+
+class IdentityMap:
+    """
+    Keeps the results of the reads done through the managers during one request,
+    keyed by model and normalized query, so reading the same row again (the
+    tenant configuration, the user, a permission) needs no query.
+
+    The entries of a model are flushed on every write done through its manager.
+    Rows written another way during the request are served stale.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+
+    @staticmethod
+    def get_key(model: type[Model], lookup: str, query: dict, **params):
+        """
+        Returns the key of the read, or None when the query can not be normalized
+        and the read must not be cached.
+        """
+
+        try:
+            normalized = json.dumps(
+                [query or {}, params], sort_keys=True, default=_normalize_value
+            )
+        except (_NotNormalizable, TypeError):
+            return None
+
+        return model._meta.label_lower, lookup, normalized
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+
+        self.hits += 1
+        return self.entries[key]
+
+    def set(self, key, value):
+        self.entries[key] = value
+        return value
+
+    def flush(self, model: type[Model]):
+        """
+        Drops all the entries of the model.
+        """
+
+        label = model._meta.label_lower
+        self.entries = {
+            key: value for key, value in self.entries.items() if key[0] != label
+        }
+
+
+def start_identity_map() -> IdentityMap:
+    """
+    Installs a new identity map for the request of the current thread.
+    """
+
+    _thread_locals.identity_map = IdentityMap()
+    return _thread_locals.identity_map
+
+
+def get_identity_map() -> IdentityMap | None:
+    """
+    Returns the identity map of the current request, None outside of a request.
+    """
+
+    return getattr(_thread_locals, "identity_map", None)
+
+
+def clear_identity_map():
+    _thread_locals.identity_map = None
+    return True
@@ -5,14 +5,22 @@ This is the model BaseManager class which is used to perform CRUD operations on
 from typing import Union, TypeVar, Generic, List, Dict
 
 from rest_framework import status
+from django.db import connections
 from django.db.models.query import QuerySet
 from django.db.models import Q, F, Model, Sum
 
 from utils.cache import cache
+from utils.functions import get_current_datetime
 from utils.messages import error
-from utils.pagination import Pagination
+from utils.pagination import Pagination, CursorPagination
 from utils.exceptions.exceptions import CommonError
 
+from base.constants import CountModeEnum
+from base.db_access.count import CountCache
+from base.db_access.fields import get_updatable_field_names, get_row_function
+from base.db_access.identity_map import get_identity_map
+from base.db_access.upsert import has_unique_constraint, dedupe_rows, upsert_batch
+
 from tenant.utils.helpers import (
     is_request_tenant_aware,
     get_tenant_details_from_request_thread,
@@ -20,18 +28,22 @@ from tenant.utils.helpers import (
 
 T = TypeVar("T", bound=Model)
 
+_MISSING = object()
+
 
 class QueryBuilder:
     """
     Recursively converts a dictionary into a Django Q object for complex query filtering.
 
-    This function dynamically constructs Django ORM queries using AND (&), OR (|), and NOT (~) conditions.
+    This function dynamically constructs Django ORM queries using AND (&), OR (|), and
+    NOT (~) conditions.
 
     Supported Features:
     - **Basic Key-Value Queries:** `{"first_name": "John"}`
     - **AND Condition:** `{"AND": [{"first_name": "John"}, {"age": 30}]}`
     - **OR Condition:** `{"OR": [{"last_name": "Doe"}, {"city": "New York"}]}`
-    - **Nested Conditions:** `{"AND": [{"first_name": "Alice"}, {"OR": [{"age__gte": 25}, {"city": "Boston"}]}]}`
+    - **Nested Conditions:**
+      `{"AND": [{"first_name": "Alice"}, {"OR": [{"age__gte": 25}, {"city": "Boston"}]}]}`
     - **NOT Conditions:** `{"NOT": {"last_name": "Smith"}}` → `~Q(last_name="Smith")`
     - **Direct Django ORM Lookups:** You can pass field lookups directly, e.g., `{"age__gte": 18}`.
 
@@ -125,7 +137,8 @@ class Manager(Generic[T]):
     operations on Django models. It includes methods for querying, creating, updating, and deleting
     model instances with support for both single and bulk operations.
     Attributes:
-        model (Model): The Django model class that this manager operates on. Must be set by subclasses.
+        model (Model): The Django model class that this manager operates on. Must be set
+            by subclasses.
     Methods:
         get: Retrieve a single object based on query parameters.
         list: Retrieve multiple objects based on query parameters.
@@ -152,6 +165,14 @@ class Manager(Generic[T]):
     check_is_deleted: bool = True
     query_builder = QueryBuilder()
 
+    # Relations joined (select_related) and prefetched (prefetch_related) by default
+    # on every read, can be overridden per call with `related` and `prefetch`.
+    related: List[str] = []
+    prefetch: List[str] = []
+
+    # Serve the repeated get/exists of a request from the request identity map
+    use_identity_map: bool = False
+
     cache = cache
 
     @property
@@ -190,6 +211,7 @@ class Manager(Generic[T]):
         return get_tenant_db_name(tenant_obj)
 
     def __init__(self, tenant_aware=True):
+        self.count_cache = CountCache(self.model, self.cache)
         if not tenant_aware:
             self.__tenant_aware = tenant_aware
 
@@ -201,13 +223,19 @@ class Manager(Generic[T]):
 
         return self.__class__(tenant_aware=False)
 
-    def _parse_query(self, query, is_deleted=False, using=None) -> QuerySet[T]:
+    def _parse_query(
+        self, query, is_deleted=False, using=None, related=None, prefetch=None
+    ) -> QuerySet[T]:
         """
         Parse and process query parameters for database filtering.
         This method handles query parsing and filtering for database operations.
         Args:
             query (dict): The main query filter. Can be either a dictionary of field lookups.
             is_deleted (bool, default=False): Filter flag for soft-deleted records.
+            related (list, optional): Relations to join, defaults to the manager's
+                `related`. Pass an empty list to join none.
+            prefetch (list, optional): Relations to prefetch, defaults to the
+                manager's `prefetch`. Pass an empty list to prefetch none.
         Returns:
             QuerySet: The filtered queryset after applying all query conditions.
         Example:
@@ -229,6 +257,14 @@ class Manager(Generic[T]):
             self.query_builder.build_query(query)
         )
 
+        related = self.related if related is None else related
+        if related:
+            objects = objects.select_related(*related)
+
+        prefetch = self.prefetch if prefetch is None else prefetch
+        if prefetch:
+            objects = objects.prefetch_related(*prefetch)
+
         return objects
 
     @property
@@ -248,16 +284,69 @@ class Manager(Generic[T]):
 
         return self.__tenant_aware
 
-    def get(self, query, using=None) -> T | None:
+    @property
+    def is_tenant_aware(self) -> bool:
+        """
+        Check if the writes of the manager are scoped to the tenant of the request.
+        """
+        return self.__is_tenant_aware
+
+    def _identity_key(self, lookup, query, using=None, **params):
+        """
+        Returns the identity map of the request and the key of the read, or
+        (None, None) when the read is not served from an identity map.
+        """
+
+        identity_map = get_identity_map() if self.use_identity_map else None
+        if identity_map is None:
+            return None, None
+
+        tenant_id = None
+        if self.__is_tenant_aware:
+            tenant_id = get_tenant_details_from_request_thread()["tenant_id"]
+
+        key = identity_map.get_key(
+            self.model,
+            lookup,
+            query,
+            using=using or self.using,
+            tenant_id=tenant_id,
+            check_is_deleted=self.check_is_deleted,
+            **params,
+        )
+        return (identity_map, key) if key else (None, None)
+
+    def get(self, query, using=None, related=None, prefetch=None) -> T | None:
         """
         Get the object based on the query.
+        With `use_identity_map` the same read is done once per request.
         Args:
-            query (dict): The main query dictionary for filtering objects. If None, an empty dict is used.
+            query (dict): The main query dictionary for filtering objects. If None, an
+                empty dict is used.
+            related (list, optional): Overrides the manager's `related`.
+            prefetch (list, optional): Overrides the manager's `prefetch`.
         Returns:
-            object: The first object that matches the query criteria. Returns None if no match is found.
+            object: The first object that matches the query criteria. Returns None if no
+                match is found.
 
         """
-        return self._parse_query(query=query, using=using).first()
+
+        identity_map, key = self._identity_key(
+            "get", query, using, related=related, prefetch=prefetch
+        )
+        if identity_map:
+            obj = identity_map.get(key, _MISSING)
+            if obj is not _MISSING:
+                return obj
+
+        # _parse_query adds the tenant to the query, keep the caller's key stable
+        obj = self._parse_query(
+            query=dict(query or {}), using=using, related=related, prefetch=prefetch
+        ).first()
+
+        if identity_map:
+            identity_map.set(key, obj)
+        return obj
 
     def get_objects_mapping(
         self,
@@ -266,32 +355,57 @@ class Manager(Generic[T]):
         order_by: List = None,
         mapping_by: str = "pk",
         using=None,
+        related: List = None,
+        prefetch: List = None,
     ) -> Dict[str, T]:
         """
         Retrieves objects from the database based on the provided query and returns a
         dictionary mapping a specified attribute to each object.
         """
 
-        objects = self.list(query=query, only=only, order_by=order_by, using=using)
+        objects = self.list(
+            query=query,
+            only=only,
+            order_by=order_by,
+            using=using,
+            related=related,
+            prefetch=prefetch,
+        )
 
         return {getattr(obj, mapping_by): obj for obj in objects}
 
     def list(
-        self, query, only: list = None, order_by: list = None, using=None
+        self,
+        query,
+        only: list = None,
+        order_by: list = None,
+        using=None,
+        related: list = None,
+        prefetch: list = None,
     ) -> QuerySet[T]:
         """
         Returns a list of objects based on the provided query parameters.
         Args:
-            query (dict, optional): Primary query dictionary for filtering objects. Defaults to None.
+            query (dict, optional): Primary query dictionary for filtering objects.
+                Defaults to None.
             only (list, optional): List of fields to include in the result. Defaults to None.
+                The manager's `related` is not joined when only is given, the relations
+                to join must then be passed with `related` (and their fields in only).
             order_by (list, optional): List of fields to order the result by. Defaults to None.
+            related (list, optional): Overrides the manager's `related`.
+            prefetch (list, optional): Overrides the manager's `prefetch`.
         Returns:
             list: A list of objects that match the query criteria after parsing.
         Example:
             model_mgr.list({'status': 'active'})
         """
 
-        objects = self._parse_query(query=query, using=using)
+        if only and related is None:
+            related = []
+
+        objects = self._parse_query(
+            query=query, using=using, related=related, prefetch=prefetch
+        )
 
         if only:
             objects = objects.only(*only)
@@ -301,11 +415,39 @@ class Manager(Generic[T]):
 
         return objects
 
+    def to_values(self, objects: QuerySet[T], fields: tuple = None) -> List[dict]:
+        """
+        Reads the rows of a queryset as dicts of the fields (the model's
+        `dict_fields` by default) without building the model instances.
+        """
+
+        fields = tuple(fields or self.model.dict_fields)
+        row_to_dict = get_row_function(fields)
+        return [
+            row_to_dict(row)
+            for row in objects.prefetch_related(None).values_list(*fields)
+        ]
+
+    def list_values(
+        self, query, order_by: list = None, fields: tuple = None, using=None
+    ) -> List[dict]:
+        """
+        Returns the objects matching the query as dicts of the fields, the same
+        dicts as `to_dict` when the fields are the model's `dict_fields`.
+        Example:
+            model_mgr.list_values({'status': 'active'})
+        """
+
+        return self.to_values(
+            self.list(query=query, order_by=order_by, using=using), fields=fields
+        )
+
     def count(self, query: dict, using=None) -> int:
         """
         Count the number of objects based on the provided query.
         Args:
-            query (dict, optional): The main query dictionary for filtering objects. If None, an empty dict is used.
+            query (dict, optional): The main query dictionary for filtering objects. If
+                None, an empty dict is used.
         Returns:
             int: The count of objects that match the query criteria.
         Example:
@@ -316,14 +458,27 @@ class Manager(Generic[T]):
     def exists(self, query: dict, using=None) -> bool:
         """
         Check if any objects exist based on the provided query.
+        With `use_identity_map` the same check is done once per request.
         Args:
-            query (dict, optional): The main query dictionary for filtering objects. If None, an empty dict is used.
+            query (dict, optional): The main query dictionary for filtering objects. If
+                None, an empty dict is used.
         Returns:
             bool: True if any objects match the query criteria, False otherwise.
         Example:
             model_mgr.exists({'status': 'active'})
         """
-        return self._parse_query(query=query, using=using).exists()
+
+        identity_map, key = self._identity_key("exists", query, using)
+        if identity_map:
+            exists = identity_map.get(key, _MISSING)
+            if exists is not _MISSING:
+                return exists
+
+        exists = self._parse_query(query=dict(query or {}), using=using).exists()
+
+        if identity_map:
+            identity_map.set(key, exists)
+        return exists
 
     def list_with_pagination(
         self,
@@ -332,33 +487,87 @@ class Manager(Generic[T]):
         order_by: list = None,
         pagination: dict = None,
         using=None,
+        values: bool = False,
     ) -> tuple[QuerySet[T], dict[str, int]]:
         """
         List objects with pagination based on the provided query.
         Args:
-            query (dict): The main query dictionary for filtering objects. If None, an empty dict is used.
+            query (dict): The main query dictionary for filtering objects. If None, an
+                empty dict is used.
             only (list, optional): List of fields to include in the result. Defaults to None.
             order_by (list, optional): List of fields to order the result by. Defaults to None.
-            pagination (dict, optional): Pagination parameters including 'page' and 'page_size'.
-                Defaults to None, which means no pagination is applied.
+            pagination (dict, optional): Pagination parameters including 'page', 'page_size'
+                and 'count_mode'. Defaults to None, which means no pagination is applied.
+            values (bool, optional): Return the page as dicts of the model's
+                `dict_fields` (see `to_values`) instead of model instances.
         """
         objects = self.list(query=query, only=only, order_by=order_by, using=using)
 
         page_number: int = pagination["page"]
         page_size = pagination.get("page_size", None)
+        count_mode = pagination.get("count_mode", CountModeEnum.EXACT)
 
         pagination_obj = Pagination(
             page_size=page_size,
-            count=objects.count(),
+            count=self.count_cache.count(objects, count_mode=count_mode),
             current_page=page_number,
         )
-        return pagination_obj.get_current_page_objs(objects), {
+        page_objs = pagination_obj.get_current_page_objs(objects)
+        if values and isinstance(page_objs, QuerySet):
+            page_objs = self.to_values(page_objs)
+
+        return page_objs, {
             "count": pagination_obj.count,
             "page_size": pagination_obj.page_size,
             "current_page": pagination_obj.current_page,
             "total_pages": pagination_obj.get_total_page_count(),
         }
 
+    def on_write(self):
+        """
+        Hook executed after every write done through the manager.
+        Bumps the count version so the cached counts of the model are not used anymore,
+        and drops the reads of the model from the request identity map.
+        """
+        self.count_cache.invalidate()
+
+        identity_map = get_identity_map()
+        if identity_map:
+            identity_map.flush(self.model)
+
+    def list_with_cursor_pagination(
+        self,
+        query: dict,
+        only: list = None,
+        pagination: dict = None,
+        using=None,
+    ) -> tuple[List[T], dict[str, int | str | None]]:
+        """
+        List objects with keyset (cursor) pagination based on the provided query.
+        The objects are ordered on (created_dtm, pk) and the page is fetched by seeking
+        past the cursor, so no COUNT query is executed and deep pages are as cheap as the first.
+        Args:
+            query (dict): The main query dictionary for filtering objects. If None, an
+                empty dict is used.
+            only (list, optional): List of fields to include in the result. Defaults to None.
+            pagination (dict, optional): Pagination parameters including 'cursor' and 'page_size'.
+        """
+
+        if only:
+            only = [*only, CursorPagination.ordering_field, self.model._meta.pk.name]
+
+        objects = self.list(query=query, only=only, using=using)
+
+        pagination_obj = CursorPagination(
+            page_size=pagination["page_size"],
+            cursor=pagination.get("cursor"),
+        )
+        return pagination_obj.get_current_page_objs(objects), {
+            "page_size": pagination_obj.page_size,
+            "next_cursor": pagination_obj.next_cursor,
+            "prev_cursor": pagination_obj.prev_cursor,
+        }
+
     def delete(
         self, query=None, data=None, soft_delete=True, force_delete=False, using=None
     ):
@@ -367,14 +576,18 @@ class Manager(Generic[T]):
         This method supports both soft deletion (marking records as deleted) and hard deletion
         (removing records from the database).
         Args:
-            query (Q, optional): Django Q object containing the query conditions. Required unless force_delete is True.
+            query (Q, optional): Django Q object containing the query conditions.
+                Required unless force_delete is True.
             data (dict, optional): Additional data to update when performing soft delete.
-            soft_delete (bool, optional): If True, marks records as deleted instead of removing them. Defaults to True.
-            force_delete (bool, optional): If True, allows deletion without query parameter. Defaults to False.
+            soft_delete (bool, optional): If True, marks records as deleted instead of
+                removing them. Defaults to True.
+            force_delete (bool, optional): If True, allows deletion without query
+                parameter. Defaults to False.
         Raises:
             CommonError: If no query is provided and force_delete is False.
         Returns:
-            None
+            int: The number of deleted rows. A single conditional UPDATE/DELETE is executed,
+            so the caller can use it to detect a missing record without a prior SELECT.
         Note:
             - For soft delete, the method updates the 'is_deleted' field to True
             - For hard delete, the method permanently removes the records from database
@@ -392,9 +605,13 @@ class Manager(Generic[T]):
             if soft_delete:
                 data = data or dict()
                 data["is_deleted"] = True
-                return objects.update(**data)
+                rows = objects.update(**data)
+                self.on_write()
+                return rows
 
-        return objects.delete()
+        rows, _ = objects.delete()
+        self.on_write()
+        return rows
 
     def create(self, data, many=False, using=None) -> Union[T, QuerySet[T]]:
         """
@@ -436,18 +653,24 @@ class Manager(Generic[T]):
             for item in data:
                 # pylint: disable=not-callable
                 data_list.append(self.model(**add_tenant_info(item)))
-            return self.model.objects.using(using or self.using).bulk_create(data_list)
+            objs = self.model.objects.using(using or self.using).bulk_create(data_list)
+            self.on_write()
+            return objs
 
-        return self.model.objects.using(using or self.using).create(
+        obj = self.model.objects.using(using or self.using).create(
             **add_tenant_info(data)
         )
+        self.on_write()
+        return obj
 
-    def update(self, data, query, using=None) -> T | None:
+    def update(self, data, query, using=None, obj: T = None) -> T | None:
         """
         Update an existing object in the database based on the provided data and query.
         Args:
             data (dict): Dictionary containing the fields and values to update.
             query (dict): Query parameters to find the object to update.
+            obj (Model, optional): The already loaded object matching the query.
+                If provided, the object is not fetched again.
         Returns:
             object: Updated object if successful, None if object not found.
         Example:
@@ -455,7 +678,9 @@ class Manager(Generic[T]):
             <Updated object with id=1>
         """
 
-        obj = self.get(query, using=using)
+        if obj is None:
+            obj = self.get(query, using=using)
+
         if not obj:
             return None
 
@@ -464,6 +689,7 @@ class Manager(Generic[T]):
     def __update(self, obj, data: dict):
         """
         Updates an object's attributes with the provided data dictionary and saves it.
+        Only the columns of the provided keys (and updated_dtm) are written.
         Args:
             obj: The object to be updated
             data (dict): Dictionary containing attribute names as keys and new values to set
@@ -476,9 +702,29 @@ class Manager(Generic[T]):
         """
 
         data = data or dict()
+        field_names = get_updatable_field_names(type(obj))
+
+        pk = obj.pk
+        update_fields = set()
         for key, value in data.items():
             setattr(obj, key, value)
-        obj.save()
+            if key in field_names:
+                update_fields.add(field_names[key])
+
+        if obj.pk != pk:
+            # A changed primary key is saved as a new row, so all the columns are written.
+            obj.save()
+            self.on_write()
+            return obj
+
+        if not update_fields:
+            return obj
+
+        if "updated_dtm" in field_names:
+            update_fields.add("updated_dtm")
+
+        obj.save(update_fields=update_fields)
+        self.on_write()
         return obj
 
     def upsert(self, data, query, using=None) -> T:
@@ -501,6 +747,115 @@ class Manager(Generic[T]):
             return self.create(data, using=using)
         return self.__update(obj, data)
 
+    def bulk_update(self, objs: List[T], fields: List[str], batch_size=None, using=None):
+        """
+        Update the given fields of the given objects in batches of single UPDATE queries.
+        The update is restricted to the rows of the current tenant, the same way as update().
+        Args:
+            objs (list): The objects (with primary key) holding the new values.
+            fields (list): The field names to be updated.
+            batch_size (int, optional): Number of objects updated per query.
+        Returns:
+            int: The number of updated rows.
+        Example:
+            >>> manager.bulk_update([obj1, obj2], ["name"], batch_size=500)
+        """
+
+        objs = list(objs)
+        if not objs:
+            return 0
+
+        fields = list(fields)
+        if "updated_dtm" in get_updatable_field_names(self.model) and (
+            "updated_dtm" not in fields
+        ):
+            now = get_current_datetime()
+            for obj in objs:
+                obj.updated_dtm = now
+            fields.append("updated_dtm")
+
+        rows = self._parse_query(query={}, using=using).bulk_update(
+            objs, fields, batch_size=batch_size
+        )
+        self.on_write()
+        return rows
+
+    def bulk_upsert(
+        self,
+        rows: List[dict],
+        conflict_fields: List[str],
+        update_fields: List[str],
+        batch_size=200,
+        using=None,
+    ) -> List[T]:
+        """
+        Insert the rows or update the existing ones matching on the conflict fields.
+        When the database supports it and the conflict fields are unique, a single
+        INSERT ... ON CONFLICT DO UPDATE is executed per batch. Otherwise (e.g. SQLite or
+        no unique constraint) each batch is diffed against the existing rows with one SELECT,
+        followed by one bulk_update and one bulk_create.
+        Tenant information is added to every row the same way as create(many=True).
+        Args:
+            rows (list): List of dictionaries with the data of each row.
+            conflict_fields (list): Fields (attnames) identifying an existing row.
+            update_fields (list): Fields to be updated when the row already exists.
+            batch_size (int, optional): Number of rows handled per batch.
+        Returns:
+            list: The created and updated objects.
+        Example:
+            >>> manager.bulk_upsert(
+            ...     [{"module": "Stock", "action": "GET", "name": "List Stock"}],
+            ...     conflict_fields=["module", "action"],
+            ...     update_fields=["name"],
+            ... )
+        """
+
+        rows = [dict(row) for row in rows]
+        conflict_fields = list(conflict_fields)
+
+        if self.__is_tenant_aware:
+            tenant_id = get_tenant_details_from_request_thread()["tenant_id"]
+            for row in rows:
+                row["tenant_id"] = tenant_id
+            if "tenant_id" not in conflict_fields:
+                conflict_fields.append("tenant_id")
+
+        rows = dedupe_rows(self.model, rows, conflict_fields)
+
+        if not rows:
+            return []
+
+        using = using or self.using
+        connection = connections[using]
+
+        if connection.features.supports_update_conflicts_with_target and (
+            has_unique_constraint(self.model, conflict_fields)
+        ):
+            # pylint: disable=not-callable
+            objs = self.model.objects.using(using).bulk_create(
+                [self.model(**row) for row in rows],
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=conflict_fields,
+                update_fields=update_fields,
+            )
+            self.on_write()
+            return objs
+
+        objs = []
+        for index in range(0, len(rows), batch_size):
+            objs.extend(
+                upsert_batch(
+                    self._parse_query(query={}, using=using),
+                    rows[index : index + batch_size],
+                    conflict_fields,
+                    update_fields,
+                )
+            )
+
+        self.on_write()
+        return objs
+
     def sum(self, query, field, using=None):
         return (
             self._parse_query(query=query, using=using).aggregate(sum=Sum(field))["sum"]
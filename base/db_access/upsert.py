@@ -0,0 +1,128 @@
+"""
+Bulk upsert of the manager: rows are inserted or update the existing rows
+matching on the conflict fields.
+"""
+
+from typing import List
+
+from django.db.models import Q, Model
+from django.db.models.query import QuerySet
+
+from utils.functions import get_current_datetime
+
+from base.db_access.fields import get_updatable_field_names
+
+
+def has_unique_constraint(model: type[Model], field_names) -> bool:
+    """
+    Check if the given fields are covered by a unique constraint of the model,
+    which is required to upsert them with ON CONFLICT.
+    """
+
+    field_names = set(field_names)
+    meta = model._meta
+
+    if len(field_names) == 1:
+        for field in meta.concrete_fields:
+            if field.unique and field_names & {field.name, field.attname}:
+                return True
+
+    for unique_together in meta.unique_together:
+        if set(unique_together) == field_names:
+            return True
+
+    for constraint in meta.total_unique_constraints:
+        if set(constraint.fields) == field_names:
+            return True
+
+    return False
+
+
+def get_conflict_key(model: type[Model], conflict_fields, item, get) -> tuple:
+    """
+    Returns the values of the conflict fields of a row (get=dict.get) or an
+    object (get=getattr), converted to python so both compare equal.
+    """
+
+    meta = model._meta
+    return tuple(
+        meta.get_field(field).to_python(get(item, field)) for field in conflict_fields
+    )
+
+
+def dedupe_rows(model: type[Model], rows: List[dict], conflict_fields) -> List[dict]:
+    """
+    Keep the last row of every conflict key, like a sequence of upsert() calls would.
+    """
+
+    return list(
+        {
+            get_conflict_key(model, conflict_fields, row, dict.get): row
+            for row in rows
+        }.values()
+    )
+
+
+def set_update_fields(obj: Model, row: dict, update_fields) -> bool:
+    """
+    Set the update fields of the row on the existing object.
+    Returns whether any of them changed.
+    """
+
+    is_changed = False
+    for field in update_fields:
+        if field in row and getattr(obj, field) != row[field]:
+            setattr(obj, field, row[field])
+            is_changed = True
+
+    return is_changed
+
+
+def upsert_batch(
+    objects: QuerySet, rows: List[dict], conflict_fields, update_fields
+) -> list:
+    """
+    Upsert a single batch by diffing it against the existing rows of `objects`.
+    Executes one SELECT, one bulk_update for the changed rows and one bulk_create
+    for the new rows.
+    """
+
+    model = objects.model
+
+    existing_query = Q()
+    for row in rows:
+        existing_query |= Q(**{field: row[field] for field in conflict_fields})
+
+    existing_objs = {
+        get_conflict_key(model, conflict_fields, obj, getattr): obj
+        for obj in objects.filter(existing_query)
+    }
+
+    has_updated_dtm = "updated_dtm" in get_updatable_field_names(model)
+    now = get_current_datetime()
+
+    new_objs = []
+    changed_objs = []
+    upserted_objs = []
+    for row in rows:
+        obj = existing_objs.get(get_conflict_key(model, conflict_fields, row, dict.get))
+
+        if obj is None:
+            obj = model(**row)
+            new_objs.append(obj)
+
+        elif set_update_fields(obj, row, update_fields):
+            if has_updated_dtm:
+                obj.updated_dtm = now
+            changed_objs.append(obj)
+
+        upserted_objs.append(obj)
+
+    if changed_objs:
+        fields = [*update_fields, "updated_dtm"] if has_updated_dtm else update_fields
+        model.objects.using(objects.db).bulk_update(changed_objs, fields)
+
+    if new_objs:
+        model.objects.using(objects.db).bulk_create(new_objs)
+
+    return upserted_objs
@@ -30,3 +30,13 @@ class BaseModel(models.Model):
         abstract = True
 
     migrate_to_tenant = True
+
+    # Fields returned by to_dict. Declaring them lets Manager.list_values read the
+    # rows as plain columns, without building the model instances.
+    dict_fields: tuple = ()
+
+    def to_dict(self):
+        """
+        Convert the model instance to a dictionary of its dict_fields.
+        """
+        return {field: getattr(self, field) for field in self.dict_fields}
@@ -1,5 +1,10 @@
 from rest_framework import serializers
-from base.constants import DEFAULT_PAGE_SIZE, DEFAULT_PAGE_NUMBER
+from base.constants import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_PAGE_NUMBER,
+    CountModeEnum,
+    ExportFormatEnum,
+)
 
 
 class QuerySerializer(serializers.Serializer):
@@ -10,6 +15,21 @@ class QuerySerializer(serializers.Serializer):
     is_pagination = serializers.BooleanField(default=True)
     page = serializers.IntegerField(default=DEFAULT_PAGE_NUMBER, min_value=1)
     page_size = serializers.IntegerField(default=DEFAULT_PAGE_SIZE, min_value=1)
+    count_mode = serializers.ChoiceField(
+        choices=CountModeEnum.choices,
+        default=CountModeEnum.EXACT,
+        help_text="exact: cached exact count, estimate: planner estimate, none: skip the count.",
+    )
+    cursor = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        help_text="Opaque cursor for keyset pagination, pass it empty to get the first page.",
+    )
+    format = serializers.ChoiceField(
+        choices=ExportFormatEnum.choices,
+        required=False,
+        help_text="Stream the whole list as a csv or ndjson file instead of JSON.",
+    )
 
     def to_internal_value(self, data):
         """
@@ -25,6 +45,9 @@ class QuerySerializer(serializers.Serializer):
         if "page_size" not in data:
             data["page_size"] = DEFAULT_PAGE_SIZE
 
+        if "count_mode" not in data:
+            data["count_mode"] = CountModeEnum.EXACT
+
         if "is_pagination" not in data:
             data["is_pagination"] = True
 
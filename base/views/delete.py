@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import status
 
 
@@ -35,13 +36,19 @@ class DeleteView:
     def post_delete(self, *_, **__):
         pass
 
+    def _overrides(self, hook: str) -> bool:
+        return getattr(type(self), hook) is not getattr(DeleteView, hook)
+
     def destroy(self, request, **kwargs):
         """
         Handles the object deletion process.
 
-        This method retrieves the object based on the lookup field
-        and performs soft deletion by default. It allows customization
-        of deletion behavior through the Manager class.
+        This method performs soft deletion by default with a single conditional
+        UPDATE on the lookup field, the affected row count decides the 404.
+        When the view overrides the hooks, they run with the deletion in one
+        transaction, and with pre_delete the row is first locked so the hook is
+        only called for an existing object. It allows customization of deletion
+        behavior through the Manager class.
 
         Args:
             request (Request): The HTTP request containing relevant parameters.
@@ -57,18 +64,34 @@ class DeleteView:
             self.lookup_field: kwargs[self.lookup_field],
         }
 
-        obj = self.manager.get(query=query)
-        if not obj:
-            raise NoDataFoundError()
-
-        self.pre_delete(request=request, **kwargs)
+        if self._overrides("pre_delete") or self._overrides("post_delete"):
+            with transaction.atomic(using=self.manager.using):
+                if self._overrides("pre_delete"):
+                    self.__lock(query)
+                    self.pre_delete(request=request, **kwargs)
 
-        self.manager.delete(query=query)
-
-        self.post_delete(request=request, **kwargs)
+                self.__delete(request, query, **kwargs)
+        else:
+            self.__delete(request, query, **kwargs)
 
         return generate_response(
             data=None,
             messages={"message": success.DELETED_SUCCESSFULLY},
             status_code=status.HTTP_204_NO_CONTENT,
         )
+
+    def __lock(self, query):
+        """
+        Locks the row to delete, raises NoDataFoundError if it does not exist.
+        """
+
+        # _parse_query adds the tenant to the query, lock with a copy of it
+        objects = self.manager.list(query=dict(query), related=[], prefetch=[])
+        if not objects.select_for_update().exists():
+            raise NoDataFoundError()
+
+    def __delete(self, request, query, **kwargs):
+        if not self.manager.delete(query=query):
+            raise NoDataFoundError()
+
+        self.post_delete(request=request, **kwargs)
@@ -3,6 +3,11 @@ This module contains the BaseListView class, which provides a base implementatio
 for retrieving objects based on query parameters. It raises a 404 error if the object is not found.
 """
 
+from rest_framework.exceptions import ErrorDetail
+
+from utils.messages import error
+from utils.exceptions import codes
+from utils.export import stream_export
 from utils.response import generate_response
 from utils.exceptions.exceptions import ValidationError, NoDataFoundError
 
@@ -29,6 +34,10 @@ class ListView:
     only_fields = []
     order_by_fields = []
 
+    # Fields of the streaming export (?format=csv|ndjson), defaults to the model's
+    # dict_fields or else its fields
+    export_fields = []
+
     @classmethod
     def get_method_view_mapping(cls):
         """
@@ -42,6 +51,17 @@ class ListView:
         """
         return [obj.to_dict() for obj in objects]
 
+    def use_values(self) -> bool:
+        """
+        Check if the list can be read as dicts of the model's dict_fields
+        (`Manager.list_values`), which is the case when get_list is not overridden.
+        """
+
+        return (
+            type(self).get_list is ListView.get_list
+            and bool(self.manager.model.dict_fields)
+        )
+
     def search_query(self, query_params: dict, **_):
         """
         Generate a search query based on the provided query parameters.
@@ -86,6 +106,9 @@ class ListView:
 
         query = request.query_params.dict() or {}
 
+        if "format" in query:
+            return self.get_export(request, query)
+
         if self.is_pagination:
             return self.get_with_pagination(request, query)
 
@@ -111,13 +134,89 @@ class ListView:
             query_objects=query_objects,
         )
 
-        objects = self.manager.list(
-            query=query_objects, using=self.using(request=request)
-        )
-        if not objects:
+        if self.use_values():
+            data = self.manager.list_values(
+                query=query_objects, using=self.using(request=request)
+            )
+        else:
+            objects = self.manager.list(
+                query=query_objects, using=self.using(request=request)
+            )
+            data = self.get_list(objects=objects, request=request)
+
+        if not data:
             raise NoDataFoundError()
 
-        return generate_response(data=self.get_list(objects=objects, request=request))
+        return generate_response(data=data)
+
+    def get_export_fields(self) -> list:
+        """
+        Returns the fields written by the streaming export.
+        """
+
+        if self.export_fields:
+            return list(self.export_fields)
+
+        if self.manager.model.dict_fields:
+            return list(self.manager.model.dict_fields)
+
+        return [
+            field.attname
+            for field in self.manager.model._meta.concrete_fields
+            if field.attname not in constants.EXPORT_EXCLUDED_FIELDS
+        ]
+
+    def get_export(self, request, query_params):
+        """
+        Stream the whole object list as CSV or NDJSON (?format=csv|ndjson).
+        The rows are read with a values() projection in chunks of EXPORT_CHUNK_SIZE,
+        so the memory use and the time to the first byte do not depend on the
+        number of rows.
+        """
+
+        export_format = query_params["format"]
+        if self.list_serializer_class is not None:
+            serializer = self.list_serializer_class(data=query_params, partial=True)
+            if not serializer.is_valid():
+                raise ValidationError(serializer.errors)
+
+            query_params = serializer.validated_data
+
+        if export_format not in constants.ExportFormatEnum.values:
+            raise ValidationError(
+                {
+                    "format": [
+                        ErrorDetail(
+                            error.INVALID_EXPORT_FORMAT.format(
+                                formats=", ".join(constants.ExportFormatEnum.values)
+                            ),
+                            code=codes.INVALID_CHOICE,
+                        )
+                    ]
+                }
+            )
+
+        query_objects = self.get_query_obj(request=request)
+
+        query_objects = self.get_search_and_filter_query(
+            query_params=query_params,
+            query_objects=query_objects,
+        )
+
+        fields = self.get_export_fields()
+        rows = (
+            self.manager.list(
+                query=query_objects,
+                order_by=self.order_by_fields,
+                using=self.using(request=request),
+            )
+            .values(*fields)
+            .iterator(chunk_size=constants.EXPORT_CHUNK_SIZE)
+        )
+
+        return stream_export(
+            rows, fields, export_format, self.manager.model._meta.db_table
+        )
 
     def get_query_obj(self, request, **_):
         return {}
@@ -147,9 +246,15 @@ class ListView:
             query_objects=query_objects,
         )
 
+        if "cursor" in query_params:
+            return self.get_with_cursor_pagination(
+                request, query_params, query_objects
+            )
+
         pagination = {
             "page": query_params["page"],
             "page_size": query_params["page_size"],
+            "count_mode": query_params["count_mode"],
         }
 
         objects, pagination = self.manager.list_with_pagination(
@@ -158,6 +263,38 @@ class ListView:
             only=self.only_fields,
             order_by=self.order_by_fields,
             using=self.using(request=request),
+            values=self.use_values(),
+        )
+
+        if not objects:
+            raise NoDataFoundError()
+
+        if not self.use_values():
+            objects = self.get_list(objects=objects, request=request)
+
+        return generate_response(
+            data={
+                "list": objects,
+                "pagination": pagination,
+            }
+        )
+
+    def get_with_cursor_pagination(self, request, query_params, query_objects):
+        """
+        Retrieve object list with keyset (cursor) pagination.
+        The objects are ordered on (created_dtm, pk), so order_by_fields are not applied.
+        """
+
+        pagination = {
+            "cursor": query_params["cursor"],
+            "page_size": query_params["page_size"],
+        }
+
+        objects, pagination = self.manager.list_with_cursor_pagination(
+            query=query_objects,
+            pagination=pagination,
+            only=self.only_fields,
+            using=self.using(request=request),
         )
 
         if not objects:
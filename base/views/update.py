@@ -84,7 +84,7 @@ class UpdateView:
 
         data = self.add_common_update_data(data=data, request=request)
 
-        obj = self.manager.update(data, query)
+        obj = self.manager.update(data, query, obj=obj)
 
         return generate_response(
             data=obj.to_dict(),
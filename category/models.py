@@ -19,12 +19,8 @@ class Category(BaseModel, models.Model):
     class Meta:
         db_table = "categories"
 
-    def to_dict(self):
-        """
-        Convert the model instance to a dictionary.
-        """
-        return {
-            "category_id": self.category_id,
-            "category_code": self.category_code,
-            "category_name": self.category_name,
-        }
+    dict_fields = (
+        "category_id",
+        "category_code",
+        "category_name",
+    )
@@ -1,3 +1,6 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from utils.functions import get_uuid
 from test_utils.tenant_user_base import TestCaseBase
 
@@ -141,6 +144,230 @@ class CategoryTestCase(TestCaseBase):
 
         return True
 
+    def test_get_category_list_server_timing(self):
+        """
+        Test that the time of every layer of the request is in the Server-Timing header
+        """
+        self.test_create_category()
+
+        response = self.client.get(self.path)
+        self.success_ok_200(response.json())
+
+        metrics = {
+            metric.split(";")[0]: metric
+            for metric in response["Server-Timing"].split(", ")
+        }
+        for phase in ("tenant", "auth", "permission", "audit", "serialization"):
+            self.assertIn(phase, metrics)
+        self.assertRegex(metrics["db"], r'^db;dur=[0-9.]+;desc="[1-9][0-9]* queries"$')
+        self.assertRegex(metrics["cache"], r'desc="[0-9]+ hits [0-9]+ misses"$')
+        self.assertRegex(metrics["total"], r"^total;dur=[0-9.]+$")
+        self.assertIn("Req-Performance-Time", response)
+
+    def test_get_category_list_reads_values(self):
+        """
+        Test that the list is read as values, without building model instances,
+        and matches to_dict
+        """
+        from unittest import mock
+
+        from category.models import Category
+        from category.db_access import category_manager
+        from tenant.utils.helpers import set_tenant_details_to_request_thread
+
+        created = self.test_create_category()
+
+        with mock.patch.object(Category, "from_db", side_effect=AssertionError):
+            response_data = self.client.get(self.path).json()
+            self.success_ok_200(response_data)
+
+            response_data = self.client.get(self.path, {"is_pagination": False}).json()
+            self.success_ok_200(response_data)
+
+        self.assertEqual(response_data["data"], [created])
+
+        set_tenant_details_to_request_thread(self.setup_tenant())
+        self.assertEqual(
+            category_manager.list_values({"category_id": created["category_id"]}),
+            [category_manager.get({"category_id": created["category_id"]}).to_dict()],
+        )
+
+        return True
+
+    def test_get_category_list_count_cache_invalidated_on_write(self):
+        """
+        Test the cached list count is refreshed after a new category is created
+        """
+        self.test_create_category()
+
+        response = self.client.get(self.path)
+        response_data = response.json()
+
+        self.success_ok_200(response_data)
+        self.assertEqual(response_data["data"]["pagination"]["count"], 1)
+
+        response = self.client.post(
+            self.path,
+            {"category_name": "Second Category", "category_code": "SECOND_CATEGORY"},
+        )
+        self.created_successfully_201(response.json())
+
+        response = self.client.get(self.path)
+        response_data = response.json()
+
+        self.success_ok_200(response_data)
+        self.assertEqual(response_data["data"]["pagination"]["count"], 2)
+        self.assertEqual(len(response_data["data"]["list"]), 2)
+
+        return True
+
+    def test_get_category_list_without_count(self):
+        """
+        Test getting the list of categories with the count skipped
+        """
+        self.test_create_category()
+
+        response = self.client.get(self.path, {"count_mode": "none"})
+        response_data = response.json()
+
+        self.success_ok_200(response_data)
+        self.assertEqual(len(response_data["data"]["list"]), 1)
+
+        pagination = response_data["data"]["pagination"]
+        self.assertIsNone(pagination["count"])
+        self.assertIsNone(pagination["total_pages"])
+        self.assertEqual(pagination["current_page"], 1)
+
+        return True
+
+    def test_get_category_list_with_cursor(self):
+        """
+        Test walking the list of categories with cursor pagination
+        """
+        for index in range(3):
+            response = self.client.post(
+                self.path,
+                {
+                    "category_name": f"Test Category {index}",
+                    "category_code": f"TEST_CATEGORY_{index}",
+                },
+            )
+            self.created_successfully_201(response.json())
+
+        response = self.client.get(self.path, {"cursor": "", "page_size": 2})
+        response_data = response.json()
+
+        self.success_ok_200(response_data)
+
+        first_page = response_data["data"]["list"]
+        pagination = response_data["data"]["pagination"]
+        self.assertEqual(len(first_page), 2)
+        self.assertEqual(pagination["page_size"], 2)
+        self.assertIsNone(pagination["prev_cursor"])
+        self.assertIsNotNone(pagination["next_cursor"])
+        self.assertNotIn("count", pagination)
+
+        response = self.client.get(
+            self.path, {"cursor": pagination["next_cursor"], "page_size": 2}
+        )
+        response_data = response.json()
+
+        self.success_ok_200(response_data)
+
+        second_page = response_data["data"]["list"]
+        pagination = response_data["data"]["pagination"]
+        self.assertEqual(len(second_page), 1)
+        self.assertIsNone(pagination["next_cursor"])
+        self.assertIsNotNone(pagination["prev_cursor"])
+
+        listed_ids = [category["category_id"] for category in first_page + second_page]
+        self.assertEqual(len(set(listed_ids)), 3)
+
+        response = self.client.get(
+            self.path, {"cursor": pagination["prev_cursor"], "page_size": 2}
+        )
+        response_data = response.json()
+
+        self.success_ok_200(response_data)
+        self.assertEqual(response_data["data"]["list"], first_page)
+
+        return True
+
+    def test_get_category_list_with_invalid_cursor(self):
+        """
+        Test getting the list of categories with a malformed cursor
+        """
+        self.test_create_category()
+
+        response = self.client.get(self.path, {"cursor": "not-a-cursor"})
+        response_data = response.json()
+
+        self.bad_request_404(response_data)
+        self.assertEqual(response_data["errors"]["code"], "INVALID")
+        self.assertEqual(
+            response_data["errors"]["message"], "Invalid pagination cursor."
+        )
+
+        return True
+
+    def test_export_category_list_csv(self):
+        """
+        Test streaming the list of categories as CSV
+        """
+        import csv
+
+        self.test_create_category()
+
+        response = self.client.get(self.path, {"format": "csv"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("categories.csv", response["Content-Disposition"])
+
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["category_code"], "TEST_CATEGORY")
+        self.assertNotIn("tenant_id", rows[0])
+
+        return True
+
+    def test_export_category_list_ndjson(self):
+        """
+        Test streaming the filtered list of categories as NDJSON
+        """
+        import json
+
+        self.test_create_category()
+        self.client.post(
+            self.path,
+            {"category_name": "Other Category", "category_code": "OTHER_CATEGORY"},
+        )
+
+        response = self.client.get(
+            self.path, {"format": "ndjson", "category_name": "Other"}
+        )
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["category_code"], "OTHER_CATEGORY")
+
+        return True
+
+    def test_export_category_list_invalid_format(self):
+        """
+        Test exporting the list of categories in an unknown format
+        """
+        response = self.client.get(self.path, {"format": "xml"})
+        response_data = response.json()
+
+        self.bad_request_404(response_data)
+        self.assertEqual(response_data["errors"][0]["field"], "format")
+
+        return True
+
     def test_no_data_found_category_list(self):
         """
         Test getting the list of categories when no data exists
@@ -251,6 +478,37 @@ class CategoryTestCase(TestCaseBase):
 
         return True
 
+    def test_patch_category_writes_only_changed_columns(self):
+        """
+        Test patching a category loads it once and updates only the given columns
+        """
+        category_data = self.test_create_category()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                self.path_id.format(category_id=category_data["category_id"]),
+                data=self.get_patch_data(),
+            )
+
+        self.update_success_ok_200(response.json())
+
+        category_queries = [
+            query["sql"] for query in ctx.captured_queries if '"categories"' in query["sql"]
+        ]
+        updates = [sql for sql in category_queries if sql.startswith("UPDATE")]
+        selects = [
+            sql
+            for sql in category_queries
+            if sql.startswith("SELECT") and '"categories"."category_code"' in sql
+        ]
+
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"category_name"', updates[0])
+        self.assertNotIn('"category_code"', updates[0])
+        self.assertEqual(len(selects), 1)
+
+        return True
+
     def test_patch_category_not_found(self):
         """
         Test patching a category that does not exist
@@ -294,6 +552,28 @@ class CategoryTestCase(TestCaseBase):
 
         return True
 
+    def test_delete_category_runs_one_conditional_update(self):
+        """
+        Test deleting a category runs a single UPDATE on the categories, without
+        reading or locking the row first
+        """
+        category_data = self.test_create_category()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.delete(
+                self.path_id.format(category_id=category_data["category_id"])
+            )
+
+        self.delete_success_204(response.status_code)
+
+        category_queries = [
+            query["sql"] for query in ctx.captured_queries if '"categories"' in query["sql"]
+        ]
+        self.assertEqual(len(category_queries), 1)
+        self.assertTrue(category_queries[0].startswith("UPDATE"))
+
+        return True
+
     def test_delete_category_not_found(self):
         """
         Test deleting a category that does not exist
@@ -0,0 +1,36 @@
+"""
+Rebuild the materialized stock balances from the stock movements.
+"""
+
+from django.core.management.base import BaseCommand
+
+from utils.logger import log_msg, logging
+
+from tenant.utils.tenant_conf import get_tenant_db_names
+
+from stock.db_access import stock_balance_manager
+
+
+class Command(BaseCommand):
+    """
+    Command to rebuild the stock balances of every tenant database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant_id",
+            default=None,
+            help="Only rebuild the database of this tenant.",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Recomputes the balances of the default database and of every separate
+        tenant database (or only the database of the given tenant).
+        """
+
+        for alias in get_tenant_db_names(kwargs["tenant_id"]):
+            count = stock_balance_manager.rebuild(using=alias)
+            log_msg(logging.INFO, f"{count} stock balances rebuilt on {alias}.")
+
+        return ""
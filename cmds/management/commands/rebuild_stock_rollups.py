@@ -0,0 +1,36 @@
+"""
+Rebuild the daily stock rollups from the stock movements.
+"""
+
+from django.core.management.base import BaseCommand
+
+from utils.logger import log_msg, logging
+
+from tenant.utils.tenant_conf import get_tenant_db_names
+
+from stock.db_access import stock_daily_rollup_manager
+
+
+class Command(BaseCommand):
+    """
+    Command to rebuild the daily stock rollups of every tenant database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant_id",
+            default=None,
+            help="Only rebuild the database of this tenant.",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Recomputes the rollups of the default database and of every separate
+        tenant database (or only the database of the given tenant).
+        """
+
+        for alias in get_tenant_db_names(kwargs["tenant_id"]):
+            count = stock_daily_rollup_manager.rebuild(using=alias)
+            log_msg(logging.INFO, f"{count} stock rollups rebuilt on {alias}.")
+
+        return ""
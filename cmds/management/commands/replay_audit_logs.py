@@ -0,0 +1,68 @@
+"""
+Write the audit logs spilled to disk by the audit log writer into the database.
+"""
+
+import os
+import json
+
+from django.core.management.base import BaseCommand
+
+from utils.logger import log_msg, logging
+
+from tenant.db_access import tenant_manager
+
+from audit_logs.utils.audit_writer import AuditLogWriter
+
+
+class Command(BaseCommand):
+    """
+    Command to replay the audit logs spill file.
+    """
+
+    def handle(self, *args, **kwargs):
+        """
+        Moves the spill file aside, writes its entries in batches and removes it.
+        Entries failing again are spilled to a new spill file. Each entry is
+        written with the tenant it was spilled with.
+        """
+        writer = AuditLogWriter(sync=False)
+        spill_path = writer.get_spill_path()
+
+        if not os.path.exists(spill_path):
+            log_msg(logging.INFO, "No audit logs to replay.")
+            return ""
+
+        replay_path = f"{spill_path}.replay"
+        os.replace(spill_path, replay_path)
+
+        tenants = {}
+
+        def get_tenant(tenant_id):
+            if tenant_id and tenant_id not in tenants:
+                tenants[tenant_id] = tenant_manager.get(query={"tenant_id": tenant_id})
+            return tenants.get(tenant_id)
+
+        batch, count = [], 0
+        with open(replay_path, encoding="utf-8") as spill:
+            for line in spill:
+                entry = json.loads(line)
+                batch.append(
+                    (
+                        entry["using"],
+                        entry["data"],
+                        get_tenant(entry.get("tenant_id")),
+                        entry.get("tenant_aware", True),
+                    )
+                )
+                if len(batch) >= writer.batch_size:
+                    writer.write_batch(batch)
+                    count, batch = count + len(batch), []
+
+        if batch:
+            writer.write_batch(batch)
+            count += len(batch)
+
+        os.remove(replay_path)
+        log_msg(logging.INFO, f"{count} audit logs replayed.")
+
+        return ""
@@ -0,0 +1,53 @@
+"""
+Take the daily checkpoints of the stock balances.
+"""
+
+from datetime import date, timedelta
+
+from django.utils import timezone
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.logger import log_msg, logging
+
+from tenant.utils.tenant_conf import get_tenant_db_names
+
+from stock.db_access import stock_balance_snapshot_manager
+
+
+class Command(BaseCommand):
+    """
+    Command to take the stock balance checkpoint of a day on every tenant database,
+    meant to be scheduled once a day.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            default=None,
+            type=date.fromisoformat,
+            help="Finished day of the checkpoint (YYYY-MM-DD), defaults to yesterday.",
+        )
+        parser.add_argument(
+            "--tenant_id",
+            default=None,
+            help="Only take the checkpoint on the database of this tenant.",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Takes the checkpoint on the default database and on every separate tenant
+        database (or only on the database of the given tenant).
+        The day must be over: movements created on it after the checkpoint would
+        be left out of the past balances, which only add the later movements.
+        """
+
+        today = timezone.localdate()
+        day = kwargs["date"] or today - timedelta(days=1)
+        if day >= today:
+            raise CommandError(f"({day}) is not over, only past days can be taken")
+
+        for alias in get_tenant_db_names(kwargs["tenant_id"]):
+            count = stock_balance_snapshot_manager.take(day, using=alias)
+            log_msg(logging.INFO, f"{count} stock snapshots of {day} taken on {alias}.")
+
+        return ""
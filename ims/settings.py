@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 import os
 import sys
 import json
+import tempfile
 from pathlib import Path
 
 from utils.functions import is_test
@@ -99,9 +100,11 @@ DEFAULT_AUTHENTICATION_CLASSES = [TOKEN_AUTHENTICATION_CLASS]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "middleware.res.AddResponseHeadersMiddleware",
+    "middleware.identity_map.IdentityMapMiddleware",
     "middleware.sub_dm.AttachSubdomainToRequestMiddleware",
+    "middleware.metrics.RequestMetricsMiddleware",
     "middleware.exc.DRFExceptionMiddleware",
-    "middleware.res.AddResponseHeadersMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -137,8 +140,30 @@ WSGI_APPLICATION = f"{PROJECT_NAME.lower()}.wsgi.application"
 
 DATABASES = config["DATABASES"]
 
+DATABASE_ROUTERS = ["tenant.routers.TenantDatabaseRouter"]
+
 CACHES = config["CACHES"]
 
+# In process (L1) cache kept in front of the default cache, see utils.cache.
+# SIZES caps the number of entries per key prefix (the part before the first ":").
+CACHE_L1 = {
+    "TIMEOUT": 5,
+    "GENERATION_CHECK_INTERVAL": 1,
+    "DEFAULT_SIZE": 1024,
+    # Token lookups, JWT revocations and the role permission and user versions are not
+    # kept in process, so a logout or a permission change is seen by every worker at
+    # once
+    "SIZES": {
+        "count": 2048,
+        "count_version": 256,
+        "token": 0,
+        "jwt_revocations": 0,
+        "role_permissions_version": 0,
+        "user_version": 0,
+    },
+    **config.get("CACHE_L1", {}),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -196,6 +221,21 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 LOG_DIR = BASE_DIR / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
+# Request metrics served in the Prometheus text format, see monitor.metrics. Every
+# worker process writes its metrics to a file of DIR, merged at scrape time. The
+# scrapes must send TOKEN as a Bearer token, the metrics are not served without it
+# (except in the TEST env, which also keeps its metrics files in a temp directory).
+METRICS = {
+    "DIR": (
+        Path(tempfile.mkdtemp(prefix="ims-metrics-"))
+        if is_test()
+        else LOG_DIR / "metrics"
+    ),
+    "FLUSH_INTERVAL": 5,
+    "TOKEN": None,
+    **config.get("METRICS", {}),
+}
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -240,6 +280,8 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "TRAILING_SLASH": False,
     "DEFAULT_AUTHENTICATION_CLASSES": [],
+    # ?format= selects the streaming export of the list views, not a renderer
+    "URL_FORMAT_OVERRIDE": None,
 }
 
 DESC = "This Django-based Inventory Management System (IMS) is a scalable, multi-tenant backend application built " \
@@ -0,0 +1,30 @@
+"""
+This module installs the identity map of the managers for every request.
+"""
+
+from django.conf import settings
+
+from base.db_access.identity_map import start_identity_map, clear_identity_map
+
+
+class IdentityMapMiddleware:
+    """
+    Middleware installing a new identity map for every request and clearing it at
+    the end of the request. In debug mode the number of reads served from the map
+    is added in the Identity-Map-Hits response header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        identity_map = start_identity_map()
+        try:
+            response = self.get_response(request)
+        finally:
+            clear_identity_map()
+
+        if settings.DEBUG:
+            response["Identity-Map-Hits"] = str(identity_map.hits)
+
+        return response
@@ -0,0 +1,45 @@
+"""
+This module records the metrics of every request, served by the monitor app.
+"""
+
+from timeit import default_timer as timer
+
+from utils.timing import get_request_timings
+from utils.constants import DB_TIMING_PHASE
+
+from tenant.utils.helpers import get_tenant_details_from_request_thread
+
+from monitor.metrics import metrics_registry
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware recording the latency, status and database query count of every
+    request, by route (the URL pattern, not the path) and tenant.
+    Must come after the subdomain middleware, which resolves the tenant and route.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = timer()
+        response = self.get_response(request)
+        end = timer()
+
+        resolver_match = getattr(request, "resolver_match", None)
+        tenant_obj = get_tenant_details_from_request_thread(
+            raise_err=False, g_t_obj=True
+        )["tenant_obj"]
+        timings = get_request_timings()
+
+        metrics_registry.observe_request(
+            route=resolver_match.route if resolver_match else None,
+            method=request.method,
+            tenant=tenant_obj.tenant_code if tenant_obj else None,
+            status=response.status_code,
+            seconds=end - start,
+            queries=timings.get_count(DB_TIMING_PHASE) if timings else 0,
+        )
+
+        return response
@@ -1,17 +1,27 @@
 """
-This module adds the Performance time and System version in the response headers.
+This module adds the Performance time, the Server-Timing breakdown and System version
+in the response headers.
 """
 
+from contextlib import ExitStack
 from timeit import default_timer as timer
 
+from django.db import connections
 from django.utils import timezone
 
 from utils.version import get_version_str
+from utils.constants import SERIALIZATION_TIMING_PHASE
+from utils.timing import (
+    start_request_timings,
+    get_request_timings,
+    clear_request_timings,
+)
 
 
 class AddResponseHeadersMiddleware:
     __doc__ = """
-        This Middleware adds the Performance time and System version in the response headers.
+        This Middleware adds the Performance time, the Server-Timing breakdown and
+        System version in the response headers.
     """
 
     def __init__(self, get_response):
@@ -20,10 +30,21 @@ class AddResponseHeadersMiddleware:
     def __call__(self, request):
         """
         This method is called for each request.
-        And it adds the Performance time and System version in the response headers.
+        And it adds the Performance time, the Server-Timing breakdown and System version
+        in the response headers. The queries of every database connection are timed
+        with an execute wrapper.
         """
+        timings = start_request_timings()
         start = timer()
-        response = self.get_response(request)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(timings.db_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            clear_request_timings()
         end = timer()
 
         _timedelta = timezone.timedelta(seconds=end - start)
@@ -32,5 +53,22 @@ class AddResponseHeadersMiddleware:
         response["Req-Performance-Time"] = str(_timedelta) + str(
             f"[HH:MM:SS:MS] | {_timedelta.total_seconds() * 1000}[MS]"
         )
+        response["Server-Timing"] = timings.to_header(total=end - start)
 
         return response
+
+    def process_template_response(self, _, response):
+        """
+        Times the rendering of the response body as the serialization phase.
+        """
+        timings = get_request_timings()
+        if timings is None:
+            return response
+
+        start = timer()
+
+        def add_serialization_time(_):
+            timings.add(SERIALIZATION_TIMING_PHASE, timer() - start)
+
+        response.add_post_render_callback(add_serialization_time)
+        return response
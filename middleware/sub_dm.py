@@ -8,12 +8,17 @@ from django.urls import resolve, Resolver404
 
 
 from utils.messages import error
+from utils.timing import timed
+from utils.cache import global_cache
+from utils.constants import TENANT_TIMING_PHASE
 from utils.logger import log_msg, logging
 from utils.response import generate_response
 from utils import functions as common_functions
 from utils.tenant_aware_path import is_path_excluded_from_tenant_aware
 
 from tenant.db_access import tenant_manager
+from tenant.constants import TENANT_NEGATIVE_CACHE_TTL
+from tenant.utils.tenant_codes import known_tenant_codes
 from tenant.utils.helpers import (
     set_tenant_details_to_request_thread,
     clear_tenant_details_from_request_thread,
@@ -31,19 +36,35 @@ class AttachSubdomainToRequestMiddleware:
         self.get_response = get_response
 
     def get_tenant_details(self, request):
+        """
+        Returns the tenant of the request subdomain or None.
+
+        Subdomains which are not a known tenant code are rejected without any I/O.
+        Lookups are cached under the tenant codes version, so any tenant write drops
+        them, and a subdomain without a tenant is cached as a negative entry.
+        """
         sub_domain_data = common_functions.get_subdomain(request)
 
         if not sub_domain_data:
             return None
 
-        tenant_obj = tenant_manager.cache.get(sub_domain_data)
+        if not known_tenant_codes.contains(sub_domain_data):
+            return None
+
+        cache_key = f"tenant_code:{known_tenant_codes.get_version()}:{sub_domain_data}"
+        tenant_obj = global_cache.get(cache_key)
+
+        if global_cache.is_negative(tenant_obj):
+            return None
 
         if not tenant_obj:
             tenant_obj = tenant_manager.get(query={"tenant_code": sub_domain_data})
-            tenant_manager.cache.set(sub_domain_data, tenant_obj)
 
-        if not tenant_obj:
-            return None
+            if not tenant_obj:
+                global_cache.set_negative(cache_key, TENANT_NEGATIVE_CACHE_TTL)
+                return None
+
+            global_cache.set(cache_key, tenant_obj)
 
         return tenant_obj
 
@@ -55,7 +76,8 @@ class AttachSubdomainToRequestMiddleware:
         with an error message.
         """
         try:
-            tenant_obj = self.get_tenant_details(request=request)
+            with timed(TENANT_TIMING_PHASE):
+                tenant_obj = self.get_tenant_details(request=request)
             if tenant_obj:
                 set_tenant_details_to_request_thread(tenant_obj)
 
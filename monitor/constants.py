@@ -0,0 +1,22 @@
+"""
+Constants of the monitor app.
+"""
+
+# Prefix of the name of every metric
+METRICS_NAMESPACE = "ims"
+
+# Content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the request latency histogram buckets
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Upper bounds of the database queries per request histogram buckets
+METRICS_QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Seconds the metrics file of a stopped worker is kept, its counters are still
+# merged meanwhile so the totals do not drop when a worker is recycled
+METRICS_DEAD_WORKER_TTL = 3600
+
+# Label value of the requests without tenant or without resolved route
+METRICS_NO_LABEL = "none"
@@ -0,0 +1,392 @@
+"""
+Request metrics aggregated in process and merged across the worker processes,
+served in the Prometheus text exposition format.
+"""
+
+import os
+import json
+import glob
+import tempfile
+import threading
+from time import time, monotonic
+
+import psutil
+
+from utils import settings
+from utils.cache import CacheInterface
+from utils.logger import log_msg, logging
+
+from audit_logs.utils.audit_writer import audit_log_writer
+from notification.utils.dispatcher import notification_dispatcher
+
+from monitor.constants import (
+    METRICS_NO_LABEL,
+    METRICS_NAMESPACE,
+    METRICS_QUERY_BUCKETS,
+    METRICS_LATENCY_BUCKETS,
+    METRICS_DEAD_WORKER_TTL,
+)
+
+REQUEST_DURATION = f"{METRICS_NAMESPACE}_http_request_duration_seconds"
+REQUESTS_TOTAL = f"{METRICS_NAMESPACE}_http_requests_total"
+REQUEST_QUERIES = f"{METRICS_NAMESPACE}_db_queries_per_request"
+CACHE_REQUESTS_TOTAL = f"{METRICS_NAMESPACE}_cache_requests_total"
+CACHE_HIT_RATIO = f"{METRICS_NAMESPACE}_cache_hit_ratio"
+AUDIT_QUEUE_DEPTH = f"{METRICS_NAMESPACE}_audit_log_queue_depth"
+NOTIFICATION_QUEUE_DEPTH = f"{METRICS_NAMESPACE}_notification_queue_depth"
+WORKER_RSS = f"{METRICS_NAMESPACE}_worker_resident_memory_bytes"
+
+HELP = {
+    REQUEST_DURATION: "Request latency in seconds by route and tenant.",
+    REQUESTS_TOTAL: "Requests by response status.",
+    REQUEST_QUERIES: "Database queries per request by route.",
+    CACHE_REQUESTS_TOTAL: "Cache lookups by key prefix and result.",
+    CACHE_HIT_RATIO: "Share of the cache lookups of the key prefix that hit.",
+    AUDIT_QUEUE_DEPTH: "Audit logs queued and not written yet, by worker.",
+    NOTIFICATION_QUEUE_DEPTH: "Notification jobs not finished yet, by worker.",
+    WORKER_RSS: "Resident memory of the worker process in bytes.",
+}
+
+BUCKETS = {
+    REQUEST_DURATION: METRICS_LATENCY_BUCKETS,
+    REQUEST_QUERIES: METRICS_QUERY_BUCKETS,
+}
+
+
+def get_labels_key(**labels) -> str:
+    return json.dumps(labels, sort_keys=True)
+
+
+def format_labels(labels: dict) -> str:
+    """
+    Returns the labels in the exposition format, e.g. {route="api/stock"}.
+    """
+
+    if not labels:
+        return ""
+
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+        value = value.replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def format_bound(bound) -> str:
+    return format_value(float(bound))
+
+
+class MetricsRegistry:
+    """
+    Aggregates the request metrics of the worker process in memory and writes them,
+    at most once per `flush_interval`, to a JSON file of `directory` named after the
+    process. A scrape merges the files of all the workers: counters and histograms
+    are summed, including the ones of the stopped workers until their file is
+    older than METRICS_DEAD_WORKER_TTL, gauges are only kept for the running
+    workers and labelled with their pid.
+    """
+
+    def __init__(self, directory: str = None, flush_interval: float = None):
+        self.directory = directory
+        self.flush_interval = flush_interval
+
+        self.counters = {}
+        self.histograms = {}
+        self._pid = None
+        self._flushed_at = 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.counters = {}
+        self.histograms = {}
+        self._flushed_at = 0
+        self._pid = os.getpid()
+
+    def get_directory(self) -> str:
+        return str(self.directory or settings.read("METRICS")["DIR"])
+
+    def get_flush_interval(self) -> float:
+        if self.flush_interval is not None:
+            return self.flush_interval
+        return settings.read("METRICS")["FLUSH_INTERVAL"]
+
+    @staticmethod
+    def get_worker_name(pid: int, started_at: float) -> str:
+        # The start time tells apart the workers reusing the pid of a stopped one
+        return f"{pid}-{int(started_at)}"
+
+    def _ensure_process(self):
+        """
+        Starts over in a forked worker, so the metrics of the parent are not
+        counted twice.
+        """
+
+        if self._pid != os.getpid():
+            self._reset()
+
+    def inc(self, name: str, labels: dict, value: float = 1):
+        with self._lock:
+            self._ensure_process()
+            series = self.counters.setdefault(name, {})
+            key = get_labels_key(**labels)
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict, value: float):
+        """
+        Adds the value to the histogram, the bucket counts are cumulative.
+        """
+
+        bounds = BUCKETS[name]
+        with self._lock:
+            self._ensure_process()
+            series = self.histograms.setdefault(name, {})
+            histogram = series.setdefault(
+                get_labels_key(**labels),
+                {"buckets": [0] * len(bounds), "sum": 0, "count": 0},
+            )
+            for index, bound in enumerate(bounds):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def observe_request(self, route, method, tenant, status, seconds, queries):
+        """
+        Records a finished request, and writes the metrics of the worker when the
+        last write is older than the flush interval.
+        """
+
+        route = route or METRICS_NO_LABEL
+        tenant = tenant or METRICS_NO_LABEL
+
+        self.observe(
+            REQUEST_DURATION,
+            {"route": route, "method": method, "tenant": tenant},
+            seconds,
+        )
+        self.inc(REQUESTS_TOTAL, {"status": str(status)})
+        self.observe(REQUEST_QUERIES, {"route": route}, queries)
+
+        if monotonic() - self._flushed_at >= self.get_flush_interval():
+            self.flush()
+
+    @staticmethod
+    def get_gauges() -> dict:
+        """
+        Returns the gauges of the worker process.
+        """
+
+        return {
+            AUDIT_QUEUE_DEPTH: audit_log_writer.buffer.qsize(),
+            NOTIFICATION_QUEUE_DEPTH: notification_dispatcher.pending,
+            WORKER_RSS: psutil.Process().memory_info().rss,
+        }
+
+    def snapshot(self) -> dict:
+        """
+        Returns the metrics of the worker process.
+        """
+
+        with self._lock:
+            self._ensure_process()
+            counters = {name: dict(series) for name, series in self.counters.items()}
+            histograms = json.loads(json.dumps(self.histograms))
+
+        return {
+            "pid": self._pid,
+            "started_at": psutil.Process().create_time(),
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": self.get_gauges(),
+            "cache": CacheInterface.get_prefix_stats(),
+        }
+
+    def flush(self):
+        """
+        Writes the metrics of the worker process to its file, replaced atomically.
+        """
+
+        snapshot = self.snapshot()
+        directory = self.get_directory()
+        name = self.get_worker_name(snapshot["pid"], snapshot["started_at"])
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                json.dump(snapshot, temp_file)
+            os.replace(temp_path, os.path.join(directory, f"{name}.json"))
+        except OSError as err:
+            log_msg(logging.ERROR, "Metrics write failed", str(err))
+
+        self._flushed_at = monotonic()
+        return snapshot
+
+    @staticmethod
+    def is_running(snapshot: dict) -> bool:
+        try:
+            process = psutil.Process(snapshot["pid"])
+            return int(process.create_time()) == int(snapshot["started_at"])
+        except psutil.Error:
+            return False
+
+    def read_snapshots(self, own: dict) -> list:
+        """
+        Returns the snapshots of all the workers, the given one for this process.
+        The files of the workers stopped for more than METRICS_DEAD_WORKER_TTL are
+        deleted.
+        """
+
+        own_name = self.get_worker_name(own["pid"], own["started_at"])
+        snapshots = [own]
+
+        for path in glob.glob(os.path.join(self.get_directory(), "*.json")):
+            if os.path.basename(path) == f"{own_name}.json":
+                continue
+
+            try:
+                with open(path, encoding="utf-8") as worker_file:
+                    snapshot = json.load(worker_file)
+                modified_at = os.path.getmtime(path)
+            except (OSError, ValueError):
+                continue
+
+            snapshot["running"] = self.is_running(snapshot)
+            if not snapshot["running"] and time() - modified_at > (
+                METRICS_DEAD_WORKER_TTL
+            ):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+
+            snapshots.append(snapshot)
+
+        own["running"] = True
+        return snapshots
+
+    @staticmethod
+    def merge(snapshots: list) -> dict:
+        """
+        Sums the counters, histograms and cache lookups of the snapshots, the gauges
+        are kept per running worker.
+        """
+
+        merged = {"counters": {}, "histograms": {}, "gauges": {}, "cache": {}}
+
+        for snapshot in snapshots:
+            for name, series in snapshot["counters"].items():
+                merged_series = merged["counters"].setdefault(name, {})
+                for key, value in series.items():
+                    merged_series[key] = merged_series.get(key, 0) + value
+
+            for name, series in snapshot["histograms"].items():
+                merged_series = merged["histograms"].setdefault(name, {})
+                for key, histogram in series.items():
+                    merged_histogram = merged_series.setdefault(
+                        key,
+                        {
+                            "buckets": [0] * len(histogram["buckets"]),
+                            "sum": 0,
+                            "count": 0,
+                        },
+                    )
+                    for index, count in enumerate(histogram["buckets"]):
+                        merged_histogram["buckets"][index] += count
+                    merged_histogram["sum"] += histogram["sum"]
+                    merged_histogram["count"] += histogram["count"]
+
+            for prefix, counters in snapshot["cache"].items():
+                merged_counters = merged["cache"].setdefault(
+                    prefix or "default", {"hits": 0, "misses": 0}
+                )
+                merged_counters["hits"] += counters["hits"]
+                merged_counters["misses"] += counters["misses"]
+
+            if snapshot.get("running"):
+                for name, value in snapshot["gauges"].items():
+                    merged["gauges"].setdefault(name, {})[snapshot["pid"]] = value
+
+        return merged
+
+    @staticmethod
+    def render(merged: dict) -> str:
+        """
+        Returns the merged metrics in the Prometheus text exposition format.
+        """
+
+        lines = []
+
+        def add_header(name, metric_type):
+            lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        for name, series in sorted(merged["histograms"].items()):
+            add_header(name, "histogram")
+            for key, histogram in sorted(series.items()):
+                labels = json.loads(key)
+                for bound, count in zip(BUCKETS[name], histogram["buckets"]):
+                    bucket_labels = format_labels({**labels, "le": format_bound(bound)})
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                inf_labels = format_labels({**labels, "le": "+Inf"})
+                lines.append(f"{name}_bucket{inf_labels} {histogram['count']}")
+                lines.append(
+                    f"{name}_sum{format_labels(labels)} "
+                    f"{format_value(float(histogram['sum']))}"
+                )
+                lines.append(
+                    f"{name}_count{format_labels(labels)} {histogram['count']}"
+                )
+
+        for name, series in sorted(merged["counters"].items()):
+            add_header(name, "counter")
+            for key, value in sorted(series.items()):
+                lines.append(
+                    f"{name}{format_labels(json.loads(key))} {format_value(value)}"
+                )
+
+        if merged["cache"]:
+            add_header(CACHE_REQUESTS_TOTAL, "counter")
+            for prefix, counters in sorted(merged["cache"].items()):
+                for result, count in (
+                    ("hit", counters["hits"]),
+                    ("miss", counters["misses"]),
+                ):
+                    labels = format_labels({"prefix": prefix, "result": result})
+                    lines.append(f"{CACHE_REQUESTS_TOTAL}{labels} {count}")
+
+            add_header(CACHE_HIT_RATIO, "gauge")
+            for prefix, counters in sorted(merged["cache"].items()):
+                lookups = counters["hits"] + counters["misses"]
+                ratio = counters["hits"] / lookups if lookups else 0.0
+                lines.append(
+                    f"{CACHE_HIT_RATIO}{format_labels({'prefix': prefix})} "
+                    f"{format_value(ratio)}"
+                )
+
+        for name, values in sorted(merged["gauges"].items()):
+            add_header(name, "gauge")
+            for pid, value in sorted(values.items()):
+                lines.append(f"{name}{format_labels({'pid': pid})} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def collect(self) -> str:
+        """
+        Returns the metrics of all the workers in the exposition format.
+        """
+
+        own = self.flush()
+        return self.render(self.merge(self.read_snapshots(own)))
+
+
+metrics_registry = MetricsRegistry()
@@ -1,6 +1,18 @@
+import os
+import json
+import tempfile
+from time import time
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from utils import settings
 from utils.functions import get_uuid
 from auth_user.constants import RoleEnum
 
+from monitor.constants import METRICS_DEAD_WORKER_TTL
+from monitor.metrics import MetricsRegistry, REQUESTS_TOTAL, WORKER_RSS
+
 from test_utils.base_super_admin import TestCaseBase
 
 
@@ -55,3 +67,87 @@ class MonitorTestCase(TestCaseBase):
         self.assertIn("available", memory_data)
 
         return True
+
+    def test_metrics(self):
+        """
+        Test the metrics endpoint returns the series in the text exposition format.
+        """
+        self.client.get(self.path)
+
+        response = self.client.get("/api/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+
+        content = response.content.decode()
+        self.assertIn("# TYPE ims_http_request_duration_seconds histogram", content)
+        self.assertRegex(
+            content,
+            r'ims_http_request_duration_seconds_bucket\{method="GET",'
+            r'route="api/health",tenant="[^"]+",le="\+Inf"\} [1-9]',
+        )
+        self.assertRegex(content, r'ims_http_requests_total\{status="200"\} [1-9]')
+        self.assertIn('ims_db_queries_per_request_count{route="api/health"}', content)
+        self.assertRegex(content, r'ims_cache_hit_ratio\{prefix="[^"]+"\} [0-9.]+')
+        self.assertIn("# TYPE ims_audit_log_queue_depth gauge", content)
+        self.assertIn("# TYPE ims_notification_queue_depth gauge", content)
+        self.assertRegex(
+            content, r'ims_worker_resident_memory_bytes\{pid="\d+"\} [1-9]'
+        )
+
+    def test_metrics_token(self):
+        """
+        Test the metrics endpoint requires the configured token, and is not served
+        without a configured token outside of the TEST env.
+        """
+        with patch("monitor.views.is_test", return_value=False):
+            response = self.client.get("/api/metrics")
+            self.unauthorize_401(response.json())
+
+        metrics_settings = {**settings.read("METRICS"), "TOKEN": "scrape-token"}
+        with override_settings(METRICS=metrics_settings):
+            response = self.client.get("/api/metrics")
+            self.unauthorize_401(response.json())
+
+            self.client.set_header("HTTP_AUTHORIZATION", "Bearer scrape-token")
+            response = self.client.get("/api/metrics")
+            self.assertEqual(response.status_code, 200)
+
+    def test_metrics_merged_across_workers(self):
+        """
+        Test the metrics of the other workers are merged, without the gauges of the
+        stopped ones, and the files of the workers stopped long ago are deleted.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            registry = MetricsRegistry(directory=directory, flush_interval=3600)
+            registry.observe_request("api/stock", "GET", "test", 200, 0.02, 3)
+
+            stopped = {
+                "pid": 999999999,
+                "started_at": 1,
+                "counters": {REQUESTS_TOTAL: {'{"status": "200"}': 4}},
+                "histograms": {},
+                "gauges": {WORKER_RSS: 1024},
+                "cache": {"count": {"hits": 3, "misses": 1}},
+            }
+            for name in ("999999999-1", "999999999-2"):
+                with open(
+                    os.path.join(directory, f"{name}.json"), "w", encoding="utf-8"
+                ) as worker_file:
+                    json.dump(stopped, worker_file)
+
+            expired_path = os.path.join(directory, "999999999-2.json")
+            expired_at = time() - METRICS_DEAD_WORKER_TTL - 1
+            os.utime(expired_path, (expired_at, expired_at))
+
+            content = registry.collect()
+
+            self.assertIn('ims_http_requests_total{status="200"} 5', content)
+            self.assertIn(f'{WORKER_RSS}{{pid="{os.getpid()}"}}', content)
+            self.assertNotIn('pid="999999999"', content)
+            self.assertIn(
+                'ims_cache_requests_total{prefix="count",result="hit"}', content
+            )
+            self.assertFalse(os.path.exists(expired_path))
@@ -15,4 +15,9 @@ urlpatterns = [
         views.MonitorView.as_view(),
         name="monitor",
     ),
+    path(
+        add_to_tenant_aware_excluded_path_list("metrics"),
+        views.MetricsView.as_view(),
+        name="metrics",
+    ),
 ]
@@ -1,20 +1,31 @@
 """
-This file contains the monitoring API which will return the CPU, RAM, DISK information.
+This file contains the monitoring API which will return the CPU, RAM, DISK information,
+and the metrics API scraped by Prometheus.
 """
 
+import hmac
+
 import psutil
 
+from django.http import HttpResponse
 from rest_framework.views import APIView
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema
 
 from auth_user.constants import MethodEnum
 
+from utils import settings
+from utils.functions import is_test
 from utils.response import generate_response
 
 from authentication.permission import register_permission
 from authentication.auth import get_authentication_classes
 
+from authentication.exception import UnauthorizedException
+
 from monitor import swagger
+from monitor.metrics import metrics_registry
+from monitor.constants import METRICS_CONTENT_TYPE
 
 MODULE = "Monitor"
 
@@ -118,3 +129,46 @@ class MonitorView(APIView):
         }
 
         return generate_response(data=data)
+
+
+class MetricsView(APIView):
+    __doc__ = """
+        This is the metrics API scraped by Prometheus, in the text exposition format.
+        get: this fun will return the metrics of all the workers.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    @staticmethod
+    def check_token(request):
+        """
+        The scrape must send the metrics token as a Bearer token. Without a configured
+        token the metrics (which carry the tenant codes) are not served, except in the
+        TEST env.
+        """
+
+        token = settings.read("METRICS")["TOKEN"]
+        if not token:
+            if is_test():
+                return
+            raise UnauthorizedException()
+
+        auth_header = request.headers.get("Authorization") or ""
+        if not hmac.compare_digest(auth_header.encode(), f"Bearer {token}".encode()):
+            raise UnauthorizedException()
+
+    @extend_schema(
+        responses={(200, METRICS_CONTENT_TYPE): OpenApiTypes.STR},
+        tags=[MODULE],
+    )
+    def get(self, request):
+        """
+        This API will return the request, database, cache, queue and memory metrics.
+        """
+
+        self.check_token(request)
+
+        return HttpResponse(
+            metrics_registry.collect(), content_type=METRICS_CONTENT_TYPE
+        )
@@ -9,3 +9,10 @@ class NotificationTypeEnum(TextChoices):
     STOCK_IN = "STOCK_IN", "Stock In"
     STOCK_OUT = "STOCK_OUT", "Stock Out"
     STOCK_NOT_AVAILABLE = "STOCK_NOT_AVAILABLE", "Stock Not Available"
+
+
+# Maximum number of user notifications written with one bulk insert
+NOTIFICATION_BATCH_SIZE: int = 500
+
+# Number of background threads sending the notifications
+NOTIFICATION_WORKERS: int = 2
@@ -22,6 +22,7 @@ class UserNotificationManager(manager.Manager[UserNotification]):
     """
 
     model = UserNotification
+    related = ["notification"]
 
 
 notification_manager = NotificationManager()
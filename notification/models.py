@@ -39,18 +39,14 @@ class Notification(BaseModel, models.Model):
     class Meta:
         db_table = "notifications"
 
-    def to_dict(self):
-        """
-        Convert the Notification instance to a dictionary.
-        """
-        return {
-            "title": self.title,
-            "message": self.message,
-            "created_by": self.created_by,
-            "notification_id": self.notification_id,
-            "notification_type": self.notification_type,
-            "notification_data": self.notification_data,
-        }
+    dict_fields = (
+        "title",
+        "message",
+        "created_by",
+        "notification_id",
+        "notification_type",
+        "notification_data",
+    )
 
 
 class UserNotification(BaseModel, models.Model):
@@ -69,15 +65,10 @@ class UserNotification(BaseModel, models.Model):
     class Meta:
         db_table = "user_notifications"
 
-    def to_dict(self):
-        """
-        Convert the UserNotification instance to a dictionary.
-        """
-
-        return {
-            "user_id": self.user_id,
-            "is_read": self.is_read,
-            "notification_id": self.notification_id,
-            "created_dtm": self.created_dtm,
-            "created_by": self.created_by,
-        }
+    dict_fields = (
+        "user_id",
+        "is_read",
+        "notification_id",
+        "created_dtm",
+        "created_by",
+    )
@@ -65,6 +65,32 @@ class NotificationTestCase(TestCaseBase):
 
         return response_data["data"]["list"]
 
+    def test_notification_list_queries_do_not_grow_with_rows(self):
+        """Test that listing the notifications runs the same queries for more rows."""
+        from auth_user.db_access import user_manager
+        from notification.constants import NotificationTypeEnum
+        from notification.utils.helpers import SendNotification
+        from tenant.utils.helpers import set_tenant_details_to_request_thread
+
+        self.create_notification_by_creating_stock()
+        response = self.assert_num_queries(3, self.path)
+        notifications = response.json()["data"]["list"]
+        sent_by = notifications[0]["sent_by"]["user_id"]
+
+        set_tenant_details_to_request_thread(self.setup_tenant())
+        for _ in range(3):
+            SendNotification(
+                title="Title",
+                message="Message",
+                created_by=sent_by,
+                notification_type=NotificationTypeEnum.STOCK_IN,
+            ).send(user_manager.list(query={}, only=["user_id"]))
+
+        response = self.assert_num_queries(3, self.path)
+        self.assertEqual(
+            len(response.json()["data"]["list"]), len(notifications) + 3
+        )
+
     def test_not_found_notification(self):
         """Test case to check the response when no notifications are found."""
 
@@ -156,3 +182,66 @@ class NotificationTestCase(TestCaseBase):
         self.data_not_found_404(response_data)
 
         return True
+
+    def test_send_notification_bulk_fan_out(self):
+        """Test that the user notifications are written with one insert per batch."""
+        from auth_user.db_access import user_manager
+        from notification.models import UserNotification
+        from notification.constants import NotificationTypeEnum
+        from notification.utils.helpers import SendNotification
+        from tenant.utils.helpers import set_tenant_details_to_request_thread
+
+        set_tenant_details_to_request_thread(self.setup_tenant())
+        recipients = list(user_manager.list(query={}, only=["user_id"])) * 5
+
+        with self.assertNumQueries(4):
+            notification = SendNotification(
+                title="Title",
+                message="Message",
+                created_by=None,
+                notification_type=NotificationTypeEnum.STOCK_IN,
+            ).send(recipients, batch_size=2)
+
+        self.assertEqual(
+            UserNotification.objects.filter(notification=notification).count(),
+            len(recipients),
+        )
+
+    def test_dispatch_runs_after_commit_in_background(self):
+        """Test that a dispatched job runs on a worker thread after the commit."""
+        import threading
+
+        from notification.utils.dispatcher import NotificationDispatcher
+        from tenant.utils.helpers import (
+            set_tenant_details_to_request_thread,
+            get_tenant_details_from_request_thread,
+        )
+
+        tenant = self.setup_tenant()
+        set_tenant_details_to_request_thread(tenant)
+
+        calls = []
+
+        def job(value):
+            calls.append(
+                (
+                    value,
+                    threading.current_thread().name,
+                    get_tenant_details_from_request_thread()["tenant_id"],
+                )
+            )
+
+        dispatcher = NotificationDispatcher(sync=False)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            dispatcher.dispatch(job, "sent")
+        self.assertEqual(calls, [])
+
+        for callback in callbacks:
+            callback()
+        dispatcher.wait(timeout=5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][0], "sent")
+        self.assertTrue(calls[0][1].startswith("notification"))
+        self.assertEqual(calls[0][2], tenant.tenant_id)
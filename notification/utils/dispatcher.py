@@ -0,0 +1,125 @@
+"""
+Background dispatch of the notification fan-out, after the transaction commits.
+"""
+
+import os
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import transaction, close_old_connections
+
+from utils.functions import is_test
+from utils.logger import log_msg, logging
+
+from tenant.utils.helpers import (
+    is_request_tenant_aware,
+    set_request_tenant_aware,
+    set_tenant_details_to_request_thread,
+    get_tenant_details_from_request_thread,
+)
+
+from notification.constants import NOTIFICATION_WORKERS
+
+
+class NotificationDispatcher:
+    """
+    Runs the notification jobs on a pool of background threads once the current
+    transaction of the database alias commits, a rolled back transaction sends
+    nothing. The tenant of the calling thread is restored in the worker.
+
+    In sync mode (the default in the TEST env) every job runs at once in the
+    calling thread.
+    """
+
+    def __init__(self, sync: bool = None, workers: int = NOTIFICATION_WORKERS):
+        self.sync = sync
+        self.workers = workers
+
+        self._pid = None
+        self._executor = None
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    @property
+    def is_sync(self) -> bool:
+        return is_test() if self.sync is None else self.sync
+
+    def dispatch(self, job, *args, using: str = None):
+        """
+        Schedules job(*args) to run in the background after the commit.
+        """
+
+        if self.is_sync:
+            return job(*args)
+
+        tenant_obj = get_tenant_details_from_request_thread(
+            raise_err=False, g_t_obj=True
+        )["tenant_obj"]
+        tenant_aware = is_request_tenant_aware()
+
+        transaction.on_commit(
+            lambda: self._submit(job, args, tenant_obj, tenant_aware), using=using
+        )
+        return None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Creates the pool, again in a forked worker since threads do not survive
+        the fork.
+        """
+
+        with self._lock:
+            if self._pid != os.getpid() or self._executor is None:
+                self._pid = os.getpid()
+                self._futures = set()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="notification"
+                )
+            return self._executor
+
+    def _submit(self, job, args, tenant_obj, tenant_aware):
+        future = self._get_executor().submit(
+            self._run, job, args, tenant_obj, tenant_aware
+        )
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return future
+
+    @staticmethod
+    def _run(job, args, tenant_obj, tenant_aware):
+        close_old_connections()
+        set_request_tenant_aware(tenant_aware)
+        set_tenant_details_to_request_thread(tenant_obj)
+        try:
+            return job(*args)
+        except Exception as err:  # pylint: disable=broad-except
+            log_msg(logging.ERROR, "Notification dispatch failed", str(err))
+            return None
+        finally:
+            set_tenant_details_to_request_thread(None)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of the submitted jobs of this process not finished yet.
+        """
+
+        if self._pid != os.getpid():
+            return 0
+        return len(self._futures)
+
+    def wait(self, timeout: float = None):
+        """
+        Waits for the submitted jobs of this process to finish.
+        """
+
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.exception(timeout=timeout)
+
+
+notification_dispatcher = NotificationDispatcher()
+atexit.register(notification_dispatcher.wait)
@@ -1,5 +1,7 @@
 from utils.constants import SeverityEnum
 
+from notification.constants import NOTIFICATION_BATCH_SIZE
+from notification.utils.dispatcher import notification_dispatcher
 from notification.db_access import notification_manager, user_notification_manager
 
 
@@ -41,15 +43,19 @@ class SendNotification:
             }
         )
 
-    def send(self, recipient_list):
+    def send(self, recipient_list, batch_size: int = NOTIFICATION_BATCH_SIZE):
         """
         Send the notification.
+        The user notifications are built in memory and written with one bulk insert
+        per batch of recipients.
         """
 
         notification = self.__create_notification()
+
+        batch = []
         for recipient in recipient_list:
-            user_notification_manager.create(
-                data={
+            batch.append(
+                {
                     "is_read": False,
                     "user_id": recipient.user_id,
                     "notification": notification,
@@ -57,4 +63,19 @@ class SendNotification:
                     "updated_by": self.created_by,
                 }
             )
+            if len(batch) >= batch_size:
+                user_notification_manager.create(data=batch, many=True)
+                batch = []
+
+        if batch:
+            user_notification_manager.create(data=batch, many=True)
+
         return notification
+
+    def send_on_commit(self, recipient_list, using: str = None):
+        """
+        Send the notification in the background once the current transaction
+        commits, see `NotificationDispatcher`.
+        """
+
+        return notification_dispatcher.dispatch(self.send, recipient_list, using=using)
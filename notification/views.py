@@ -40,7 +40,7 @@ from notification.serializers.swagger import (
 
 
 from notification.serializers.notification import NotificationMarkAsReadSerializer
-from notification.db_access import user_notification_manager, notification_manager
+from notification.db_access import user_notification_manager
 
 MODULE = "Notification"
 
@@ -72,22 +72,13 @@ class NotificationViewSet(UpdateView, ListView, viewsets.ViewSet):
         }
 
     def get_list(self, objects, **_):
-        user_ids = []
-        notification_ids = []
-        for obj in objects:
-            user_ids.append(obj.created_by)
-            notification_ids.append(obj.notification_id)
+        user_ids = [obj.created_by for obj in objects]
 
         user_mapping_obj = user_manager.get_objects_mapping(
             query={
                 "user_id__in": user_ids,
             }
         )
-        notification_mapping_obj = notification_manager.get_objects_mapping(
-            query={
-                "notification_id__in": notification_ids,
-            }
-        )
 
         data_list = []
         for obj in objects:
@@ -95,9 +86,7 @@ class NotificationViewSet(UpdateView, ListView, viewsets.ViewSet):
             data_dict = {}
             data_dict["created_dtm"] = obj_data["created_dtm"]
             data_dict["sent_by"] = user_mapping_obj[obj_data["created_by"]].to_dict()
-            data_dict["notification"] = notification_mapping_obj[
-                obj_data["notification_id"]
-            ].to_dict()
+            data_dict["notification"] = obj.notification.to_dict()
             data_list.append(data_dict)
 
         return data_list
@@ -24,15 +24,11 @@ class Product(BaseModel, models.Model):
     class Meta:
         db_table = "products"
 
-    def to_dict(self):
-        """
-        Convert the model instance to a dictionary.
-        """
-        return {
-            "product_id": self.product_id,
-            "sell_price": self.sell_price,
-            "category_id": self.category_id,
-            "product_code": self.product_code,
-            "product_name": self.product_name,
-            "purchase_price": self.purchase_price,
-        }
+    dict_fields = (
+        "product_id",
+        "sell_price",
+        "category_id",
+        "product_code",
+        "product_name",
+        "purchase_price",
+    )
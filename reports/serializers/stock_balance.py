@@ -0,0 +1,34 @@
+"""
+Query serializer of the stock balance report.
+"""
+
+from rest_framework import serializers
+
+from utils.messages import error
+from utils.exceptions import codes
+
+from product.db_access import product_manager
+
+
+class StockBalanceQuerySerializer(serializers.Serializer):
+    """
+    Validates the filters of the stock balance report: the day the on hand
+    quantities are computed at (as_of) and an optional product.
+    """
+
+    as_of = serializers.DateField()
+    product_id = serializers.UUIDField(required=False)
+
+    def validate_product_id(self, value):
+        """
+        Validate product_id field.
+        - The product must exist.
+        """
+
+        if not product_manager.exists(query={"product_id": value}):
+            raise serializers.ValidationError(
+                error.NO_DATA_FOUND,
+                code=codes.NO_DATA_FOUND,
+            )
+
+        return value
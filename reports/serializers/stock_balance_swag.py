@@ -0,0 +1,63 @@
+"""
+Stock Balance Report - Serializer and Swagger Example (No Pagination)
+"""
+
+from rest_framework import serializers
+from drf_spectacular.utils import OpenApiExample
+
+from utils.swagger.common_swagger_functions import get_list_success_example
+
+from reports.serializers.stock_summery_swag import ReportProductSerializer
+
+
+# ----------------------------------
+# Serializers
+# ----------------------------------
+
+
+class StockBalanceEntrySerializer(serializers.Serializer):
+    """
+    Serializer for each stock balance entry.
+    """
+
+    on_hand = serializers.IntegerField(help_text="On hand quantity at the date")
+    product = ReportProductSerializer(help_text="Product details")
+
+
+class StockBalanceResponseSerializer(serializers.Serializer):
+    """
+    Serializer for the stock balance response (without pagination).
+    """
+
+    data = StockBalanceEntrySerializer(
+        many=True, help_text="List of the on hand quantity by product"
+    )
+    errors = serializers.JSONField(allow_null=True)
+    messages = serializers.JSONField(allow_null=True)
+    status_code = serializers.IntegerField(default=200)
+    is_success = serializers.BooleanField(default=True)
+
+
+# ----------------------------------
+# Swagger Example
+# ----------------------------------
+
+stock_balance_data_example = [
+    {
+        "on_hand": 42,
+        "product": {
+            "product_id": "a4d4cd4f-6580-4a88-a157-b0eba816df60",
+            "sell_price": 2.99,
+            "category_id": "b4f792e2-d1be-4398-9fdf-5265539e1f71",
+            "product_code": "asd",
+            "product_name": "asdsad",
+            "purchase_price": 1.23,
+        },
+    }
+]
+
+stock_balance_success_example: OpenApiExample = get_list_success_example(
+    name="Report - Stock Balance by Product",
+    list_data=stock_balance_data_example,
+    pagination_data=False,
+)
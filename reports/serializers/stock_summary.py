@@ -9,6 +9,8 @@ from product.db_access import product_manager
 class StockSummaryQuerySerializer(serializers.Serializer):
 
     product_id = serializers.UUIDField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
 
     def validate_product_id(self, value):
         """
@@ -23,3 +25,31 @@ class StockSummaryQuerySerializer(serializers.Serializer):
             )
 
         return value
+
+    def validate(self, attrs):
+        """
+        Validate the date range: end_date must not be before start_date.
+        """
+
+        start_date, end_date = attrs.get("start_date"), attrs.get("end_date")
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError(
+                {"end_date": error.INVALID_DATE_RANGE},
+                code=codes.INVALID,
+            )
+
+        return attrs
+
+    def to_query(self) -> dict:
+        """
+        Returns the rollup query of the validated filters.
+        """
+
+        query = {}
+        if "product_id" in self.validated_data:
+            query["product_id"] = self.validated_data["product_id"]
+        if "start_date" in self.validated_data:
+            query["day__gte"] = self.validated_data["start_date"]
+        if "end_date" in self.validated_data:
+            query["day__lte"] = self.validated_data["end_date"]
+        return query
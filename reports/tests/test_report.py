@@ -82,3 +82,146 @@ class ProductTestCase(TestCaseBase):
         self.assertEqual(error["field"], "product_id")
 
         return True
+
+    def get_stock_balance(self, as_of, product_id):
+        response = self.client.get(
+            "/api/report/stock-balance",
+            data={"as_of": as_of.isoformat(), "product_id": product_id},
+        )
+        return response.json()
+
+    def test_get_stock_balance_as_of(self):
+        """
+        Test that the balance at a date is read from the nearest checkpoint plus
+        the movements after it
+        """
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from django.core.management import call_command, CommandError
+
+        from stock.models import Stock, StockBalanceSnapshot
+
+        stock_data = self.create_stock_data()
+        product_id = stock_data["product_id"]
+
+        today = timezone.localdate()
+        three_days_ago = timezone.now() - timedelta(days=3)
+        Stock.objects.filter(product_id=product_id, movement_type="IN").update(
+            created_dtm=three_days_ago
+        )
+
+        response_data = self.get_stock_balance(today, product_id)
+        self.success_ok_200(response_data)
+        self.assertEqual(response_data["data"][0]["on_hand"], 10)
+        self.assertEqual(response_data["data"][0]["product"]["product_id"], product_id)
+
+        with self.assertRaises(CommandError):
+            call_command("take_stock_snapshots", "--date", str(today))
+
+        call_command("take_stock_snapshots", "--date", str(today - timedelta(days=2)))
+        snapshot = StockBalanceSnapshot.objects.get(product_id=product_id)
+        self.assertEqual(snapshot.on_hand, 20)
+
+        # The checkpoint is used instead of the movements before it
+        StockBalanceSnapshot.objects.filter(product_id=product_id).update(on_hand=25)
+        self.assertEqual(
+            self.get_stock_balance(today, product_id)["data"][0]["on_hand"], 15
+        )
+        self.assertEqual(
+            self.get_stock_balance(today - timedelta(days=1), product_id)["data"][0][
+                "on_hand"
+            ],
+            25,
+        )
+
+        # Deleting a movement older than the checkpoint updates the checkpoint
+        in_stock = Stock.objects.get(product_id=product_id, movement_type="IN")
+        self.client.delete(f"/api/stock/{in_stock.stock_id}")
+        self.assertEqual(
+            self.get_stock_balance(today, product_id)["data"][0]["on_hand"], -5
+        )
+
+        response_data = self.get_stock_balance(today - timedelta(days=4), product_id)
+        self.data_not_found_404(response_data)
+
+        return True
+
+    def test_get_stock_balance_leaves_out_deleted_products(self):
+        """
+        Test that the movements of a deleted product are left out of the balance
+        """
+        from django.utils import timezone
+
+        from product.models import Product
+
+        stock_data = self.create_stock_data()
+        Product.objects.filter(product_id=stock_data["product_id"]).update(
+            is_deleted=True
+        )
+
+        response_data = self.client.get(
+            "/api/report/stock-balance",
+            data={"as_of": timezone.localdate().isoformat()},
+        ).json()
+        self.data_not_found_404(response_data)
+
+        return True
+
+    def test_get_stock_balance_requires_as_of(self):
+        response_data = self.client.get("/api/report/stock-balance").json()
+
+        self.bad_request_404(response_data)
+        self.assertEqual(response_data["errors"][0]["field"], "as_of")
+
+    def test_stock_summary_date_range(self):
+        """
+        Test that the summary reads the daily rollups of the date range, and that
+        the rollups can be rebuilt from the movements
+        """
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from django.core.management import call_command
+
+        from stock.models import StockDailyRollup
+
+        stock_data = self.create_stock_data()
+        product_id = stock_data["product_id"]
+        today = timezone.localdate()
+
+        rollups = StockDailyRollup.objects.filter(product_id=product_id)
+        self.assertEqual(
+            dict(rollups.values_list("movement_type", "total_quantity")),
+            {"IN": 20, "OUT": 10},
+        )
+
+        response_data = self.client.get(
+            self.path, data={"start_date": str(today), "end_date": str(today)}
+        ).json()
+        self.success_ok_200(response_data)
+        totals = {
+            item["movement_type"]: item["total_quantity"]
+            for item in response_data["data"]
+        }
+        self.assertEqual(totals, {"IN": 20, "OUT": 10})
+
+        response_data = self.client.get(
+            self.path, data={"end_date": str(today - timedelta(days=1))}
+        ).json()
+        self.data_not_found_404(response_data)
+
+        rollups.filter(movement_type="IN").update(total_quantity=0)
+        call_command("rebuild_stock_rollups")
+        self.assertEqual(rollups.get(movement_type="IN").total_quantity, 20)
+
+        self.client.delete(f"/api/stock/{stock_data['stock_id']}")
+        self.assertEqual(rollups.get(movement_type="OUT").total_quantity, 0)
+
+    def test_stock_summary_invalid_date_range(self):
+        response_data = self.client.get(
+            self.path, data={"start_date": "2024-02-01", "end_date": "2024-01-01"}
+        ).json()
+
+        self.bad_request_404(response_data)
+        self.assertEqual(response_data["errors"][0]["field"], "end_date")
@@ -8,4 +8,9 @@ urlpatterns = [
         ReportViewSet.as_view({"get": "get_stock_summary"}),
         name="stock-summary",
     ),
+    path(
+        "report/stock-balance",
+        ReportViewSet.as_view({"get": "get_stock_balance"}),
+        name="stock-balance",
+    ),
 ]
@@ -17,10 +17,15 @@ from utils.swagger.response import (
 )
 
 
-from stock.db_access import stock_manager
+from stock.db_access import stock_daily_rollup_manager, stock_balance_snapshot_manager
 from product.db_access import product_manager
 
 from reports.serializers.stock_summary import StockSummaryQuerySerializer
+from reports.serializers.stock_balance import StockBalanceQuerySerializer
+from reports.serializers.stock_balance_swag import (
+    StockBalanceResponseSerializer,
+    stock_balance_success_example,
+)
 from reports.serializers.stock_summery_swag import (
     ReportListResponseSerializer,
     report_list_success_example,
@@ -37,6 +42,7 @@ class ReportViewSet(viewsets.ViewSet):
     get_authenticators = get_authentication_classes
 
     @extend_schema(
+        parameters=[StockSummaryQuerySerializer(partial=True)],
         responses={
             200: ReportListResponseSerializer,
             **responses_404,
@@ -56,7 +62,9 @@ class ReportViewSet(viewsets.ViewSet):
     )
     def get_stock_summary(self, request):
         """
-        Endpoint to get stock summary.
+        Endpoint to get stock summary, the total quantity by product and movement
+        type read from the daily rollups (optionally between start_date and
+        end_date).
         """
 
         stock_summary_filter = StockSummaryQuerySerializer(
@@ -66,27 +74,90 @@ class ReportViewSet(viewsets.ViewSet):
         if not stock_summary_filter.is_valid():
             raise ValidationError(stock_summary_filter.errors)
 
-        stock_summary = stock_manager.get_stock_summary(
-            query=stock_summary_filter.validated_data
+        stock_summary = stock_daily_rollup_manager.get_stock_summary(
+            query=stock_summary_filter.to_query()
         )
 
-        product_id_list = []
+        data_list = []
         for obj in stock_summary:
-            product_id_list.append(obj["product_id"])
+            data_list.append(
+                {
+                    "movement_type": obj["movement_type"],
+                    "total_quantity": obj["total_quantity"],
+                    "product": {
+                        "product_id": obj["product_id"],
+                        "sell_price": obj["sell_price"],
+                        "category_id": obj["category_id"],
+                        "product_code": obj["product_code"],
+                        "product_name": obj["product_name"],
+                        "purchase_price": obj["purchase_price"],
+                    },
+                }
+            )
+
+        if not data_list:
+            raise NoDataFoundError()
+
+        return generate_response(data=data_list)
+
+    @extend_schema(
+        parameters=[StockBalanceQuerySerializer],
+        responses={
+            200: StockBalanceResponseSerializer,
+            **responses_404,
+            **responses_401,
+        },
+        examples=[
+            stock_balance_success_example,
+            responses_404_example,
+            responses_401_example,
+        ],
+        tags=[MODULE],
+    )
+    @register_permission(
+        f"{MODULE} Stock Balance",
+        MethodEnum.GET,
+        "Get Stock Balance",
+    )
+    def get_stock_balance(self, request):
+        """
+        Endpoint to get the on hand quantity of the products at the end of a day
+        (as_of).
+        """
+
+        stock_balance_filter = StockBalanceQuerySerializer(
+            data=request.query_params.dict() or {}
+        )
+
+        if not stock_balance_filter.is_valid():
+            raise ValidationError(stock_balance_filter.errors)
+
+        on_hand = stock_balance_snapshot_manager.get_on_hand_as_of(
+            day=stock_balance_filter.validated_data["as_of"],
+            product_id=stock_balance_filter.validated_data.get("product_id"),
+        )
+
+        if not on_hand:
+            raise NoDataFoundError()
 
         product_obj_mapping = product_manager.get_objects_mapping(
             query={
-                "product_id__in": product_id_list,
+                "product_id__in": list(on_hand),
             }
         )
 
         data_list = []
-        for obj in stock_summary:
-            data_dict = {}
-            data_dict["movement_type"] = obj["movement_type"]
-            data_dict["total_quantity"] = obj["total_quantity"]
-            data_dict["product"] = product_obj_mapping[obj["product_id"]].to_dict()
-            data_list.append(data_dict)
+        for product_id, quantity in on_hand.items():
+            # Deleted products keep their movements and snapshots, leave them out
+            if product_id not in product_obj_mapping:
+                continue
+
+            data_list.append(
+                {
+                    "on_hand": quantity,
+                    "product": product_obj_mapping[product_id].to_dict(),
+                }
+            )
 
         if not data_list:
             raise NoDataFoundError()
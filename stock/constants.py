@@ -8,3 +8,12 @@ class StockMovementEnum(TextChoices):
 
     IN = "IN", "In"
     OUT = "OUT", "Out"
+
+
+# Attempts of the optimistic (version compare-and-swap) update of a stock balance
+STOCK_BALANCE_MAX_RETRIES: int = 5
+
+# Attempts of a stock posting transaction failing on a database lock, and the base
+# delay (seconds) of the exponential backoff between them
+STOCK_POSTING_MAX_RETRIES: int = 5
+STOCK_POSTING_RETRY_DELAY: float = 0.02
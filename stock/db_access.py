@@ -5,9 +5,17 @@ the Stock model.
 It provides methods for creating, updating, deleting, and retrieving Stock records.
 """
 
-from django.db.models import Sum
+import random
+from time import sleep
+from datetime import datetime, timedelta, time as dt_time
+
+from rest_framework.exceptions import ErrorDetail
+from django.db import transaction, IntegrityError, OperationalError
 from django.dispatch import receiver
 from django.db.models.signals import post_save
+from django.utils import timezone
+from django.db.models.functions import TruncDate
+from django.db.models import Sum, Max, Case, When, F, OuterRef, Subquery
 
 from base.db_access import manager
 from notification.constants import NotificationTypeEnum
@@ -18,8 +26,32 @@ from auth_user.db_access import user_manager
 
 from utils.messages import notifications
 
-from stock.models import Stock
-from stock.constants import StockMovementEnum
+from utils.messages import error
+from utils.exceptions import codes
+from utils.functions import get_current_datetime
+from utils.exceptions.exceptions import BadRequestError, ValidationError
+
+from stock.models import Stock, StockBalance, StockBalanceSnapshot, StockDailyRollup
+from stock.constants import (
+    StockMovementEnum,
+    STOCK_BALANCE_MAX_RETRIES,
+    STOCK_POSTING_MAX_RETRIES,
+    STOCK_POSTING_RETRY_DELAY,
+)
+
+
+def signed_quantity(movement_type, quantity):
+    """
+    Returns the quantity of a movement with its sign, negative for OUT movements.
+    """
+    return -quantity if movement_type == StockMovementEnum.OUT else quantity
+
+
+# Quantity of a movement row with its sign, to be summed in queries
+SIGNED_QUANTITY = Case(
+    When(movement_type=StockMovementEnum.OUT, then=-F("quantity")),
+    default=F("quantity"),
+)
 
 
 class StockManager(manager.Manager[Stock]):
@@ -29,6 +61,68 @@ class StockManager(manager.Manager[Stock]):
 
     model = Stock
 
+    def create(self, data, many=False, using=None):
+        """
+        Posts the stock movement(s): creates them and applies them to the stock
+        balances in the same transaction. OUT movements take their quantity with a
+        compare-and-swap on the balance version, the whole posting is rolled back if
+        the quantity is not available.
+
+        A posting failing on a database lock (concurrent postings) is retried from
+        the start with an exponential backoff, up to STOCK_POSTING_MAX_RETRIES times.
+        """
+
+        using = using or self.using
+        for attempt in range(STOCK_POSTING_MAX_RETRIES):
+            try:
+                with transaction.atomic(using=using):
+                    objs = super().create(data, many=many, using=using)
+                    stocks = objs if many else [objs]
+                    stock_balance_manager.apply_movements(stocks, using)
+                    stock_daily_rollup_manager.apply_movements(stocks, using)
+                return objs
+            except OperationalError:
+                if attempt == STOCK_POSTING_MAX_RETRIES - 1:
+                    raise
+                sleep(STOCK_POSTING_RETRY_DELAY * 2**attempt * random.uniform(0.5, 1.5))
+
+        return None
+
+    def delete(
+        self, query=None, data=None, soft_delete=True, force_delete=False, using=None
+    ):
+        """
+        Deletes the stock movement(s) and reverts them from the stock balances in
+        the same transaction.
+        """
+
+        using = using or self.using
+        with transaction.atomic(using=using):
+            stocks = list(
+                self._parse_query(query=dict(query or {}), using=using)
+                .select_for_update()
+                .only(
+                    "stock_id",
+                    "tenant_id",
+                    "product_id",
+                    "quantity",
+                    "created_dtm",
+                    "movement_type",
+                )
+            )
+            rows = super().delete(
+                query=query,
+                data=data,
+                soft_delete=soft_delete,
+                force_delete=force_delete,
+                using=using,
+            )
+            stock_balance_manager.apply_movements(stocks, using, revert=True)
+            stock_balance_snapshot_manager.revert_movements(stocks, using)
+            stock_daily_rollup_manager.apply_movements(stocks, using, revert=True)
+
+        return rows
+
     @staticmethod
     @receiver(post_save, sender=Stock)
     def send_notification_on_stock_movement(sender, instance: Stock, created, **__):
@@ -56,27 +150,403 @@ class StockManager(manager.Manager[Stock]):
                     notification_data={
                         "stock_id": instance.stock_id,
                     },
-                ).send(
+                ).send_on_commit(
                     recipient_list=user_manager.list(
                         query={
                             "role_id": RoleEnum.COMPANY_ADMIN,
                         },
+                        only=["user_id"],
+                    ),
+                    using=instance._state.db,
+                )
+
+        return True
+
+    def get_quantity_deltas(self, query) -> dict:
+        """
+        Returns the signed quantity of the movements matching the query, summed
+        per product.
+        """
+
+        rows = (
+            self._parse_query(query)
+            .values("product_id")
+            .annotate(delta=Sum(SIGNED_QUANTITY))
+            .order_by()
+        )
+        return {row["product_id"]: row["delta"] for row in rows}
+
+
+class StockBalanceManager(manager.Manager[StockBalance]):
+    """
+    Manager class for the StockBalance model.
+    """
+
+    model = StockBalance
+    check_is_deleted: bool = False
+
+    def get_on_hand(self, product_id, using=None) -> int:
+        """
+        Returns the on hand quantity of the product with one indexed read.
+        """
+
+        on_hand = (
+            self._parse_query({"product_id": product_id}, using=using)
+            .values_list("on_hand", flat=True)
+            .first()
+        )
+        return on_hand or 0
+
+    def apply_movements(self, stocks: list[Stock], using, revert=False):
+        """
+        Adds the movements to the balance of their products with F() increments,
+        to be called in the transaction writing the movements.
+
+        Args:
+            stocks: The created (or deleted, with revert=True) movements.
+            using: The database alias of the movements.
+            revert: Subtract the movements instead of adding them.
+        """
+
+        deltas, last_movements, tenants = {}, {}, {}
+        for stock in stocks:
+            delta = signed_quantity(stock.movement_type, stock.quantity)
+            deltas[stock.product_id] = deltas.get(stock.product_id, 0) + (
+                -delta if revert else delta
+            )
+            last_movements[stock.product_id] = stock.stock_id
+            tenants[stock.product_id] = stock.tenant_id
+
+        for product_id, delta in deltas.items():
+            changes = {
+                "on_hand": F("on_hand") + delta,
+                "version": F("version") + 1,
+                "updated_dtm": get_current_datetime(),
+            }
+            if not revert:
+                changes["last_movement_id"] = last_movements[product_id]
+
+            objects = self.model.objects.using(using).filter(product_id=product_id)
+            if delta < 0 and not revert:
+                self.__take(objects, delta, changes)
+                continue
+
+            if objects.update(**changes):
+                continue
+
+            try:
+                with transaction.atomic(using=using):
+                    self.model.objects.using(using).create(
+                        product_id=product_id,
+                        tenant_id=tenants[product_id],
+                        on_hand=delta,
+                        version=1,
+                        last_movement_id=None if revert else last_movements[product_id],
+                    )
+            except IntegrityError:
+                # Created by a concurrent movement since the update
+                objects.update(**changes)
+
+        self.on_write()
+        return True
+
+    def __take(self, objects, delta, changes):
+        """
+        Takes quantity out of a balance with an optimistic compare-and-swap on its
+        version, so concurrent OUT movements can never make it negative.
+
+        Raises:
+            ValidationError: If the quantity is not available.
+            BadRequestError: If the balance kept changing for all the attempts.
+        """
+
+        for _ in range(STOCK_BALANCE_MAX_RETRIES):
+            balance = objects.values_list("on_hand", "version").first()
+            if balance is None or balance[0] + delta < 0:
+                raise ValidationError(
+                    {
+                        "quantity": [
+                            ErrorDetail(
+                                error.STOCK_QUANTITY_NOT_AVAILABLE,
+                                code=codes.NO_DATA_FOUND,
+                            )
+                        ]
+                    }
+                )
+
+            if objects.filter(version=balance[1]).update(**changes):
+                return True
+
+        raise BadRequestError(error.STOCK_BALANCE_CONFLICT, code=codes.CONFLICT)
+
+    def rebuild(self, using) -> int:
+        """
+        Recomputes all the balances of a database from the stock movements.
+        Returns the number of balances.
+        """
+
+        movements = Stock.objects.using(using).filter(is_deleted=False)
+        last_movement = (
+            movements.filter(product_id=OuterRef("product_id"))
+            .order_by("-created_dtm")
+            .values("stock_id")[:1]
+        )
+        rows = (
+            movements.values("tenant_id", "product_id")
+            .annotate(
+                on_hand=Sum(SIGNED_QUANTITY),
+                last_movement_id=Subquery(last_movement),
+            )
+            .order_by()
+        )
+
+        with transaction.atomic(using=using):
+            self.model.objects.using(using).all().delete()
+            balances = self.model.objects.using(using).bulk_create(
+                [self.model(version=1, **row) for row in rows]
+            )
+
+        self.on_write()
+        return len(balances)
+
+
+class StockBalanceSnapshotManager(manager.Manager[StockBalanceSnapshot]):
+    """
+    Manager class for the StockBalanceSnapshot model.
+    """
+
+    model = StockBalanceSnapshot
+    check_is_deleted: bool = False
+
+    @staticmethod
+    def get_snapshot_dtm(day) -> datetime:
+        """
+        Returns the checkpoint time of a day, the start of the next day.
+        """
+
+        return datetime.combine(
+            day + timedelta(days=1), dt_time.min, tzinfo=timezone.get_current_timezone()
+        )
+
+    def take(self, day, using) -> int:
+        """
+        Writes the checkpoint of a day for every product of a database, from the
+        previous checkpoint and the movements since. Taking the checkpoint of a
+        day again replaces it. Returns the number of snapshots.
+        """
+
+        snapshot_dtm = self.get_snapshot_dtm(day)
+        snapshots = self.model.objects.using(using)
+        previous_dtm = snapshots.filter(snapshot_dtm__lt=snapshot_dtm).aggregate(
+            previous_dtm=Max("snapshot_dtm")
+        )["previous_dtm"]
+
+        on_hand, tenants = {}, {}
+        if previous_dtm:
+            for row in snapshots.filter(snapshot_dtm=previous_dtm).values(
+                "tenant_id", "product_id", "on_hand"
+            ):
+                on_hand[row["product_id"]] = row["on_hand"]
+                tenants[row["product_id"]] = row["tenant_id"]
+
+        movements = Stock.objects.using(using).filter(
+            is_deleted=False, created_dtm__lt=snapshot_dtm
+        )
+        if previous_dtm:
+            movements = movements.filter(created_dtm__gte=previous_dtm)
+
+        for row in (
+            movements.values("tenant_id", "product_id")
+            .annotate(delta=Sum(SIGNED_QUANTITY))
+            .order_by()
+        ):
+            product_id = row["product_id"]
+            on_hand[product_id] = on_hand.get(product_id, 0) + row["delta"]
+            tenants[product_id] = row["tenant_id"]
+
+        with transaction.atomic(using=using):
+            snapshots.filter(snapshot_dtm=snapshot_dtm).delete()
+            created = snapshots.bulk_create(
+                [
+                    self.model(
+                        product_id=product_id,
+                        tenant_id=tenants[product_id],
+                        on_hand=quantity,
+                        snapshot_dtm=snapshot_dtm,
                     )
+                    for product_id, quantity in on_hand.items()
+                ]
+            )
+
+        self.on_write()
+        return len(created)
+
+    def revert_movements(self, stocks: list[Stock], using):
+        """
+        Removes deleted movements from the checkpoints taken after them, to be
+        called in the transaction deleting the movements.
+        """
+
+        updated = 0
+        for stock in stocks:
+            updated += (
+                self.model.objects.using(using)
+                .filter(product_id=stock.product_id, snapshot_dtm__gt=stock.created_dtm)
+                .update(
+                    on_hand=F("on_hand")
+                    - signed_quantity(stock.movement_type, stock.quantity)
                 )
+            )
 
+        if updated:
+            self.on_write()
+        return updated
+
+    def get_on_hand_as_of(self, day, product_id=None) -> dict:
+        """
+        Returns the on hand quantity of the products at the end of a day: the
+        nearest checkpoint plus the movements created after it.
+
+        Args:
+            day: The day of the balance.
+            product_id: Only return the balance of this product.
+        """
+
+        snapshot_dtm = self.get_snapshot_dtm(day)
+        query = {"snapshot_dtm__lte": snapshot_dtm}
+        movement_query = {"created_dtm__lt": snapshot_dtm}
+        if product_id:
+            query["product_id"] = movement_query["product_id"] = product_id
+
+        snapshots = self._parse_query(query)
+        checkpoint_dtm = snapshots.aggregate(checkpoint_dtm=Max("snapshot_dtm"))[
+            "checkpoint_dtm"
+        ]
+
+        on_hand = {}
+        if checkpoint_dtm:
+            on_hand = dict(
+                snapshots.filter(snapshot_dtm=checkpoint_dtm).values_list(
+                    "product_id", "on_hand"
+                )
+            )
+            movement_query["created_dtm__gte"] = checkpoint_dtm
+
+        for product, delta in stock_manager.get_quantity_deltas(movement_query).items():
+            on_hand[product] = on_hand.get(product, 0) + delta
+
+        return on_hand
+
+
+class StockDailyRollupManager(manager.Manager[StockDailyRollup]):
+    """
+    Manager class for the StockDailyRollup model.
+    """
+
+    model = StockDailyRollup
+    check_is_deleted: bool = False
+
+    def apply_movements(self, stocks: list[Stock], using, revert=False):
+        """
+        Adds the movements to the rollup of their product, movement type and day
+        with F() increments, to be called in the transaction writing the movements.
+
+        Args:
+            stocks: The created (or deleted, with revert=True) movements.
+            using: The database alias of the movements.
+            revert: Subtract the movements instead of adding them.
+        """
+
+        totals = {}
+        for stock in stocks:
+            key = (
+                stock.tenant_id,
+                stock.product_id,
+                stock.movement_type,
+                timezone.localdate(stock.created_dtm),
+            )
+            quantity = -stock.quantity if revert else stock.quantity
+            totals[key] = totals.get(key, 0) + quantity
+
+        for (tenant_id, product_id, movement_type, day), quantity in totals.items():
+            changes = {
+                "total_quantity": F("total_quantity") + quantity,
+                "updated_dtm": get_current_datetime(),
+            }
+            objects = self.model.objects.using(using).filter(
+                tenant_id=tenant_id,
+                product_id=product_id,
+                movement_type=movement_type,
+                day=day,
+            )
+            if objects.update(**changes):
+                continue
+
+            try:
+                with transaction.atomic(using=using):
+                    self.model.objects.using(using).create(
+                        tenant_id=tenant_id,
+                        product_id=product_id,
+                        movement_type=movement_type,
+                        day=day,
+                        total_quantity=quantity,
+                    )
+            except IntegrityError:
+                # Created by a concurrent movement since the update
+                objects.update(**changes)
+
+        self.on_write()
         return True
 
     def get_stock_summary(self, query):
         """
         Get stock summary.
-        Returns a dictionary with the total quantity of stock.
+        Returns the total quantity by product and movement type, with the product
+        fields.
         """
 
         return (
             self._parse_query(query)
-            .values("product_id", "movement_type")
+            .values(
+                "product_id",
+                "movement_type",
+                sell_price=F("product__sell_price"),
+                category_id=F("product__category_id"),
+                product_code=F("product__product_code"),
+                product_name=F("product__product_name"),
+                purchase_price=F("product__purchase_price"),
+            )
+            .annotate(total_quantity=Sum("total_quantity"))
+            .order_by("product_id", "movement_type")
+        )
+
+    def rebuild(self, using) -> int:
+        """
+        Recomputes all the rollups of a database from the stock movements.
+        Returns the number of rollups.
+        """
+
+        rows = (
+            Stock.objects.using(using)
+            .filter(is_deleted=False)
+            .values(
+                "tenant_id", "product_id", "movement_type", day=TruncDate("created_dtm")
+            )
             .annotate(total_quantity=Sum("quantity"))
+            .order_by()
         )
 
+        with transaction.atomic(using=using):
+            self.model.objects.using(using).all().delete()
+            rollups = self.model.objects.using(using).bulk_create(
+                [self.model(**row) for row in rows]
+            )
+
+        self.on_write()
+        return len(rollups)
+
 
 stock_manager = StockManager()
+stock_balance_manager = StockBalanceManager()
+stock_balance_snapshot_manager = StockBalanceSnapshotManager()
+stock_daily_rollup_manager = StockDailyRollupManager()
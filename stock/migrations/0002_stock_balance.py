@@ -0,0 +1,76 @@
+# Generated by Django 5.0.13 on 2026-10-17 18:49
+
+import django.db.models.deletion
+import utils.functions
+from django.db import migrations, models
+
+
+def backfill_stock_balances(apps, schema_editor):
+    """
+    Computes the balance of every product from its existing stock movements.
+    """
+
+    Stock = apps.get_model('stock', 'Stock')
+    StockBalance = apps.get_model('stock', 'StockBalance')
+    using = schema_editor.connection.alias
+
+    movements = Stock.objects.using(using).filter(is_deleted=False)
+    last_movement = (
+        movements.filter(product_id=models.OuterRef('product_id'))
+        .order_by('-created_dtm')
+        .values('stock_id')[:1]
+    )
+    rows = (
+        movements.values('tenant_id', 'product_id')
+        .annotate(
+            on_hand=models.Sum(
+                models.Case(
+                    models.When(movement_type='OUT', then=-models.F('quantity')),
+                    default=models.F('quantity'),
+                )
+            ),
+            last_movement_id=models.Subquery(last_movement),
+        )
+        .order_by()
+    )
+
+    StockBalance.objects.using(using).bulk_create(
+        [StockBalance(version=1, **row) for row in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0001_initial'),
+        ('stock', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockBalance',
+            fields=[
+                ('is_active', models.BooleanField(default=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('tenant_id', models.CharField(default=None, max_length=128, null=True)),
+                ('created_by', models.CharField(default=None, max_length=128, null=True)),
+                ('updated_by', models.CharField(default=None, max_length=128, null=True)),
+                ('updated_dtm', models.DateTimeField(auto_now=True)),
+                ('created_dtm', models.DateTimeField(auto_now_add=True)),
+                ('deleted_dtm', models.DateTimeField(default=None, null=True)),
+                ('stock_balance_id', models.CharField(default=utils.functions.get_uuid, max_length=36, primary_key=True, serialize=False)),
+                ('on_hand', models.IntegerField(default=0)),
+                ('version', models.IntegerField(default=0)),
+                ('last_movement_id', models.CharField(default=None, max_length=36, null=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='product.product')),
+            ],
+            options={
+                'db_table': 'stock_balances',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stockbalance',
+            constraint=models.UniqueConstraint(fields=('product',), name='unique_stock_balance_product'),
+        ),
+        migrations.RunPython(backfill_stock_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.13 on 2026-10-17 19:00
+
+import django.db.models.deletion
+import utils.functions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0001_initial'),
+        ('stock', '0002_stock_balance'),
+        ('supplier', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockBalanceSnapshot',
+            fields=[
+                ('is_active', models.BooleanField(default=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('tenant_id', models.CharField(default=None, max_length=128, null=True)),
+                ('created_by', models.CharField(default=None, max_length=128, null=True)),
+                ('updated_by', models.CharField(default=None, max_length=128, null=True)),
+                ('updated_dtm', models.DateTimeField(auto_now=True)),
+                ('created_dtm', models.DateTimeField(auto_now_add=True)),
+                ('deleted_dtm', models.DateTimeField(default=None, null=True)),
+                ('stock_balance_snapshot_id', models.CharField(default=utils.functions.get_uuid, max_length=36, primary_key=True, serialize=False)),
+                ('on_hand', models.IntegerField(default=0)),
+                ('snapshot_dtm', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'stock_balance_snapshots',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stock',
+            index=models.Index(fields=['tenant_id', 'created_dtm'], name='stocks_tenant_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='stockbalancesnapshot',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='product.product'),
+        ),
+        migrations.AddIndex(
+            model_name='stockbalancesnapshot',
+            index=models.Index(fields=['tenant_id', 'snapshot_dtm'], name='stock_snapshots_tenant_dtm_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockbalancesnapshot',
+            constraint=models.UniqueConstraint(fields=('product', 'snapshot_dtm'), name='unique_stock_balance_snapshot_product_dtm'),
+        ),
+    ]
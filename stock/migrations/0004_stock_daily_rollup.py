@@ -0,0 +1,66 @@
+# Generated by Django 5.0.13 on 2026-10-17 19:04
+
+import django.db.models.deletion
+import utils.functions
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def backfill_stock_daily_rollups(apps, schema_editor):
+    """
+    Totals the existing stock movements by product, movement type and day.
+    """
+
+    Stock = apps.get_model('stock', 'Stock')
+    StockDailyRollup = apps.get_model('stock', 'StockDailyRollup')
+    using = schema_editor.connection.alias
+
+    rows = (
+        Stock.objects.using(using)
+        .filter(is_deleted=False)
+        .values('tenant_id', 'product_id', 'movement_type', day=TruncDate('created_dtm'))
+        .annotate(total_quantity=models.Sum('quantity'))
+        .order_by()
+    )
+
+    StockDailyRollup.objects.using(using).bulk_create(
+        [StockDailyRollup(**row) for row in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0001_initial'),
+        ('stock', '0003_stock_balance_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockDailyRollup',
+            fields=[
+                ('is_active', models.BooleanField(default=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('tenant_id', models.CharField(default=None, max_length=128, null=True)),
+                ('created_by', models.CharField(default=None, max_length=128, null=True)),
+                ('updated_by', models.CharField(default=None, max_length=128, null=True)),
+                ('updated_dtm', models.DateTimeField(auto_now=True)),
+                ('created_dtm', models.DateTimeField(auto_now_add=True)),
+                ('deleted_dtm', models.DateTimeField(default=None, null=True)),
+                ('stock_daily_rollup_id', models.CharField(default=utils.functions.get_uuid, max_length=36, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('movement_type', models.CharField(choices=[('IN', 'In'), ('OUT', 'Out')], max_length=20)),
+                ('total_quantity', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='product.product')),
+            ],
+            options={
+                'db_table': 'stock_daily_rollups',
+                'indexes': [models.Index(fields=['tenant_id', 'day'], name='stock_rollups_tenant_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='stockdailyrollup',
+            constraint=models.UniqueConstraint(fields=('tenant_id', 'product', 'movement_type', 'day'), name='unique_stock_daily_rollup'),
+        ),
+        migrations.RunPython(backfill_stock_daily_rollups, migrations.RunPython.noop),
+    ]
@@ -29,20 +29,21 @@ class Stock(BaseModel, models.Model):
 
     class Meta:
         db_table = "stocks"
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "created_dtm"], name="stocks_tenant_created_idx"
+            ),
+        ]
 
-    def to_dict(self):
-        """
-        Convert the model instance to a dictionary.
-        """
-        return {
-            "price": self.price,
-            "stock_id": self.stock_id,
-            "quantity": self.quantity,
-            "product_id": self.product_id,
-            "supplier_id": self.supplier_id,
-            "movement_type": self.movement_type,
-            "reference_number": self.reference_number,
-        }
+    dict_fields = (
+        "price",
+        "stock_id",
+        "quantity",
+        "product_id",
+        "supplier_id",
+        "movement_type",
+        "reference_number",
+    )
 
     def save(self, *args, **kwargs):
         """
@@ -51,3 +52,112 @@ class Stock(BaseModel, models.Model):
         if not self.reference_number:
             self.reference_number = create_stock_reference(self.movement_type)
         super().save(*args, **kwargs)
+
+
+class StockBalance(BaseModel, models.Model):
+    """
+    Materialized on hand quantity of a product, maintained with every stock
+    movement in the same transaction.
+    """
+
+    stock_balance_id = models.CharField(
+        primary_key=True, default=get_uuid, max_length=36
+    )
+
+    on_hand = models.IntegerField(default=0)
+    version = models.IntegerField(default=0)
+    last_movement_id = models.CharField(max_length=36, null=True, default=None)
+
+    product = models.ForeignKey("product.Product", on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "stock_balances"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product"], name="unique_stock_balance_product"
+            ),
+        ]
+
+    dict_fields = (
+        "on_hand",
+        "version",
+        "product_id",
+        "last_movement_id",
+    )
+
+
+class StockBalanceSnapshot(BaseModel, models.Model):
+    """
+    On hand quantity of a product at a point in time (checkpoint), taken
+    periodically so a past balance only needs the movements after the nearest
+    checkpoint.
+    """
+
+    stock_balance_snapshot_id = models.CharField(
+        primary_key=True, default=get_uuid, max_length=36
+    )
+
+    on_hand = models.IntegerField(default=0)
+    # Movements created before this time are included in the on hand quantity
+    snapshot_dtm = models.DateTimeField()
+
+    product = models.ForeignKey("product.Product", on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "stock_balance_snapshots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "snapshot_dtm"],
+                name="unique_stock_balance_snapshot_product_dtm",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "snapshot_dtm"],
+                name="stock_snapshots_tenant_dtm_idx",
+            ),
+        ]
+
+    dict_fields = (
+        "on_hand",
+        "product_id",
+        "snapshot_dtm",
+    )
+
+
+class StockDailyRollup(BaseModel, models.Model):
+    """
+    Total quantity of the movements of a product by movement type and day,
+    maintained with every stock movement in the same transaction.
+    """
+
+    stock_daily_rollup_id = models.CharField(
+        primary_key=True, default=get_uuid, max_length=36
+    )
+
+    day = models.DateField()
+    movement_type = models.CharField(max_length=20, choices=StockMovementEnum.choices)
+    total_quantity = models.IntegerField(default=0)
+
+    product = models.ForeignKey("product.Product", on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "stock_daily_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant_id", "product", "movement_type", "day"],
+                name="unique_stock_daily_rollup",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "day"], name="stock_rollups_tenant_day_idx"
+            ),
+        ]
+
+    dict_fields = (
+        "day",
+        "product_id",
+        "movement_type",
+        "total_quantity",
+    )
@@ -12,7 +12,7 @@ from utils.exceptions import codes
 from product.db_access import product_manager
 from supplier.db_access import supplier_manager
 
-from stock.db_access import stock_manager
+from stock.db_access import stock_balance_manager
 from stock.constants import StockMovementEnum
 
 
@@ -72,21 +72,20 @@ class StockSerializer(serializers.Serializer):
     def validate_quantity(self, value):
         """
         Validate quantity field.
-        - For create and update: quantity must be greater than sum of quantity in stock.
+        - For OUT movements: quantity must not be greater than the on hand quantity
+          of the product.
         """
 
         movement_type = self.initial_data.get("movement_type")
 
         if movement_type == StockMovementEnum.OUT:
-            quantity = self.initial_data.get("quantity")
-            total_quantity = stock_manager.sum(
-                field="quantity",
-                query={"product_id": self.initial_data.get("product_id")},
+            on_hand = stock_balance_manager.get_on_hand(
+                self.initial_data.get("product_id")
             )
 
-            if quantity > total_quantity:
+            if value > on_hand:
                 raise serializers.ValidationError(
-                    error.STOCK_QUANTITY_NOT_AVAILABLE.format(quantity=quantity),
+                    error.STOCK_QUANTITY_NOT_AVAILABLE.format(quantity=value),
                     code=codes.NO_DATA_FOUND,
                 )
 
@@ -318,3 +318,95 @@ class StockTestCase(TestCaseBase):
         self.data_not_found_404(response_data)
 
         return True
+
+    def get_on_hand(self, product_id):
+        from stock.models import StockBalance
+
+        return StockBalance.objects.get(product_id=product_id).on_hand
+
+    def test_out_quantity_counts_previous_out_movements(self):
+        """
+        Test that OUT movements are subtracted from the available quantity
+        """
+        stock_out = self.test_create_stock_out()
+
+        data = self.get_stock_data_out()
+        data["quantity"] = 15
+        data["product_id"] = stock_out["product_id"]
+
+        response_data = self.client.post(self.path, data).json()
+
+        self.bad_request_404(response_data)
+        self.assertEqual(response_data["errors"][0]["field"], "quantity")
+        self.assertEqual(self.get_on_hand(stock_out["product_id"]), 10)
+
+    def test_stock_balance_follows_movements(self):
+        """
+        Test that the stock balance is maintained on create and delete and can be
+        rebuilt from the movements
+        """
+        from django.core.management import call_command
+
+        from stock.models import StockBalance
+
+        stock_out = self.test_create_stock_out()
+        product_id = stock_out["product_id"]
+
+        balance = StockBalance.objects.get(product_id=product_id)
+        self.assertEqual(balance.on_hand, 10)
+        self.assertEqual(balance.version, 2)
+        self.assertEqual(balance.last_movement_id, stock_out["stock_id"])
+
+        self.client.delete(self.path_id.format(stock_id=stock_out["stock_id"]))
+        self.assertEqual(self.get_on_hand(product_id), 20)
+
+        StockBalance.objects.filter(product_id=product_id).update(on_hand=-5)
+        call_command("rebuild_stock_balances")
+
+        self.assertEqual(self.get_on_hand(product_id), 20)
+
+    def test_out_movement_retries_on_version_conflict(self):
+        """
+        Test that an OUT movement whose balance is updated between its read and its
+        conditional update is retried on the new balance
+        """
+        from unittest.mock import patch
+
+        from django.db.models import F
+        from django.db.models.query import QuerySet
+
+        from stock.models import Stock, StockBalance
+        from stock.db_access import stock_balance_manager
+
+        stock_in = self.test_create_stock_in()
+        product_id = stock_in["product_id"]
+        balance = StockBalance.objects.get(product_id=product_id)
+
+        first, reads = QuerySet.first, []
+
+        def read_then_update_concurrently(objects):
+            row = first(objects)
+            reads.append(row)
+            if len(reads) == 1:
+                StockBalance.objects.filter(product_id=product_id).update(
+                    on_hand=F("on_hand") + 5, version=F("version") + 1
+                )
+            return row
+
+        stock_out = Stock(
+            product_id=product_id,
+            quantity=10,
+            movement_type="OUT",
+            tenant_id=balance.tenant_id,
+        )
+        with patch.object(
+            QuerySet, "first", autospec=True, side_effect=read_then_update_concurrently
+        ):
+            stock_balance_manager.apply_movements([stock_out], using=balance._state.db)
+
+        self.assertEqual(reads, [(20, 1), (25, 2)])
+
+        balance.refresh_from_db()
+        self.assertEqual(balance.on_hand, 15)
+        self.assertEqual(balance.version, 3)
+        self.assertEqual(balance.last_movement_id, stock_out.stock_id)
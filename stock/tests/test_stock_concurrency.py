@@ -0,0 +1,150 @@
+import threading
+from time import perf_counter
+
+from django.db import connections, OperationalError
+from rest_framework import test
+
+from utils.cache import cache
+from utils.logger import log_msg, logging
+from utils.exceptions.exceptions import BadRequestError, ValidationError
+
+from tenant.utils.helpers import (
+    set_request_tenant_aware,
+    set_tenant_details_to_request_thread,
+)
+
+from stock.constants import StockMovementEnum
+
+
+class StockPostingConcurrencyTestCase(test.APITransactionTestCase):
+    """
+    Posts stock movements from several threads, each with its own database
+    connection, so the postings really compete for the same balance.
+    """
+
+    threads = 8
+    movements_per_thread = 5
+    initial_quantity = 20
+
+    def setUp(self):
+        from tenant.db_access import tenant_manager, tenant_configuration_manager
+
+        cache.clear()
+
+        set_request_tenant_aware(True)
+        self.tenant = tenant_manager.upsert(
+            data={"tenant_code": "test", "tenant_name": "Test Tenant"},
+            query={"tenant_code": "test"},
+        )
+        set_tenant_details_to_request_thread(tenant_obj=self.tenant)
+        tenant_configuration_manager.upsert(
+            data={
+                "tenant_id": self.tenant.tenant_id,
+                "database_server": "SQLITE",
+                "database_strategy": "SHARED",
+                "authentication_type": "JWT_TOKEN",
+            },
+            query={"tenant_id": self.tenant.tenant_id},
+        )
+
+        self.product = self.create_product()
+        return self
+
+    def tearDown(self):
+        set_tenant_details_to_request_thread(None)
+        return super().tearDown()
+
+    @staticmethod
+    def create_product():
+        from product.db_access import product_manager
+        from category.db_access import category_manager
+
+        category = category_manager.create(
+            data={"category_code": "CAT-1", "category_name": "Category"}
+        )
+        return product_manager.create(
+            data={
+                "product_code": "PRD-1",
+                "product_name": "Product",
+                "sell_price": 10,
+                "purchase_price": 5,
+                "category_id": category.category_id,
+            }
+        )
+
+    def post_movement(self, movement_type, quantity):
+        from stock.db_access import stock_manager
+
+        return stock_manager.create(
+            data={
+                "quantity": quantity,
+                "reference_number": "REF-1",
+                "price": 5,
+                "movement_type": movement_type,
+                "product_id": self.product.product_id,
+            }
+        )
+
+    def post_out_movements(self, results):
+        set_request_tenant_aware(True)
+        set_tenant_details_to_request_thread(tenant_obj=self.tenant)
+        try:
+            for _ in range(self.movements_per_thread):
+                try:
+                    self.post_movement(StockMovementEnum.OUT, 1)
+                    results["posted"] += 1
+                except ValidationError:
+                    results["rejected"] += 1
+                except BadRequestError:
+                    results["conflicts"] += 1
+                except OperationalError:
+                    # The in memory test database fails at once on a locked table,
+                    # the posting gave up after its retries
+                    results["failed"] += 1
+        finally:
+            connections.close_all()
+
+    def test_concurrent_out_movements_never_oversell(self):
+        """
+        Test that concurrent OUT movements never take more than the on hand
+        quantity, and report the posting throughput
+        """
+        from stock.models import Stock
+        from stock.db_access import stock_balance_manager
+
+        self.post_movement(StockMovementEnum.IN, self.initial_quantity)
+
+        results = [
+            {"posted": 0, "rejected": 0, "conflicts": 0, "failed": 0}
+            for _ in range(self.threads)
+        ]
+        threads = [
+            threading.Thread(target=self.post_out_movements, args=(result,))
+            for result in results
+        ]
+
+        started_at = perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = perf_counter() - started_at
+
+        posted = sum(result["posted"] for result in results)
+        attempted = self.threads * self.movements_per_thread
+        log_msg(
+            logging.INFO,
+            f"{attempted} concurrent OUT postings in {elapsed:.3f}s "
+            f"({attempted / elapsed:.0f}/s), {posted} posted",
+        )
+
+        on_hand = stock_balance_manager.get_on_hand(self.product.product_id)
+        out_quantity = Stock.objects.filter(
+            product_id=self.product.product_id, movement_type=StockMovementEnum.OUT
+        ).count()
+
+        self.assertGreater(posted, 0)
+        self.assertGreaterEqual(on_hand, 0)
+        self.assertEqual(out_quantity, posted)
+        self.assertEqual(on_hand, self.initial_quantity - posted)
+        self.assertEqual(sum(sum(result.values()) for result in results), attempted)
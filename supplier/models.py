@@ -19,12 +19,8 @@ class Supplier(BaseModel, models.Model):
     class Meta:
         db_table = "suppliers"
 
-    def to_dict(self):
-        """
-        Convert the model instance to a dictionary.
-        """
-        return {
-            "supplier_id": self.supplier_id,
-            "supplier_code": self.supplier_code,
-            "supplier_name": self.supplier_name,
-        }
+    dict_fields = (
+        "supplier_id",
+        "supplier_code",
+        "supplier_name",
+    )
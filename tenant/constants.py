@@ -23,3 +23,13 @@ class DatabaseServerEnum(TextChoices):
     SQLITE = "SQLITE", "Sqlite3"
     POSTGRES = "POSTGRES", "Postgres"
     # MYSQL = "MYSQL", "MySQL"
+
+
+# Seconds a tenant database route is trusted before its version is checked again
+TENANT_ROUTING_TTL: int = 60
+
+# Seconds the known tenant codes of a worker are trusted before their version is checked
+TENANT_CODES_CHECK_INTERVAL: int = 5
+
+# Seconds an unknown subdomain is remembered as not being a tenant
+TENANT_NEGATIVE_CACHE_TTL: int = 30
@@ -16,6 +16,24 @@ class TenantManager(manager.Manager[Tenant]):
     """
 
     model = Tenant
+    use_identity_map = True
+
+    def get_tenant_codes(self) -> frozenset:
+        """
+        Returns the codes of all the tenants.
+        """
+
+        return frozenset(self._parse_query({}).values_list("tenant_code", flat=True))
+
+    def on_write(self):
+        """
+        Also makes the workers reload their known tenant codes.
+        """
+
+        from tenant.utils.tenant_codes import known_tenant_codes
+
+        super().on_write()
+        known_tenant_codes.invalidate()
 
 
 class TenantConfigurationManager(manager.Manager[TenantConfiguration]):
@@ -24,6 +42,7 @@ class TenantConfigurationManager(manager.Manager[TenantConfiguration]):
     """
 
     model = TenantConfiguration
+    use_identity_map = True
 
 
 tenant_manager = TenantManager()
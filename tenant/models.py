@@ -31,15 +31,11 @@ class Tenant(BaseModel, models.Model):
 
         db_table = "tenants"
 
-    def to_dict(self):
-        """
-        Convert the model instance to a dictionary.
-        """
-        return {
-            "tenant_id": self.tenant_id,
-            "tenant_code": self.tenant_code,
-            "tenant_name": self.tenant_name,
-        }
+    dict_fields = (
+        "tenant_id",
+        "tenant_code",
+        "tenant_name",
+    )
 
 
 class TenantConfiguration(BaseModel, models.Model):
@@ -86,13 +82,9 @@ class TenantConfiguration(BaseModel, models.Model):
 
         db_table = "tenant_configurations"
 
-    def to_dict(self):
-        """
-        Convert the model instance to a dictionary.
-        """
-        return {
-            "database_config": self.database_config,
-            "database_server": self.database_server,
-            "database_strategy": self.database_strategy,
-            "authentication_type": self.authentication_type,
-        }
+    dict_fields = (
+        "database_config",
+        "database_server",
+        "database_strategy",
+        "authentication_type",
+    )
@@ -0,0 +1,53 @@
+"""
+Database router which sends the queries of tenant-aware models to the database
+of the tenant bound to the current request thread.
+"""
+
+from tenant.utils.helpers import (
+    is_request_tenant_aware,
+    get_tenant_details_from_request_thread,
+)
+
+
+class TenantDatabaseRouter:
+    """
+    Routes the tenant-aware models (migrate_to_tenant = True) to the tenant database
+    using the per-process routing table, so plain ORM calls (model.save(), related
+    object access, etc.) reach the same database as the Manager without passing `using`.
+    Returning None lets Django fall back to the default database.
+    """
+
+    def _db_for_model(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        if not getattr(model, "migrate_to_tenant", False):
+            return None
+
+        if not is_request_tenant_aware():
+            return None
+
+        tenant_obj = get_tenant_details_from_request_thread(
+            raise_err=False,
+            g_t_obj=True,
+        )["tenant_obj"]
+
+        if not tenant_obj:
+            return None
+
+        from tenant.utils.tenant_conf import get_tenant_db_name
+
+        return get_tenant_db_name(tenant_obj)
+
+    def db_for_read(self, model, **hints):
+        """
+        Returns the database of the tenant for reading the model.
+        """
+        return self._db_for_model(model, **hints)
+
+    def db_for_write(self, model, **hints):
+        """
+        Returns the database of the tenant for writing the model.
+        """
+        return self._db_for_model(model, **hints)
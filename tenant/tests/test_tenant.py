@@ -361,3 +361,44 @@ class TenantTestCase(TestCaseBase):
         self.data_not_found_404(response_data)
 
         return True
+
+    def get_subdomain_tenant(self, sub_domain):
+        """Resolve the tenant of a subdomain through the middleware."""
+        from django.test import RequestFactory
+
+        from middleware.sub_dm import AttachSubdomainToRequestMiddleware
+
+        request = RequestFactory().get("/", HTTP_HOST=f"{sub_domain}.testserver")
+        return AttachSubdomainToRequestMiddleware(None).get_tenant_details(request)
+
+    def test_unknown_subdomain_rejected_without_query(self):
+        """Test unknown subdomains are rejected from the known tenant codes."""
+        self.test_tenant_create()
+
+        self.assertEqual(self.get_subdomain_tenant("test").tenant_code, "test")
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.get_subdomain_tenant("bogus"))
+            self.assertEqual(self.get_subdomain_tenant("test").tenant_code, "test")
+
+    def test_missing_tenant_is_negative_cached(self):
+        """Test a known code without tenant is only looked up once."""
+        from tenant.models import Tenant
+
+        self.test_tenant_create()
+        self.get_subdomain_tenant("bogus")
+
+        Tenant.objects.filter(tenant_code="test").delete()
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(self.get_subdomain_tenant("test"))
+            self.assertIsNone(self.get_subdomain_tenant("test"))
+
+    def test_deleted_tenant_subdomain_rejected(self):
+        """Test a deleted tenant is no longer resolved from its subdomain."""
+        tenant = self.test_tenant_create()
+        self.assertIsNotNone(self.get_subdomain_tenant("test"))
+
+        self.client.delete(self.path_id.format(tenant_id=tenant["tenant_id"]))
+
+        self.assertIsNone(self.get_subdomain_tenant("test"))
@@ -59,6 +59,27 @@ class TenantConfigurationTestCase(TestCaseBase):
 
         return {**response_data["data"], "tenant": tenant}
 
+    def test_tenant_db_route_is_cached_and_invalidated(self):
+        """Test the tenant database route is served without queries until the config changes."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from tenant.utils.tenant_conf import get_tenant_db_name, tenant_routing_table
+
+        tenant_config = self.test_create_tenant_configuration()
+        tenant_id = tenant_config["tenant"]["tenant_id"]
+
+        self.assertEqual(get_tenant_db_name(tenant_id), "default")
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(get_tenant_db_name(tenant_id), "default")
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        self.test_create_tenant_configuration(tenant=tenant_config["tenant"])
+        self.assertIsNone(tenant_routing_table.get(tenant_id))
+
+        return True
+
     def test_create_tenant_configuration_with_auth_token(
         self, data=valid_tenant_conf_data_with_auth_token(), tenant=None
     ):
@@ -0,0 +1,85 @@
+"""
+Per-process set of the valid tenant codes, used to reject unknown subdomains
+before any cache or database lookup.
+"""
+
+import threading
+from time import monotonic
+
+from utils.functions import get_uuid
+from utils.cache import global_cache
+
+from tenant.constants import TENANT_CODES_CHECK_INTERVAL
+from tenant.db_access import tenant_manager
+
+
+class KnownTenantCodes:
+    """
+    Keeps the codes of all the tenants in memory.
+
+    The codes are trusted for `interval` seconds. After that the shared version in the
+    cache is compared with the loaded one and the codes are reloaded if it changed.
+    Every write of a tenant bumps the shared version (see `invalidate`).
+    """
+
+    version_key = "tenant_codes_version"
+
+    def __init__(self, interval: int = TENANT_CODES_CHECK_INTERVAL):
+        self.interval = interval
+        self._codes = None
+        self._version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def get_version(self):
+        """
+        Returns the shared version of the tenant codes, creating it if needed.
+        """
+
+        version = global_cache.get(self.version_key)
+        if version is None:
+            version = get_uuid()
+            global_cache.set(self.version_key, version, None)
+
+        return version
+
+    def _refresh(self) -> frozenset:
+        """
+        Reloads the codes if the shared version changed since they were loaded and
+        returns them, `invalidate` may reset the attribute meanwhile.
+        """
+
+        version = self.get_version()
+        codes = self._codes
+        if codes is None or version != self._version:
+            codes = tenant_manager.get_tenant_codes()
+            with self._lock:
+                self._codes, self._version = codes, version
+
+        self._checked_at = monotonic()
+        return codes
+
+    def contains(self, tenant_code) -> bool:
+        """
+        Check if the code belongs to a tenant.
+        """
+
+        codes = self._codes
+        if codes is None or monotonic() - self._checked_at >= self.interval:
+            codes = self._refresh()
+
+        return tenant_code in codes
+
+    def invalidate(self):
+        """
+        Makes every worker reload the codes on its next check, this worker reloads
+        them on its next lookup.
+        """
+
+        global_cache.set(self.version_key, get_uuid(), None)
+        with self._lock:
+            self._codes = None
+        return True
+
+
+known_tenant_codes = KnownTenantCodes()
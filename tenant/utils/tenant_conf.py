@@ -2,11 +2,17 @@
 Check if a tenant is using a shared database configuration.
 """
 
+import threading
+from time import monotonic
+
 from utils import settings
 from utils.messages import error
+from utils.functions import get_uuid
+from utils.cache import global_cache
+from utils.logger import log_msg, logging
 from utils.exceptions.exceptions import BadRequestError
 
-from tenant.constants import DatabaseStrategyEnum
+from tenant.constants import DatabaseStrategyEnum, TENANT_ROUTING_TTL
 from tenant.utils.tenant_setup import set_database_to_global_settings
 from tenant.utils.helpers import get_tenant_details_from_request_thread
 from tenant.db_access import tenant_configuration_manager, tenant_manager
@@ -14,9 +20,95 @@ from tenant.db_access import tenant_configuration_manager, tenant_manager
 DEFAULT = "default"
 
 
+class TenantRoutingTable:
+    """
+    Per-process routing table of tenant_id -> database connection alias.
+
+    A route is trusted for `ttl` seconds. After that its version is compared with the
+    shared version in the cache, and the route is kept if the version did not change.
+    Changing the tenant configuration bumps the shared version (see `invalidate`), so
+    the other workers drop the route on their next check and this worker drops it at once.
+    """
+
+    def __init__(self, ttl: int = TENANT_ROUTING_TTL):
+        self.ttl = ttl
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _version_key(tenant_id):
+        return f"tenant_routing_version:{tenant_id}"
+
+    def get_version(self, tenant_id):
+        """
+        Returns the shared routing version of the tenant, creating it if needed.
+        """
+        key = self._version_key(tenant_id)
+
+        version = global_cache.get(key)
+        if version is None:
+            version = get_uuid()
+            global_cache.set(key, version, None)
+
+        return version
+
+    def get(self, tenant_id):
+        """
+        Returns the cached database alias of the tenant or None if it is not routed.
+        """
+
+        route = self._routes.get(tenant_id)
+        if route is None:
+            return None
+
+        alias, version, expires_at = route
+        if monotonic() < expires_at:
+            return alias
+
+        if self.get_version(tenant_id) != version:
+            self._routes.pop(tenant_id, None)
+            return None
+
+        with self._lock:
+            self._routes[tenant_id] = (alias, version, monotonic() + self.ttl)
+
+        return alias
+
+    def set(self, tenant_id, alias):
+        """
+        Stores the database alias of the tenant.
+        """
+        version = self.get_version(tenant_id)
+        with self._lock:
+            self._routes[tenant_id] = (alias, version, monotonic() + self.ttl)
+        return alias
+
+    def invalidate(self, tenant_id):
+        """
+        Drops the route of the tenant in every worker by bumping its shared version.
+        """
+        global_cache.set(self._version_key(tenant_id), get_uuid(), None)
+        with self._lock:
+            self._routes.pop(tenant_id, None)
+        return True
+
+    def clear(self):
+        """
+        Drops all the routes of this process.
+        """
+        with self._lock:
+            self._routes.clear()
+        return True
+
+
+tenant_routing_table = TenantRoutingTable()
+
+
 def get_tenant_db_name(tenant):
     """
     Retrieve the database name for a given tenant.
+    The resolved name is kept in the per-process routing table, so the tenant
+    configuration is only read on the first call or after it changed.
     This function determines the appropriate database name for a tenant based on their
     configuration and database strategy. It handles both direct tenant objects and
     tenant IDs as input.
@@ -36,13 +128,30 @@ def get_tenant_db_name(tenant):
         - For dedicated databases, it sets up the database configuration in global settings
     """
 
+    tenant_id = tenant
+    if isinstance(tenant, tenant_manager.model):
+        tenant_id = tenant.tenant_id
+
+    db_name = tenant_routing_table.get(str(tenant_id))
+    if db_name:
+        return db_name
+
+    return tenant_routing_table.set(str(tenant_id), resolve_tenant_db_name(tenant))
+
+
+def resolve_tenant_db_name(tenant):
+    """
+    Resolve the database name of the tenant from the tenant configuration.
+    See `get_tenant_db_name` for the cached version.
+    """
+
     _tenant = tenant
     if not isinstance(_tenant, tenant_manager.model):
         _tenant = get_tenant_details_from_request_thread(raise_err=False, g_t_obj=True)[
             "tenant_obj"
         ]
 
-        if not _tenant:
+        if not _tenant or str(_tenant.tenant_id) != str(tenant):
             _tenant = tenant_manager.get(
                 query={
                     "tenant_id": tenant,
@@ -68,3 +177,26 @@ def get_tenant_db_name(tenant):
         return set_database_to_global_settings(tenant_config_obj)
 
     return DEFAULT
+
+
+def get_tenant_db_names(tenant_id=None) -> list:
+    """
+    Returns the database names holding tenant data: the default database and the
+    database of every tenant, or only the database of the given tenant. Tenants
+    without a configuration are skipped.
+    """
+
+    if tenant_id:
+        return [get_tenant_db_name(tenant_id)]
+
+    db_names = {DEFAULT}
+    for tenant in tenant_manager.list(query={}):
+        try:
+            db_names.add(get_tenant_db_name(tenant))
+        except BadRequestError:
+            log_msg(
+                logging.WARNING,
+                f"Tenant {tenant.tenant_code} has no configuration, skipped.",
+            )
+
+    return sorted(db_names)
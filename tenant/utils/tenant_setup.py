@@ -95,7 +95,7 @@ def set_database_to_global_settings(tenant_config_obj):
 
     DATABASES = settings.read("DATABASES")
     if db_connection_code in DATABASES:
-        return True
+        return db_connection_code
 
     if tenant_config_obj.database_server == DatabaseServerEnum.SQLITE:
         return setup_sqlite(db_connection_code)
@@ -8,6 +8,7 @@ from drf_spectacular.utils import extend_schema
 
 from base.views.base import BaseView, RetrieveView, CreateView
 
+from utils.cache import cache
 from utils.constants import BASE_PATH
 from utils.swagger.response import (
     responses_400,
@@ -22,10 +23,14 @@ from utils.swagger.response import (
 from auth_user.constants import MethodEnum
 
 from authentication.permission import register_permission
-from authentication.auth import get_default_authentication_class
+from authentication.auth import (
+    get_default_authentication_class,
+    tenant_authenticator_table,
+)
 
 
 from tenant.utils.tenant_setup import NewTenantSetup
+from tenant.utils.tenant_conf import tenant_routing_table
 from tenant.serializers.query import TenantQuerySerializer
 from tenant.db_access import tenant_manager, tenant_configuration_manager
 from tenant.serializers.tenant import (
@@ -183,6 +188,15 @@ class TenantViewSet(BaseView, viewsets.ViewSet):
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    def post_delete(self, *_, **kwargs):
+        """
+        Invalidate every cache entry of the deleted tenant.
+        """
+
+        cache.clear_tenant(str(kwargs[self.lookup_field]))
+        tenant_routing_table.invalidate(str(kwargs[self.lookup_field]))
+        tenant_authenticator_table.invalidate(str(kwargs[self.lookup_field]))
+
 
 class TenantDetailsViewSet(RetrieveView, viewsets.ViewSet):
     """
@@ -305,4 +319,7 @@ class TenantConfigurationViewSet(CreateView, RetrieveView, viewsets.ViewSet):
         Save the tenant configuration data.
         """
 
-        return self.manager.upsert(data=data, query={"tenant_id": data["tenant_id"]})
+        obj = self.manager.upsert(data=data, query={"tenant_id": data["tenant_id"]})
+        tenant_routing_table.invalidate(str(data["tenant_id"]))
+        tenant_authenticator_table.invalidate(str(data["tenant_id"]))
+        return obj
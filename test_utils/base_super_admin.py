@@ -1,3 +1,5 @@
+from utils.cache import cache
+
 from test_utils.test_client import APITestClient
 from test_utils.comm_assert import CommonTestCaseAssertsBase
 from test_utils.auth import create_super_admin_test_token
@@ -7,6 +9,8 @@ class TestCaseBase(CommonTestCaseAssertsBase):
 
     def setUp(self, auth=True):
 
+        cache.clear()
+
         if auth:
             self.client: APITestClient = self.get_client(auth)
 
@@ -79,3 +79,19 @@ class CommonTestCaseAssertsBase(test.APITestCase):
         self.assertEqual(response_data["errors"]["message"], "Unauthorized Access.")
 
         return True
+
+    def assert_num_queries(self, num, path, method="get", data=None, warm_up=True):
+        """
+        Asserts the number of queries executed by a request to the endpoint, so an
+        N+1 regression fails the test. With `warm_up` the request is sent once
+        before, so the count does not depend on the state of the caches.
+        """
+
+        send = getattr(self.client, method)
+        if warm_up:
+            send(path, data=data)
+
+        with self.assertNumQueries(num):
+            response = send(path, data=data)
+
+        return response
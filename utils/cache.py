@@ -2,70 +2,411 @@
 Interface for caching operations with tenant awareness support.
 """
 
+import time
+import pickle
+import threading
+from collections import OrderedDict
+
 from django.core.cache import cache as d_cache
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
 
+from utils import settings
+from utils.constants import (
+    CACHE_NAMESPACE,
+    CACHE_GENERATION_KEY,
+    CACHE_NEGATIVE_VALUE,
+    L1_CACHE_TIER,
+    L2_CACHE_TIER,
+    CACHE_TIMING_PHASE,
+)
 from utils.functions import is_test
+from utils.timing import timed, get_request_timings
 from tenant.utils.helpers import get_tenant_details_from_request_thread
 
+_MISSING = object()
+
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+class LocalCache:
+    """
+    Bounded, TTL aware LRU kept in the process memory. Entries are split in one
+    LRU per key prefix so a busy prefix can not evict the entries of the others.
+
+    Mutable values are stored pickled, so every hit returns a private copy exactly
+    like the network cache does.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: dict[str, OrderedDict] = {}
+        self._conf = None
+
+    @property
+    def conf(self) -> dict:
+        """
+        The CACHE_L1 settings, read on first use.
+        """
+
+        if self._conf is None:
+            self._conf = settings.read("CACHE_L1")
+        return self._conf
+
+    def _max_size(self, prefix: str) -> int:
+        return self.conf["SIZES"].get(prefix, self.conf["DEFAULT_SIZE"])
+
+    def ttl(self, timeout) -> float:
+        """
+        Returns the L1 lifetime of an entry stored with the given backend timeout.
+        """
+
+        ttl = self.conf["TIMEOUT"]
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return ttl
+        return min(ttl, timeout)
+
+    def get(self, prefix: str, key: str):
+        """
+        Returns the value of the key or _MISSING.
+        """
+
+        with self.lock:
+            bucket = self.buckets.get(prefix)
+            entry = bucket.get(key) if bucket else None
+            if entry is None:
+                return _MISSING
+
+            expires_at, pickled, value = entry
+            if expires_at <= time.monotonic():
+                del bucket[key]
+                return _MISSING
+            bucket.move_to_end(key)
+
+        return pickle.loads(value) if pickled else value
+
+    def set(self, prefix: str, key: str, value, ttl: float):
+        """
+        Stores the value for ttl seconds, evicting the least recently used entries
+        of the prefix above its size.
+        """
+
+        max_size = self._max_size(prefix)
+        if ttl <= 0 or max_size <= 0:
+            self.delete(prefix, key)
+            return
+
+        pickled = not isinstance(value, _IMMUTABLE_TYPES)
+        if pickled:
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+        with self.lock:
+            bucket = self.buckets.setdefault(prefix, OrderedDict())
+            bucket[key] = (time.monotonic() + ttl, pickled, value)
+            bucket.move_to_end(key)
+            while len(bucket) > max_size:
+                bucket.popitem(last=False)
+
+    def delete(self, prefix: str, key: str):
+        with self.lock:
+            bucket = self.buckets.get(prefix)
+            if bucket:
+                bucket.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
 
 class CacheInterface:
     """
     This class provides a wrapper around a cache implementation with tenant-specific
     key management. When tenant awareness is enabled, cache keys are automatically
     prefixed with the tenant ID.
+
+    Every key is namespaced with a global generation and, for tenant aware keys, a
+    per tenant generation. Invalidating a namespace is a counter bump, the stale
+    entries are never read again and simply expire in the backend.
+
+    Reads are served from an in process LRU (L1) before the Django cache backend
+    (L2). The generations are re-read from the backend at most once per
+    GENERATION_CHECK_INTERVAL, so a namespace invalidated by another worker stops
+    being served from L1 within that interval. Single keys written by another
+    worker may be served stale from L1 for up to the L1 TIMEOUT.
     """
 
-    def __init__(self):
+    local = LocalCache()
+
+    # Backend generation key -> (generation, monotonic time it was read)
+    generations: dict[str, tuple[int, float]] = {}
+
+    stats = {
+        L1_CACHE_TIER: {"hits": 0, "misses": 0},
+        L2_CACHE_TIER: {"hits": 0, "misses": 0},
+    }
+
+    # Key prefix -> hits and misses of the lookups, whatever the tier
+    prefix_stats: dict[str, dict[str, int]] = {}
+
+    def __init__(self, tenant_aware=True):
         self.cache = d_cache
-        self.clear()
+        self.tenant_aware = tenant_aware
+
+    @staticmethod
+    def _generation_key(tenant_id=None):
+        """
+        Returns the backend key holding the global or the tenant generation.
+        """
+
+        if tenant_id is None:
+            return f"{CACHE_NAMESPACE}:{CACHE_GENERATION_KEY}"
+        return f"{CACHE_NAMESPACE}:{CACHE_GENERATION_KEY}:{tenant_id}"
+
+    @staticmethod
+    def _prefix(key) -> str:
+        """
+        Returns the prefix of a key, used to pick its L1 size. Keys without a
+        prefix share the default bucket.
+        """
+
+        key = str(key)
+        return key.split(":", 1)[0] if ":" in key else ""
+
+    def _remember_generation(self, gen_key, generation):
+        self.generations[gen_key] = (generation, time.monotonic())
+        return generation
+
+    def _init_generation(self, gen_key):
+        """
+        Creates a missing generation counter. The counter is seeded with the current
+        time, so a counter evicted by the backend never reuses an old generation.
+        """
+
+        self.cache.add(gen_key, time.time_ns(), None)
+        return self._remember_generation(gen_key, self.cache.get(gen_key))
+
+    def _get_generations(self, tenant_id=None):
+        """
+        Returns the global generation and the tenant generation (None when there is
+        no tenant). Generations checked within the interval are served from memory,
+        the others are read with a single round trip to the backend.
+        """
+
+        global_key = self._generation_key()
+        tenant_key = self._generation_key(tenant_id) if tenant_id else None
+        keys = [global_key, tenant_key] if tenant_key else [global_key]
+
+        interval = self.local.conf["GENERATION_CHECK_INTERVAL"]
+        now = time.monotonic()
+        values = {}
+        for key in keys:
+            generation, checked_at = self.generations.get(key, (None, 0))
+            if generation is not None and now - checked_at < interval:
+                values[key] = generation
+
+        stale_keys = [key for key in keys if key not in values]
+        if stale_keys:
+            for key, generation in self.cache.get_many(stale_keys).items():
+                values[key] = self._remember_generation(key, generation)
+            for key in stale_keys:
+                if values.get(key) is None:
+                    values[key] = self._init_generation(key)
+
+        return values[global_key], values[tenant_key] if tenant_key else None
+
+    def _bump_generation(self, gen_key):
+        """
+        Moves a namespace to a new generation.
+        """
+
+        try:
+            generation = self.cache.incr(gen_key)
+        except ValueError:
+            return self._init_generation(gen_key)
+        return self._remember_generation(gen_key, generation)
 
     def _build_key(self, key):
         """
-        Builds a cache key by prefixing it with the tenant ID if available.
+        Builds a cache key by prefixing it with the namespace generations and the
+        tenant ID if available. Keys of a non tenant aware interface are shared by
+        all the tenants.
         """
 
-        tenant_id = get_tenant_details_from_request_thread(raise_err=False)["tenant_id"]
+        tenant_id = None
+        if self.tenant_aware:
+            tenant_id = get_tenant_details_from_request_thread(raise_err=False)["tenant_id"]
+
+        global_gen, tenant_gen = self._get_generations(tenant_id)
         if not tenant_id:
-            return key
-        return f"{tenant_id}:{key}"
+            return f"{CACHE_NAMESPACE}:{global_gen}:{key}"
+        return f"{CACHE_NAMESPACE}:{global_gen}:{tenant_id}:{tenant_gen}:{key}"
 
-    def clear(self):
+    def _count(self, tier, hit):
+        self.stats[tier]["hits" if hit else "misses"] += 1
+
+    def _count_lookups(self, prefix, hits=0, misses=0):
         """
-        Clear the whole cache
+        Counts the lookups of the prefix, and adds them to the cache timing of the
+        current request.
         """
-        self.cache.clear()
 
+        counters = self.prefix_stats.get(prefix)
+        if counters is None:
+            counters = self.prefix_stats.setdefault(prefix, {"hits": 0, "misses": 0})
+        counters["hits"] += hits
+        counters["misses"] += misses
+
+        timings = get_request_timings()
+        if timings:
+            timings.count_cache_lookups(hits=hits, misses=misses)
+
+    @timed(CACHE_TIMING_PHASE)
     def get(self, key, default=None):
         """
         Retrieve a value from cache by key
         """
-        value = self.cache.get(self._build_key(key), default)
+
+        prefix = self._prefix(key)
+        built_key = self._build_key(key)
+
+        value = self.local.get(prefix, built_key)
+        self._count(L1_CACHE_TIER, value is not _MISSING)
+        if value is not _MISSING:
+            self._count_lookups(prefix, hits=1)
+            return value
+
+        value = self.cache.get(built_key, _MISSING)
+        self._count(L2_CACHE_TIER, value is not _MISSING)
+        if value is _MISSING:
+            self._count_lookups(prefix, misses=1)
+            return default
+
+        self._count_lookups(prefix, hits=1)
+
+        self.local.set(prefix, built_key, value, self.local.ttl(DEFAULT_TIMEOUT))
         return value
 
+    @timed(CACHE_TIMING_PHASE)
+    def get_many(self, keys):
+        """
+        Retrieve the values of several keys from the cache backend in one round trip,
+        keys without value are left out of the returned dict
+        """
+
+        built_keys = {self._build_key(key): key for key in keys}
+        values = self.cache.get_many(list(built_keys))
+        for built_key, key in built_keys.items():
+            hit = built_key in values
+            self._count_lookups(self._prefix(key), hits=int(hit), misses=int(not hit))
+        return {built_keys[built_key]: value for built_key, value in values.items()}
+
+    @timed(CACHE_TIMING_PHASE)
     def set(self, key, value, timeout=DEFAULT_TIMEOUT):
         """
         Store a value in cache with optional timeout
         """
-        return self.cache.set(self._build_key(key), value, timeout)
 
+        built_key = self._build_key(key)
+        self.local.set(self._prefix(key), built_key, value, self.local.ttl(timeout))
+        return self.cache.set(built_key, value, timeout)
+
+    @timed(CACHE_TIMING_PHASE)
     def delete(self, key):
         """
         Remove a value from cache by key
         """
-        return self.cache.delete(self._build_key(key))
 
+        built_key = self._build_key(key)
+        self.local.delete(self._prefix(key), built_key)
+        return self.cache.delete(built_key)
+
+    @timed(CACHE_TIMING_PHASE)
+    def incr(self, key, delta=1):
+        """
+        Atomically increment the integer value of a key, a missing key starts at 0
+        """
+
+        built_key = self._build_key(key)
+        self.local.delete(self._prefix(key), built_key)
+        try:
+            return self.cache.incr(built_key, delta)
+        except ValueError:
+            if self.cache.add(built_key, delta, None):
+                return delta
+            return self.cache.incr(built_key, delta)
+
+    @timed(CACHE_TIMING_PHASE)
     def has_key(self, key):
         """
         Check if a key exists in cache
         """
-        return self.cache.has_key(self._build_key(key))
+
+        built_key = self._build_key(key)
+        if self.local.get(self._prefix(key), built_key) is not _MISSING:
+            return True
+        return self.cache.has_key(built_key)
+
+    def set_negative(self, key, timeout):
+        """
+        Remember that the key has no data, so a miss and a known absence can be told
+        apart. Use `is_negative` on the value returned by `get`.
+        """
+
+        return self.set(key, CACHE_NEGATIVE_VALUE, timeout)
+
+    @staticmethod
+    def is_negative(value) -> bool:
+        """
+        Check if a cached value was stored with `set_negative`
+        """
+
+        return value == CACHE_NEGATIVE_VALUE
 
     def clear(self):
         """
-        Remove all entries from cache
+        Invalidate all the entries of the namespace by bumping the global generation.
+        The backend itself is not flushed.
+        """
+
+        self.local.clear()
+        return self._bump_generation(self._generation_key())
+
+    def clear_tenant(self, tenant_id=None):
         """
-        return self.cache.clear()
+        Invalidate the entries of a single tenant by bumping its generation.
+
+        Args:
+            tenant_id: Tenant to invalidate, defaults to the tenant of the request
+                thread.
+        """
+
+        if tenant_id is None:
+            tenant_id = get_tenant_details_from_request_thread(raise_err=False)["tenant_id"]
+        if not tenant_id:
+            return None
+        return self._bump_generation(self._generation_key(tenant_id))
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        Returns a copy of the hit and miss counters of each cache tier.
+        """
+
+        return {tier: dict(counters) for tier, counters in cls.stats.items()}
+
+    @classmethod
+    def get_prefix_stats(cls) -> dict:
+        """
+        Returns a copy of the hit and miss counters of each key prefix.
+        """
+
+        return {prefix: dict(counters) for prefix, counters in cls.prefix_stats.items()}
+
+    @classmethod
+    def reset_stats(cls):
+        for counters in cls.stats.values():
+            counters.update(hits=0, misses=0)
+        cls.prefix_stats.clear()
 
 
 cache = CacheInterface()
+global_cache = CacheInterface(tenant_aware=False)
@@ -32,3 +32,36 @@ class SeverityEnum(TextChoices):
     INFO = "INFO", "Info"
     WARNING = "WARNING", "Warning"
     ERROR = "ERROR", "Error"
+
+
+# Prefix of every key written through utils.cache.CacheInterface
+CACHE_NAMESPACE = "ims"
+
+# Name of the generation counters used to invalidate cache namespaces
+CACHE_GENERATION_KEY = "gen"
+
+# Tiers of utils.cache.CacheInterface, the in process LRU and the cache backend
+L1_CACHE_TIER = "l1"
+L2_CACHE_TIER = "l2"
+
+# Value cached for a key known to have no data (negative caching)
+CACHE_NEGATIVE_VALUE = "__cache_negative__"
+
+# Phases of a request sent in the Server-Timing response header, in this order
+TENANT_TIMING_PHASE = "tenant"
+AUTH_TIMING_PHASE = "auth"
+PERMISSION_TIMING_PHASE = "permission"
+AUDIT_TIMING_PHASE = "audit"
+DB_TIMING_PHASE = "db"
+CACHE_TIMING_PHASE = "cache"
+SERIALIZATION_TIMING_PHASE = "serialization"
+
+SERVER_TIMING_PHASES = (
+    TENANT_TIMING_PHASE,
+    AUTH_TIMING_PHASE,
+    PERMISSION_TIMING_PHASE,
+    AUDIT_TIMING_PHASE,
+    DB_TIMING_PHASE,
+    CACHE_TIMING_PHASE,
+    SERIALIZATION_TIMING_PHASE,
+)
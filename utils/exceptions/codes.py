@@ -5,6 +5,7 @@ in an application.
 """
 
 INVALID: str = "INVALID"
+CONFLICT: str = "CONFLICT"
 REQUIRED: str = "REQUIRED"
 BAD_REQUEST: str = "BAD_REQUEST"
 UNAUTHORIZED: str = "UNAUTHORIZED"
@@ -0,0 +1,65 @@
+"""
+Streaming export of query rows as CSV or NDJSON, the rows are encoded one at a
+time while the response is sent so the memory use does not grow with the rows.
+"""
+
+import csv
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from base.constants import ExportFormatEnum
+
+CONTENT_TYPES = {
+    ExportFormatEnum.CSV: "text/csv",
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+}
+
+
+class _Echo:
+    """
+    File like object returning what is written, for csv.writer.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, fields):
+    """
+    Yields the header line then one CSV line per row.
+    """
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+def iter_ndjson(rows):
+    """
+    Yields one JSON document line per row.
+    """
+
+    encoder = JSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def stream_export(rows, fields, export_format, filename) -> StreamingHttpResponse:
+    """
+    Returns a streaming response of the rows (dicts with the given fields).
+    """
+
+    if export_format == ExportFormatEnum.CSV:
+        content = iter_csv(rows, fields)
+    else:
+        content = iter_ndjson(rows)
+
+    response = StreamingHttpResponse(
+        content, content_type=CONTENT_TYPES[export_format]
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    return response
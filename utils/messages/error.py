@@ -8,6 +8,7 @@ BAD_REQUEST: str = "Invalid data."
 ALREADY_EXIST: str = "Already Exist."
 NO_DATA_FOUND: str = "No Data Found."
 INVALID_TENANT: str = "Invalid Tenant."
+INVALID_CURSOR: str = "Invalid pagination cursor."
 ALLOWED_ROLE: str = "Only {roles} allowed."
 WRONG_CREDENTIALS: str = "Wrong Credentials."
 PERMISSION_DENIED: str = "Permission Denied."
@@ -26,3 +27,9 @@ PRINT_FUNCTION_IS_DISABLE: str = (
     "'print' function is disabled please remove the use of it instead use the [log_msg]. "
     "Change the DISABLE_PRINT:True in the config file to False to enable the print function. "
 )
+
+STOCK_BALANCE_CONFLICT: str = "The stock balance is being updated, please try again."
+
+INVALID_DATE_RANGE: str = "The end date must be on or after the start date."
+
+INVALID_EXPORT_FORMAT: str = "Invalid export format, use one of: {formats}."
@@ -5,8 +5,22 @@ It provides methods to get the current page objects and the total number of page
 The Pagination class is initialized with the total count of items,
 the current page number, and the page size.
 The class also provides a default page size of 10 items per page.
+The CursorPagination class provides keyset pagination which seeks on a stable
+ordering key instead of using an OFFSET.
 """
 
+import json
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.core.serializers.json import DjangoJSONEncoder
+
+from utils.messages import error
+from utils.exceptions import codes
+from utils.exceptions.exceptions import BadRequestError
+
 
 class Pagination:
     __doc__ = """
@@ -15,7 +29,7 @@ class Pagination:
     It provides methods to get the current page objects and the total number of pages.
     """
 
-    def __init__(self, count: int, current_page: int, page_size: int):
+    def __init__(self, count: int | None, current_page: int, page_size: int):
         self.count = count
         self.page_size = page_size
         self.current_page = current_page
@@ -26,7 +40,7 @@ class Pagination:
         :param data: The data to be paginated.
         :return: The current page objects.
         """
-        if not self.count:
+        if self.count == 0:
             return []
 
         start_index: int = (self.current_page - 1) * self.page_size
@@ -37,7 +51,113 @@ class Pagination:
         """
         This method returns the total number of pages based on the count and page size.
         :return: The total number of pages.
+        None if the count was skipped.
         """
+        if self.count is None:
+            return None
         if not self.count:
             return 0
         return (self.count + self.page_size - 1) // self.page_size
+
+
+class CursorPagination:
+    __doc__ = """
+    This class is used to handle keyset (cursor) pagination of data.
+    The objects are ordered on a stable key (created_dtm, pk) and every page is
+    fetched with a WHERE clause seeking past the cursor instead of an OFFSET,
+    so page N costs the same as page 1 and no COUNT query is needed.
+    The cursor is an opaque url-safe string holding the position and the direction.
+    """
+
+    ordering_field = "created_dtm"
+
+    def __init__(self, page_size: int, cursor: str = None):
+        self.page_size = page_size
+        self.cursor = cursor
+        self.next_cursor = None
+        self.prev_cursor = None
+
+    @staticmethod
+    def encode_cursor(position: datetime, pk, reverse: bool = False) -> str:
+        """
+        This method encodes the position of an object into an opaque cursor.
+        :param position: The ordering field value of the object.
+        :param pk: The primary key of the object.
+        :param reverse: True if the cursor points backwards (previous page).
+        :return: The encoded cursor.
+        """
+        payload = json.dumps(
+            {"p": position.isoformat(), "k": pk, "r": reverse},
+            separators=(",", ":"),
+            cls=DjangoJSONEncoder,
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, object, bool]:
+        """
+        This method decodes the cursor into the position, primary key and direction.
+        :param cursor: The encoded cursor.
+        :return: The position, primary key and direction of the cursor.
+        """
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            return (
+                datetime.fromisoformat(payload["p"]),
+                payload["k"],
+                bool(payload["r"]),
+            )
+        except (ValueError, TypeError, KeyError) as err:
+            raise BadRequestError(error.INVALID_CURSOR, code=codes.INVALID) from err
+
+    def get_current_page_objs(self, objects: QuerySet) -> list:
+        """
+        This method returns the current page objects based on the cursor and page size.
+        It also sets the next and previous cursor of the page.
+        :param objects: The queryset to be paginated.
+        :return: The current page objects.
+        """
+        field = self.ordering_field
+
+        if not self.cursor:
+            position, pk, reverse = None, None, False
+            objects = objects.order_by(f"-{field}", "-pk")
+
+        else:
+            position, pk, reverse = self.decode_cursor(self.cursor)
+            if reverse:
+                objects = objects.filter(
+                    Q(**{f"{field}__gt": position})
+                    | Q(**{field: position, "pk__gt": pk})
+                ).order_by(field, "pk")
+            else:
+                objects = objects.filter(
+                    Q(**{f"{field}__lt": position})
+                    | Q(**{field: position, "pk__lt": pk})
+                ).order_by(f"-{field}", "-pk")
+
+        page_objs = list(objects[: self.page_size + 1])
+        has_more = len(page_objs) > self.page_size
+        page_objs = page_objs[: self.page_size]
+
+        if reverse:
+            page_objs.reverse()
+
+        if not page_objs:
+            return page_objs
+
+        has_next = has_more if not reverse else True
+        has_prev = has_more if reverse else bool(self.cursor)
+
+        if has_next:
+            last_obj = page_objs[-1]
+            self.next_cursor = self.encode_cursor(getattr(last_obj, field), last_obj.pk)
+
+        if has_prev:
+            first_obj = page_objs[0]
+            self.prev_cursor = self.encode_cursor(
+                getattr(first_obj, field), first_obj.pk, reverse=True
+            )
+
+        return page_objs
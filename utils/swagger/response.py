@@ -164,10 +164,20 @@ class PaginationSerializer(serializers.Serializer):
     Pagination for swagger documentation.
     """
 
-    count = serializers.IntegerField()
+    count = serializers.IntegerField(allow_null=True)
     page_size = serializers.IntegerField()
     current_page = serializers.IntegerField()
-    total_pages = serializers.IntegerField()
+    total_pages = serializers.IntegerField(allow_null=True)
+    next_cursor = serializers.CharField(
+        required=False,
+        allow_null=True,
+        help_text="Cursor of the next page, only in cursor pagination mode.",
+    )
+    prev_cursor = serializers.CharField(
+        required=False,
+        allow_null=True,
+        help_text="Cursor of the previous page, only in cursor pagination mode.",
+    )
 
 
 responses_200 = {"200": SuccessResponseSerializer()}
@@ -0,0 +1,139 @@
+from types import SimpleNamespace
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches, cache as d_cache
+from django.test import TestCase
+
+from utils.cache import CacheInterface
+from tenant.utils.helpers import set_tenant_details_to_request_thread
+
+
+class TestCacheInterface(TestCase):
+
+    def setUp(self):
+        self.cache = CacheInterface()
+        self.global_cache = CacheInterface(tenant_aware=False)
+        self.cache.clear()
+
+    def tearDown(self):
+        set_tenant_details_to_request_thread(None)
+
+    @staticmethod
+    def set_tenant(tenant_id):
+        set_tenant_details_to_request_thread(SimpleNamespace(tenant_id=tenant_id))
+
+    def test_new_interface_does_not_flush_backend(self):
+        """
+        Test that a new cache interface on a new backend connection, as in a
+        starting worker, keeps the existing entries.
+        """
+        self.global_cache.set("key", "value")
+        d_cache.set("raw_key", "raw_value")
+
+        CacheInterface.local.clear()
+        CacheInterface.generations.clear()
+        backend = caches.create_connection(DEFAULT_CACHE_ALIAS)
+        fresh_cache = CacheInterface(tenant_aware=False)
+        fresh_cache.cache = backend
+
+        self.assertEqual(fresh_cache.get("key"), "value")
+        self.assertEqual(backend.get("raw_key"), "raw_value")
+
+    def test_clear_bumps_global_generation(self):
+        """
+        Test that clear invalidates the namespace without flushing the backend.
+        """
+        self.set_tenant("tenant-a")
+        self.cache.set("key", "value")
+        self.global_cache.set("key", "global")
+        d_cache.set("raw_key", "raw_value")
+
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(self.global_cache.get("key"))
+        self.assertEqual(d_cache.get("raw_key"), "raw_value")
+
+    def test_clear_tenant_only_invalidates_that_tenant(self):
+        """
+        Test that a tenant generation bump leaves other tenants untouched.
+        """
+        self.set_tenant("tenant-a")
+        self.cache.set("key", "a")
+        self.set_tenant("tenant-b")
+        self.cache.set("key", "b")
+        self.global_cache.set("key", "global")
+
+        self.cache.clear_tenant("tenant-a")
+
+        self.assertEqual(self.cache.get("key"), "b")
+        self.assertEqual(self.global_cache.get("key"), "global")
+        self.set_tenant("tenant-a")
+        self.assertIsNone(self.cache.get("key"))
+
+    def test_lost_generation_does_not_resurrect_entries(self):
+        """
+        Test that an evicted generation counter never maps back to old entries.
+        """
+        self.global_cache.set("key", "value")
+        old_generation = d_cache.get(self.cache._generation_key())
+
+        self.cache.clear()
+        d_cache.delete(self.cache._generation_key())
+        CacheInterface.generations.clear()
+
+        self.assertIsNone(self.global_cache.get("key"))
+        self.assertNotEqual(d_cache.get(self.cache._generation_key()), old_generation)
+
+    def test_l1_serves_repeated_reads(self):
+        """
+        Test that a second read is served from the in process cache.
+        """
+        self.global_cache.set("key", {"a": 1})
+        CacheInterface.local.clear()
+        CacheInterface.reset_stats()
+
+        self.assertEqual(self.global_cache.get("key"), {"a": 1})
+        value = self.global_cache.get("key")
+        value["a"] = 2
+
+        self.assertEqual(self.global_cache.get("key"), {"a": 1})
+        self.assertEqual(
+            CacheInterface.get_stats(),
+            {"l1": {"hits": 2, "misses": 1}, "l2": {"hits": 1, "misses": 0}},
+        )
+
+    def test_l1_follows_generation_of_other_workers(self):
+        """
+        Test that a generation bumped by another worker invalidates the L1 entries
+        once the generation is checked again.
+        """
+        self.global_cache.set("key", "value")
+
+        d_cache.incr(self.cache._generation_key())
+        CacheInterface.generations.clear()
+
+        self.assertIsNone(self.global_cache.get("key"))
+
+    def test_l1_size_per_prefix(self):
+        """
+        Test that the least recently used entries of a prefix are evicted.
+        """
+        CacheInterface.local.clear()
+        with self.settings(
+            CACHE_L1={
+                "TIMEOUT": 5,
+                "GENERATION_CHECK_INTERVAL": 1,
+                "DEFAULT_SIZE": 2,
+                "SIZES": {"small": 1},
+            }
+        ):
+            CacheInterface.local._conf = None
+            self.global_cache.set("small:1", 1)
+            self.global_cache.set("small:2", 2)
+            self.global_cache.set("other:1", 3)
+
+            buckets = CacheInterface.local.buckets
+            self.assertEqual(len(buckets["small"]), 1)
+            self.assertEqual(len(buckets["other"]), 1)
+            self.assertEqual(self.global_cache.get("small:1"), 1)
+        CacheInterface.local._conf = None
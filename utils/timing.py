@@ -0,0 +1,120 @@
+"""
+Request scoped collector of the time spent in each layer of a request, sent in
+the Server-Timing response header.
+"""
+
+from time import perf_counter
+from contextlib import contextmanager
+
+from utils.thread_local_var import get_thread_local_var
+from utils.constants import SERVER_TIMING_PHASES, DB_TIMING_PHASE, CACHE_TIMING_PHASE
+
+_thread_locals = get_thread_local_var()
+
+
+class RequestTimings:
+    """
+    Adds up the time spent in every phase of a request (tenant resolution,
+    authentication, permission check, audit write, database, cache and
+    serialization). The phases may overlap, e.g. the queries of the
+    authentication are also in the database time.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.counts = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, phase: str, seconds: float, count: int = 1):
+        self.durations[phase] = self.durations.get(phase, 0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + count
+
+    def get_count(self, phase: str) -> int:
+        return self.counts.get(phase, 0)
+
+    def count_cache_lookups(self, hits: int = 0, misses: int = 0):
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper (`connection.execute_wrapper`) timing every query.
+        """
+
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add(DB_TIMING_PHASE, perf_counter() - started)
+
+    def get_description(self, phase: str) -> str | None:
+        if phase == DB_TIMING_PHASE:
+            return f"{self.get_count(phase)} queries"
+        if phase == CACHE_TIMING_PHASE:
+            return f"{self.cache_hits} hits {self.cache_misses} misses"
+        return None
+
+    def to_header(self, total: float = None) -> str:
+        """
+        Returns the Server-Timing header value, durations are in milliseconds.
+        The database and cache phases are always sent, the others once recorded.
+        """
+
+        metrics = []
+        for phase in SERVER_TIMING_PHASES:
+            always = phase in (DB_TIMING_PHASE, CACHE_TIMING_PHASE)
+            if phase not in self.durations and not always:
+                continue
+
+            metric = f"{phase};dur={self.durations.get(phase, 0) * 1000:.2f}"
+            description = self.get_description(phase)
+            if description:
+                metric += f';desc="{description}"'
+            metrics.append(metric)
+
+        if total is not None:
+            metrics.append(f"total;dur={total * 1000:.2f}")
+
+        return ", ".join(metrics)
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Installs a new timing collector for the request of the current thread.
+    """
+
+    _thread_locals.request_timings = RequestTimings()
+    return _thread_locals.request_timings
+
+
+def get_request_timings() -> RequestTimings | None:
+    """
+    Returns the timing collector of the current request, None outside of a request.
+    """
+
+    return getattr(_thread_locals, "request_timings", None)
+
+
+def clear_request_timings():
+    _thread_locals.request_timings = None
+    return True
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    Adds the time spent in the block (or the decorated function) to the phase of
+    the current request. Does nothing outside of a request.
+    """
+
+    timings = get_request_timings()
+    if timings is None:
+        yield
+        return
+
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, perf_counter() - started)